@@ -0,0 +1,115 @@
+from aws_lambda_powertools import Logger
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+import gzip
+import os
+
+from exceptions.exceptions import ExportException
+from db.generic_repository import GenericRepository
+from db.project_model import ProjectDynamoModel
+from db.task_model import TaskDynamoModel
+from utils.s3 import MultipartUploadWriter, put_json
+from utils.json_encoder import dumps
+from utils.utils import Utils
+
+logger = Logger(service="export_manager")
+
+EXPORT_BUCKET = os.environ.get("EXPORT_BUCKET")
+EXPORT_SEGMENTS = int(os.environ.get("EXPORT_SEGMENTS", "8"))
+EXPORT_PREFIX = "exports"
+MANIFEST_NAME = "manifest.json"
+SCAN_PAGE_SIZE = 1000
+
+# exported tables by the name of their files
+EXPORT_TABLES = {
+    "projects": GenericRepository(ProjectDynamoModel),
+    "tasks": GenericRepository(TaskDynamoModel),
+}
+
+
+def export_segment(repository, key, segment, total_segments):
+    """
+    Stream one parallel scan segment of a table to S3 as gzip compressed NDJSON.
+    Only one scan page and one upload part are held in memory at a time.
+    Args:
+        repository (GenericRepository): Repository of the table
+        key (str): Object key
+        segment (int): Segment number
+        total_segments (int): Number of segments
+    Returns:
+        dict: Manifest entry of the object: key, segment, rows, bytes and sha256
+    """
+    rows = 0
+    with MultipartUploadWriter(EXPORT_BUCKET, key, content_type="application/gzip") as writer:
+        with gzip.GzipFile(fileobj=writer, mode="wb") as stream:
+            items = repository.iter_all(
+                page_size=SCAN_PAGE_SIZE, segment=segment, total_segments=total_segments
+            )
+            for item in items:
+                stream.write(dumps(item.attribute_values))
+                stream.write(b"\n")
+                rows += 1
+    return {"key": key, "segment": segment, "rows": rows, "bytes": writer.size, "sha256": writer.sha256}
+
+
+class ExportManager:
+
+    def export_tables(self, segments=None):
+        """
+        Export the projects and tasks tables to the export bucket. Every table is read
+        with a parallel scan, each segment streamed to its own object by its own worker,
+        so throughput grows with the number of segments. The manifest is written last,
+        its presence marks a complete export.
+        Args:
+            segments (int): Parallel scan segments per table, EXPORT_SEGMENTS by default
+        Returns:
+            dict: Manifest of the export
+        """
+        try:
+            segments = segments or EXPORT_SEGMENTS
+            started_at = Utils.get_current_timestamp()
+            prefix = f"{EXPORT_PREFIX}/{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}"
+            with ThreadPoolExecutor(
+                max_workers=segments * len(EXPORT_TABLES), thread_name_prefix="export"
+            ) as executor:
+                futures = {
+                    table: [
+                        executor.submit(
+                            export_segment,
+                            repository,
+                            f"{prefix}/{table}/part-{segment:05d}.ndjson.gz",
+                            segment,
+                            segments,
+                        )
+                        for segment in range(segments)
+                    ]
+                    for table, repository in EXPORT_TABLES.items()
+                }
+                tables = {}
+                for table, table_futures in futures.items():
+                    files = [future.result() for future in table_futures]
+                    tables[table] = {"rows": sum(entry["rows"] for entry in files), "files": files}
+
+            manifest = {
+                "bucket": EXPORT_BUCKET,
+                "prefix": prefix,
+                "format": "ndjson+gzip",
+                "segments": segments,
+                "started_at": started_at,
+                "finished_at": Utils.get_current_timestamp(),
+                "tables": tables,
+            }
+            put_json(EXPORT_BUCKET, f"{prefix}/{MANIFEST_NAME}", manifest)
+            logger.info(
+                "export completed",
+                extra={"prefix": prefix, **{f"{table}_rows": entry["rows"] for table, entry in tables.items()}},
+            )
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": manifest,
+                "message": "Export completed successfully"
+            }
+        except Exception as e:
+            logger.error(f"Error exporting tables: {e}")
+            raise ExportException("Error exporting tables") from e
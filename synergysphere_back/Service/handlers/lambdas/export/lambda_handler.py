@@ -0,0 +1,30 @@
+"""
+Lambda exporting the projects and tasks tables to S3, run nightly by a schedule
+"""
+
+import time
+from typing import Any
+
+from export_manager import ExportManager
+from metrics.capacity import pop_consumed_capacity
+from metrics.metrics import elapsed_ms, publish_request_metrics
+
+export_manager = ExportManager()
+
+# Route dimensions of the exports in the latency and capacity metrics
+EXPORT_ROUTE = {"method": "SCHEDULE", "action": "export", "sub_action": "none"}
+
+
+def lambda_handler(event: dict[str, Any], _) -> dict[str, Any]:
+    """
+    Lambda handler function for the export schedule, or a manual invocation
+    Args:
+        event (dict): Scheduled event, or {"segments": n} to override the parallel scan segments
+    Returns:
+        dict: Export manifest
+    """
+    start = time.perf_counter()
+    try:
+        return export_manager.export_tables(event.get("segments"))
+    finally:
+        publish_request_metrics(EXPORT_ROUTE, elapsed_ms(start), pop_consumed_capacity())
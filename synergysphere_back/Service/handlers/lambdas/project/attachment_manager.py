@@ -0,0 +1,407 @@
+from aws_lambda_powertools import Logger
+from datetime import timedelta
+from http import HTTPStatus
+import math
+import os
+import uuid
+
+from botocore.exceptions import ClientError
+
+from exceptions.exceptions import ProjectException
+from db.attachment_model import (
+    ATTACHMENT_PENDING,
+    ATTACHMENT_UPLOADED,
+    PENDING_ATTACHMENT_TTL_HOURS,
+    PENDING_OBJECT_TAGGING,
+    AttachmentDynamoModel,
+    attachment_key,
+)
+from db.generic_repository import GenericRepository
+from db.task_model import TaskDynamoModel
+from metrics.metrics import timed
+from schemas.attachments import AttachmentCompleteRequest, AttachmentSignRequest, AttachmentUploadRequest
+from utils.s3 import MAX_PARTS, get_s3_client, presigned_url, upload_url_expiry
+from utils.utils import Utils
+
+logger = Logger(service="attachment_manager")
+attachment_db = GenericRepository(AttachmentDynamoModel)
+task_db = GenericRepository(TaskDynamoModel)
+
+ATTACHMENTS_BUCKET = os.environ.get("ATTACHMENTS_BUCKET")
+
+MAX_ATTACHMENT_SIZE = 5 * 1024 ** 3
+# Files above this size are uploaded in parts, each with its own presigned URL
+MULTIPART_THRESHOLD = 100 * 1024 ** 2
+MULTIPART_PART_SIZE = 16 * 1024 ** 2
+# DeleteObjects takes at most 1000 keys
+DELETE_OBJECTS_LIMIT = 1000
+
+
+def abort_upload(attachment):
+    """
+    Abort the multipart upload of a pending attachment, if it has one
+    Args:
+        attachment (AttachmentDynamoModel): Attachment
+    """
+    if not attachment.upload_id:
+        return
+    try:
+        get_s3_client().abort_multipart_upload(
+            Bucket=ATTACHMENTS_BUCKET, Key=attachment.key, UploadId=attachment.upload_id
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "NoSuchUpload":
+            raise
+
+
+def delete_task_attachments(task_ids):
+    """
+    Delete every attachment of tasks and their objects, with batched deletes
+    Args:
+        task_ids (list): Task IDs
+    Returns:
+        int: Number of attachments deleted
+    """
+    attachments = [attachment for task_id in task_ids for attachment in attachment_db.query(task_id)]
+    for attachment in attachments:
+        abort_upload(attachment)
+    keys = [attachment.key for attachment in attachments]
+    for start in range(0, len(keys), DELETE_OBJECTS_LIMIT):
+        response = get_s3_client().delete_objects(
+            Bucket=ATTACHMENTS_BUCKET,
+            Delete={"Objects": [{"Key": key} for key in keys[start:start + DELETE_OBJECTS_LIMIT]], "Quiet": True},
+        )
+        if response.get("Errors"):
+            raise RuntimeError(f"Failed to delete {len(response['Errors'])} attachment objects")
+    if attachments:
+        attachment_db.batch_delete([(attachment.task_id, attachment.id) for attachment in attachments], parallel=True)
+    return len(attachments)
+
+
+def get_part_size(size):
+    """
+    Get the part size of the multipart upload of a file
+    Args:
+        size (int): File size in bytes
+    Returns:
+        int: Part size in bytes, so that the file fits in MAX_PARTS parts
+    """
+    return max(MULTIPART_PART_SIZE, math.ceil(size / MAX_PARTS))
+
+
+def get_upload(attachment, part_numbers=None):
+    """
+    Sign the upload of a pending attachment. The single PUT is signed with the size of
+    the file, S3 rejects a body of another length. Its object is tagged pending until
+    the upload is completed, see PENDING_OBJECT_TAGGING.
+    Args:
+        attachment (AttachmentDynamoModel): Pending attachment
+        part_numbers (list): Parts of a multipart upload to sign, None for all of them
+    Returns:
+        dict: Upload method, URLs and their validity in seconds
+    """
+    expires_in = upload_url_expiry(attachment.size)
+    if not attachment.upload_id:
+        return {
+            "method": "PUT",
+            "url": presigned_url(
+                "put_object",
+                ATTACHMENTS_BUCKET,
+                attachment.key,
+                expires_in,
+                ContentType=attachment.content_type,
+                ContentLength=attachment.size,
+                Tagging=PENDING_OBJECT_TAGGING,
+            ),
+            "headers": {"Content-Type": attachment.content_type, "x-amz-tagging": PENDING_OBJECT_TAGGING},
+            "expires_in": expires_in,
+        }
+    part_size = get_part_size(attachment.size)
+    part_count = math.ceil(attachment.size / part_size)
+    if part_numbers is None:
+        part_numbers = range(1, part_count + 1)
+    elif not all(1 <= part_number <= part_count for part_number in part_numbers):
+        raise ValueError(f"part_numbers must be between 1 and {part_count}")
+    return {
+        "method": "PUT",
+        "part_size": part_size,
+        "parts": [
+            {
+                "part_number": part_number,
+                "url": presigned_url(
+                    "upload_part",
+                    ATTACHMENTS_BUCKET,
+                    attachment.key,
+                    expires_in,
+                    UploadId=attachment.upload_id,
+                    PartNumber=part_number,
+                ),
+            }
+            for part_number in part_numbers
+        ],
+        "expires_in": expires_in,
+    }
+
+
+def get_file_name(file_name):
+    """
+    Get the name of an uploaded file without the directories some clients send
+    Args:
+        file_name (str): File name as sent by the client
+    Returns:
+        str: File name
+    """
+    file_name = os.path.basename(file_name.replace("\\", "/")).strip()
+    if not file_name:
+        raise ValueError("file_name is empty")
+    return file_name
+
+
+class AttachmentManager:
+
+    def create_upload(self, attachment_data):
+        """
+        Register an attachment of a task and sign its upload. Files up to MULTIPART_THRESHOLD
+        get one PUT URL, larger ones a multipart upload with one URL per part. The client
+        uploads straight to S3, then calls complete_upload.
+        Args:
+            attachment_data (dict): Task ID, file name, content type, size and creator
+        Returns:
+            dict: Pending attachment and its upload URLs
+        """
+        try:
+            with timed("ValidationTime"):
+                request = AttachmentUploadRequest(**attachment_data)
+            if not 0 <= request.size <= MAX_ATTACHMENT_SIZE:
+                raise ValueError(f"size must be between 0 and {MAX_ATTACHMENT_SIZE} bytes")
+            if task_db.get(request.task_id, attributes_to_get=["id"]) is None:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Task not found",
+                }
+            attachment = request.dict()
+            attachment["file_name"] = get_file_name(request.file_name)
+            attachment["id"] = uuid.uuid4().hex
+            attachment["key"] = attachment_key(request.task_id, attachment["id"], attachment["file_name"])
+            attachment["status"] = ATTACHMENT_PENDING
+            attachment["created_date"] = Utils.get_current_timestamp()
+            attachment["expires_at"] = timedelta(hours=PENDING_ATTACHMENT_TTL_HOURS)
+
+            if request.size > MULTIPART_THRESHOLD:
+                attachment["upload_id"] = get_s3_client().create_multipart_upload(
+                    Bucket=ATTACHMENTS_BUCKET,
+                    Key=attachment["key"],
+                    ContentType=request.content_type,
+                    Tagging=PENDING_OBJECT_TAGGING,
+                )["UploadId"]
+            created_attachment = attachment_db.create(attachment)
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": {"attachment": self.get_metadata(created_attachment), "upload": get_upload(created_attachment)},
+                "message": "Attachment upload created successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error creating attachment upload: {e}")
+            raise ProjectException("Failed to create attachment upload") from e
+
+    def sign_upload(self, attachment_data):
+        """
+        Sign the upload of a pending attachment again, for clients whose URLs expired
+        before they were done
+        Args:
+            attachment_data (dict): Task ID, attachment ID and the parts of a multipart
+                upload to sign, all of them when not given
+        Returns:
+            dict: Pending attachment and its upload URLs
+        """
+        try:
+            with timed("ValidationTime"):
+                request = AttachmentSignRequest(**attachment_data)
+            attachment = attachment_db.get(request.task_id, range_key=request.id)
+            if attachment is None:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Attachment not found",
+                }
+            if attachment.status != ATTACHMENT_PENDING:
+                return {
+                    "status": HTTPStatus.CONFLICT.value,
+                    "data": None,
+                    "message": "Attachment has already been uploaded",
+                }
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": {
+                    "attachment": self.get_metadata(attachment),
+                    "upload": get_upload(attachment, request.part_numbers),
+                },
+                "message": "Attachment upload signed successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error signing attachment upload: {e}")
+            raise ProjectException("Failed to sign attachment upload") from e
+
+    def complete_upload(self, attachment_data):
+        """
+        Mark an attachment as uploaded once its object is in S3, completing its multipart
+        upload with the ETags the client got for each part
+        Args:
+            attachment_data (dict): Task ID, attachment ID and the parts of a multipart upload
+        Returns:
+            dict: Uploaded attachment
+        """
+        try:
+            with timed("ValidationTime"):
+                request = AttachmentCompleteRequest(**attachment_data)
+            attachment = attachment_db.get(request.task_id, range_key=request.id)
+            if attachment is None:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Attachment not found",
+                }
+            client = get_s3_client()
+            if attachment.status == ATTACHMENT_PENDING and attachment.upload_id:
+                if not request.parts:
+                    raise ValueError("parts are required to complete a multipart upload")
+                client.complete_multipart_upload(
+                    Bucket=ATTACHMENTS_BUCKET,
+                    Key=attachment.key,
+                    UploadId=attachment.upload_id,
+                    MultipartUpload={
+                        "Parts": [
+                            {"PartNumber": part.part_number, "ETag": part.etag}
+                            for part in sorted(request.parts, key=lambda part: part.part_number)
+                        ]
+                    },
+                )
+            try:
+                uploaded = client.head_object(Bucket=ATTACHMENTS_BUCKET, Key=attachment.key)
+            except ClientError as e:
+                if e.response["Error"]["Code"] not in ("404", "NoSuchKey"):
+                    raise
+                return {
+                    "status": HTTPStatus.CONFLICT.value,
+                    "data": None,
+                    "message": "Attachment has not been uploaded",
+                }
+            # keeps the object from the lifecycle rule expiring pending uploads
+            client.delete_object_tagging(Bucket=ATTACHMENTS_BUCKET, Key=attachment.key)
+            updated_attachment = attachment_db.update(
+                request.task_id,
+                {
+                    "status": ATTACHMENT_UPLOADED,
+                    "size": uploaded["ContentLength"],
+                    "upload_id": None,
+                    "uploaded_date": Utils.get_current_timestamp(),
+                    "expires_at": None,
+                },
+                range_key=request.id,
+            )
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": self.get_metadata(updated_attachment),
+                "message": "Attachment uploaded successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error completing attachment upload: {e}")
+            raise ProjectException("Failed to complete attachment upload") from e
+
+    def get_download(self, task_id, id):
+        """
+        Sign the download of an uploaded attachment
+        Args:
+            task_id (str): Task ID
+            id (str): Attachment ID
+        Returns:
+            dict: Attachment with its download URL
+        """
+        try:
+            attachment = attachment_db.get(task_id, range_key=id)
+            if attachment is None or attachment.status != ATTACHMENT_UPLOADED:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Attachment not found",
+                }
+            url = presigned_url(
+                "get_object",
+                ATTACHMENTS_BUCKET,
+                attachment.key,
+                ResponseContentDisposition=f'attachment; filename="{attachment.file_name}"',
+            )
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": {**self.get_metadata(attachment), "url": url},
+                "message": "Attachment fetched successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error fetching attachment: {e}")
+            raise ProjectException("Failed to fetch attachment") from e
+
+    def get_task_attachments(self, task_id):
+        """
+        Get the uploaded attachments of a task
+        Args:
+            task_id (str): Task ID
+        Returns:
+            dict: Attachments, without download URLs
+        """
+        try:
+            attachments = attachment_db.query(
+                task_id, filter_condition=AttachmentDynamoModel.status == ATTACHMENT_UPLOADED
+            )
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": [self.get_metadata(attachment) for attachment in attachments],
+                "message": "Attachments fetched successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error fetching attachments: {e}")
+            raise ProjectException("Failed to fetch attachments") from e
+
+    def delete_attachment(self, task_id, id):
+        """
+        Delete an attachment and its object, aborting its upload if it is still pending
+        Args:
+            task_id (str): Task ID
+            id (str): Attachment ID
+        Returns:
+            dict: Deletion status
+        """
+        try:
+            attachment = attachment_db.get(task_id, range_key=id)
+            if attachment is None:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Attachment not found",
+                }
+            abort_upload(attachment)
+            get_s3_client().delete_object(Bucket=ATTACHMENTS_BUCKET, Key=attachment.key)
+            attachment_db.delete(task_id, range_key=id)
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": None,
+                "message": "Attachment deleted successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error deleting attachment: {e}")
+            raise ProjectException("Failed to delete attachment") from e
+
+    @staticmethod
+    def get_metadata(attachment):
+        """
+        Get the attributes of an attachment returned to clients
+        Args:
+            attachment (AttachmentDynamoModel): Attachment
+        Returns:
+            dict: Attachment attributes without its S3 upload details
+        """
+        return {
+            key: value
+            for key, value in attachment.attribute_values.items()
+            if key not in ("upload_id", "expires_at")
+        }
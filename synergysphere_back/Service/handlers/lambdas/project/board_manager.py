@@ -0,0 +1,75 @@
+from aws_lambda_powertools import Logger
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from exceptions.exceptions import ProjectException
+from db.generic_repository import GenericRepository
+from db.board_repository import SINGLE_TABLE, BoardRepository
+from db.project_model import ProjectDynamoModel
+from db.task_model import TaskDynamoModel
+from utils.rank import rank_order
+
+logger = Logger(service="board_manager")
+project_db = GenericRepository(ProjectDynamoModel)
+tasks_db = GenericRepository(TaskDynamoModel)
+board_db = BoardRepository()
+
+# Column order of the board (CardStatus in the app), unknown statuses go last
+BOARD_STATUSES = ("todo", "inProgress", "review", "done")
+
+# The project read and the task query run side by side, reused across invocations
+executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="board")
+
+
+def group_tasks_by_status(tasks):
+    """
+    Group tasks into board columns
+    Args:
+        tasks (list): Task records
+    Returns:
+        list: Columns in board order, each with its status and tasks ordered by rank
+    """
+    columns = {status: [] for status in BOARD_STATUSES}
+    for task in sorted(tasks, key=rank_order):
+        columns.setdefault(task.get("status") or "todo", []).append(task)
+    return [{"status": status, "tasks": column_tasks} for status, column_tasks in columns.items()]
+
+
+class BoardManager:
+
+    def get_board(self, id):
+        """
+        Get a project with all its tasks grouped by status, with one Query on the
+        single table or by reading the project item and querying the project_id index
+        concurrently
+        Args:
+            id (str): Project ID
+        Returns:
+            dict: Project data with its board columns
+        """
+        try:
+            if SINGLE_TABLE:
+                data, tasks = board_db.get_project(id)
+            else:
+                project_future = executor.submit(project_db.get, id)
+                tasks_future = executor.submit(
+                    tasks_db.query_index, TaskDynamoModel.project_id_index.Meta.index_name, id
+                )
+                project = project_future.result()
+                tasks = [task.attribute_values for task in tasks_future.result()]
+                data = project.attribute_values.copy() if project else None
+            if not data:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Project not found",
+                }
+            data["columns"] = group_tasks_by_status(tasks)
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": data,
+                "message": "Board fetched successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error fetching board: {e}")
+            raise ProjectException("Failed to fetch board") from e
@@ -0,0 +1,96 @@
+from aws_lambda_powertools import Logger
+from http import HTTPStatus
+import uuid
+
+from exceptions.exceptions import ProjectException
+from db.comment_model import CommentDynamoModel, comment_key
+from db.generic_repository import GenericRepository
+from db.task_model import TaskDynamoModel
+from metrics.metrics import timed
+from schemas.comments import CommentCreateRequest
+from utils.serialization import validate
+from utils.utils import Utils
+
+logger = Logger(service="comment_manager")
+comment_db = GenericRepository(CommentDynamoModel)
+task_db = GenericRepository(TaskDynamoModel)
+
+DEFAULT_COMMENT_PAGE_SIZE = 20
+
+
+def delete_task_comments(task_ids):
+    """
+    Delete every comment of tasks with batched deletes
+    Args:
+        task_ids (list): Task IDs
+    Returns:
+        int: Number of comments deleted
+    """
+    keys = [
+        (comment.task_id, comment.comment_key)
+        for task_id in task_ids
+        for comment in comment_db.query(task_id, attributes_to_get=["task_id", "comment_key"])
+    ]
+    if keys:
+        comment_db.batch_delete(keys, parallel=True)
+    return len(keys)
+
+
+class CommentManager:
+
+    def create_comment(self, comment_data):
+        """
+        Append a comment to a task, a single PutItem after the task is read from the cache
+        Args:
+            comment_data (dict): Task ID, content, author and optional parent comment ID
+        Returns:
+            dict: Created comment data
+        """
+        try:
+            with timed("ValidationTime"):
+                comment_dict = validate(CommentCreateRequest, comment_data)
+            task = task_db.get(comment_dict["task_id"])
+            if task is None:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Task not found",
+                }
+            comment_dict["id"] = uuid.uuid4().hex
+            comment_dict["project_id"] = task.project_id
+            comment_dict["created_at"] = Utils.get_change_timestamp()
+            comment_dict["comment_key"] = comment_key(comment_dict["created_at"], comment_dict["id"])
+            created_comment = comment_db.create(comment_dict)
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": created_comment.attribute_values,
+                "message": "Comment created successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error creating comment: {e}")
+            raise ProjectException("Failed to create comment") from e
+
+    def get_task_comments(self, task_id, limit=None, cursor=None):
+        """
+        Get the comments of a task newest first, one page at a time. A page is one Query
+        reading only its own comments, whatever the length of the thread.
+        Args:
+            task_id (str): Task ID
+            limit (int): Maximum number of comments to return
+            cursor (str): Cursor returned by the previous page
+        Returns:
+            dict: Comments of the page and the cursor of the next one
+        """
+        try:
+            comments, next_cursor = comment_db.query_range(
+                task_id, limit or DEFAULT_COMMENT_PAGE_SIZE, descending=True, next_token=cursor
+            )
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": [comment.attribute_values for comment in comments],
+                "next_cursor": next_cursor,
+                "message": "Comments fetched successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error fetching comments: {e}")
+            raise ProjectException("Failed to fetch comments") from e
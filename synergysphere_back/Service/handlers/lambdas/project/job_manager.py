@@ -0,0 +1,275 @@
+from aws_lambda_powertools import Logger
+from http import HTTPStatus
+import hashlib
+import json
+import uuid
+
+from exceptions.exceptions import ProjectException
+from db.job_model import (
+    JOB_MAX_RECEIVE_COUNT,
+    PROJECT_DELETE_JOB,
+    REBALANCE_JOB,
+    REINDEX_JOB,
+    TASK_STATUS_JOB,
+    TRELLO_IMPORT_JOB,
+    job_id,
+)
+from db.job_repository import JobRepository
+from schemas.projects import ProjectReindexRequest
+from schemas.tasks import TaskBulkStatusRequest
+from utils.job_queue import JOB_QUEUE, send_messages
+
+logger = Logger(service="job_manager")
+job_db = JobRepository()
+
+# Items per queue message, each message is processed by one worker call
+JOB_CHUNK_SIZE = 25
+MAX_JOB_ITEMS = 10000
+
+
+def run_task_status_chunk(message):
+    """
+    Set the status of a chunk of tasks
+    Args:
+        message (dict): Job message, with the params of the job and the task IDs of the chunk as items
+    Returns:
+        tuple: Items processed, items skipped and the cursor of the next page
+    """
+    from task_manager import TaskManager  # pylint: disable=import-outside-toplevel
+    params = message["params"]
+    counts = TaskManager().set_task_statuses(message["items"], params["status"], params["update_by"])["data"]
+    return counts["updated"], counts["skipped"], None
+
+
+def run_reindex_page(message):
+    """
+    Reindex a page of the tasks of a project
+    Args:
+        message (dict): Job message, with the params of the job and the page as cursor
+    Returns:
+        tuple: Items processed, items skipped and the cursor of the next page
+    """
+    from search_manager import SearchManager  # pylint: disable=import-outside-toplevel
+    response = SearchManager().reindex_project_page(message["params"]["project_id"], message.get("cursor"))
+    return response["data"]["indexed"], 0, response["next_cursor"]
+
+
+def run_rebalance(message):
+    """
+    Rebalance the ranks of a column
+    Args:
+        message (dict): Job message, with the column as the params of the job
+    Returns:
+        tuple: Items processed, items skipped and the cursor of the next page
+    """
+    from task_manager import TaskManager  # pylint: disable=import-outside-toplevel
+    counts = TaskManager().rebalance_column(message["params"])["data"]
+    return counts["updated"], counts["tasks"] - counts["updated"], None
+
+
+def run_project_delete_page(message):
+    """
+    Delete a page of the tasks of a deleted project
+    Args:
+        message (dict): Job message, with the params of the job and the page as cursor
+    Returns:
+        tuple: Items processed, items skipped and the cursor of the next page
+    """
+    from project_manager import ProjectManager  # pylint: disable=import-outside-toplevel
+    response = ProjectManager().delete_project_page(message["params"]["project_id"], message.get("cursor"))
+    return response["data"]["deleted"], 0, response["next_cursor"]
+
+
+# Chunk handler of each job type run from the jobs queue, called with the message. A
+# message may be delivered more than once, so handlers must be safe to run again.
+JOB_HANDLERS = {
+    TASK_STATUS_JOB: run_task_status_chunk,
+    REINDEX_JOB: run_reindex_page,
+    REBALANCE_JOB: run_rebalance,
+    PROJECT_DELETE_JOB: run_project_delete_page,
+}
+
+
+def job_message(id, job_type, params, items=None, cursor=None):
+    """
+    Build a jobs queue message
+    Args:
+        id (str): Job ID
+        job_type (str): Job type
+        params (dict): Parameters of the job, the same for every message
+        items (list): Items of the chunk, for jobs split upfront
+        cursor (str): Page to process, for jobs reading their items page by page
+    Returns:
+        dict: Message
+    """
+    return {"job_id": id, "job_type": job_type, "params": params, "items": items, "cursor": cursor}
+
+
+def enqueue(messages):
+    """
+    Send messages to the jobs queue, or run them right away outside of Lambda
+    Args:
+        messages (list): Job messages
+    """
+    if JOB_QUEUE:
+        send_messages(messages)
+        return
+    for message in messages:
+        run_message(message)
+
+
+def submit_job(job_type, params, items=None):
+    """
+    Record a job and queue its work, in chunks of JOB_CHUNK_SIZE items when items are given,
+    else as a single message whose handler goes on page by page
+    Args:
+        job_type (str): Job type
+        params (dict): Parameters of the job
+        items (list): Items to process
+    Returns:
+        dict: Job attributes
+    """
+    id = uuid.uuid4().hex
+    total = len(items) if items is not None else None
+    job_db.start(id, job_type, total=total)
+    if items is None:
+        messages = [job_message(id, job_type, params)]
+    else:
+        messages = [
+            job_message(id, job_type, params, items=items[start:start + JOB_CHUNK_SIZE])
+            for start in range(0, len(items), JOB_CHUNK_SIZE)
+        ]
+    enqueue(messages)
+    return {"id": id, "job_type": job_type, "total": total}
+
+
+def message_step(message):
+    """
+    Get the step of a job a message runs, the same for every delivery of it
+    Args:
+        message (dict): Job message
+    Returns:
+        str: Hash of the chunk items or of the page cursor
+    """
+    step = json.dumps(message.get("items") if message.get("items") is not None else message.get("cursor"))
+    return hashlib.sha256(step.encode("utf-8")).hexdigest()[:16]
+
+
+def run_message(message, receive_count=1):
+    """
+    Run one jobs queue message, then record its progress and queue the next page if any.
+    The job succeeds once all its items are processed, or once its last page is.
+    A redelivered message adds its counts once and queues its next page once: a message
+    whose step is finished is dropped, and the progress of a step is only added by the
+    first delivery recording it.
+    Args:
+        message (dict): Job message
+        receive_count (int): Deliveries of the message so far
+    """
+    id = message["job_id"]
+    try:
+        step = message_step(message)
+        if job_db.is_finished(id, step):
+            logger.info(f"Job {id} step {step} already run, dropping the redelivered message")
+            return
+        handler = JOB_HANDLERS[message["job_type"]]
+        processed, skipped, next_cursor = handler(message)
+        job = job_db.add_progress(id, processed=processed, skipped=skipped, step=step) or job_db.get(id)
+        if next_cursor:
+            enqueue([job_message(id, message["job_type"], message["params"], cursor=next_cursor)])
+        elif job.get("total") is None or job.get("processed", 0) + job.get("skipped", 0) >= job["total"]:
+            job_db.succeed(id)
+        job_db.finish_step(id, step)
+    except Exception as e:
+        logger.error(f"Error running job {id}: {e}")
+        # the message goes to the dead letter queue after its last delivery
+        if receive_count >= JOB_MAX_RECEIVE_COUNT:
+            job_db.fail(id, str(e))
+        raise
+
+
+def accepted(job):
+    """
+    Response of a route that queued a job
+    Args:
+        job (dict): Job attributes
+    Returns:
+        dict: Response with status 202
+    """
+    return {
+        "status": HTTPStatus.ACCEPTED.value,
+        "data": job,
+        "message": "Job accepted, poll GET ?action=job&id=<id> for its status",
+    }
+
+
+class JobManager:
+
+    def get_job(self, id):
+        """
+        Get the status and progress of a background job
+        Args:
+            id (str): Job ID
+        Returns:
+            dict: Job data
+        """
+        try:
+            job = job_db.get(id)
+            if job:
+                return {
+                    "status": HTTPStatus.OK.value,
+                    "data": job,
+                    "message": "Job fetched successfully",
+                }
+            else:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Job not found",
+                }
+        except Exception as e:
+            logger.error(f"Error fetching job: {e}")
+            raise ProjectException("Failed to fetch job") from e
+
+    def get_import_job(self, key):
+        """
+        Get the status and progress of the import of a Trello export
+        Args:
+            key (str): S3 key the export was uploaded to
+        Returns:
+            dict: Job data
+        """
+        return self.get_job(job_id(TRELLO_IMPORT_JOB, key))
+
+    def update_task_statuses(self, status_data):
+        """
+        Queue a job setting the status of many tasks
+        Args:
+            status_data (dict): Task IDs, new status and user making the change
+        Returns:
+            dict: Job data
+        """
+        try:
+            request = TaskBulkStatusRequest(**status_data)
+            if len(request.ids) > MAX_JOB_ITEMS:
+                raise ValueError(f"At most {MAX_JOB_ITEMS} tasks can be updated at once")
+            ids = list(dict.fromkeys(request.ids))
+            return accepted(submit_job(TASK_STATUS_JOB, request.dict(exclude={"ids"}), items=ids))
+        except Exception as e:
+            logger.error(f"Error queueing task status job: {e}")
+            raise ProjectException("Failed to queue task status update") from e
+
+    def reindex_project(self, reindex_data):
+        """
+        Queue a job reindexing a project and its tasks for search
+        Args:
+            reindex_data (dict): Project ID
+        Returns:
+            dict: Job data
+        """
+        try:
+            request = ProjectReindexRequest(**reindex_data)
+            return accepted(submit_job(REINDEX_JOB, request.dict()))
+        except Exception as e:
+            logger.error(f"Error queueing reindex job: {e}")
+            raise ProjectException("Failed to queue reindex") from e
@@ -0,0 +1,47 @@
+"""
+Lambda running the background jobs queued by the project Lambda, deployed from the
+same code with this module as handler
+"""
+
+import time
+from typing import Any
+
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.batch import BatchProcessor, EventType, process_partial_response
+from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
+
+from job_manager import run_message
+from metrics.capacity import pop_consumed_capacity
+from metrics.metrics import elapsed_ms, publish_request_metrics
+
+logger = Logger()
+processor = BatchProcessor(event_type=EventType.SQS)
+
+# Route dimensions of the job batches in the latency and capacity metrics
+JOB_ROUTE = {"method": "SQS", "action": "job", "sub_action": "none"}
+
+
+def record_handler(record: SQSRecord) -> None:
+    """
+    Run the job message of one SQS record, raising to leave it on the queue for a retry
+    Args:
+        record (SQSRecord): SQS record
+    """
+    run_message(record.json_body, int(record.attributes.approximate_receive_count))
+
+
+def lambda_handler(event: dict[str, Any], context) -> dict[str, Any]:
+    """
+    Lambda handler function for batches of the jobs queue
+    Args:
+        event (dict): SQS event
+    Returns:
+        dict: Partial batch response, with the messages to retry
+    """
+    start = time.perf_counter()
+    try:
+        return process_partial_response(
+            event=event, record_handler=record_handler, processor=processor, context=context
+        )
+    finally:
+        publish_request_metrics(JOB_ROUTE, elapsed_ms(start), pop_consumed_capacity())
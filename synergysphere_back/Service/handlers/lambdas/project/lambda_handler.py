@@ -2,16 +2,140 @@
 Lambda for uploading files to s3
 """
 
-from typing import Any
+from functools import lru_cache
+from typing import Any, Optional, Tuple
 from response.response_handler import generate_response
-from project_manager import ProjectManager
-from task_manager import TaskManager
 
-project_manager = ProjectManager()
-task_manager = TaskManager()
+# Managers pull in pydantic, pynamodb and their repositories, so they are
+# created on the first route that needs them instead of during the cold start.
+
+@lru_cache(maxsize=None)
+def get_project_manager():
+    """
+    Get the project manager, importing it on first use
+    Returns:
+        ProjectManager: Project manager
+    """
+    from project_manager import ProjectManager  # pylint: disable=import-outside-toplevel
+    return ProjectManager()
+
+@lru_cache(maxsize=None)
+def get_task_manager():
+    """
+    Get the task manager, importing it on first use
+    Returns:
+        TaskManager: Task manager
+    """
+    from task_manager import TaskManager  # pylint: disable=import-outside-toplevel
+    return TaskManager()
+
+@lru_cache(maxsize=None)
+def get_board_manager():
+    """
+    Get the board manager, importing it on first use
+    Returns:
+        BoardManager: Board manager
+    """
+    from board_manager import BoardManager  # pylint: disable=import-outside-toplevel
+    return BoardManager()
+
+@lru_cache(maxsize=None)
+def get_sync_manager():
+    """
+    Get the sync manager, importing it on first use
+    Returns:
+        SyncManager: Sync manager
+    """
+    from sync_manager import SyncManager  # pylint: disable=import-outside-toplevel
+    return SyncManager()
+
+@lru_cache(maxsize=None)
+def get_search_manager():
+    """
+    Get the search manager, importing it on first use
+    Returns:
+        SearchManager: Search manager
+    """
+    from search_manager import SearchManager  # pylint: disable=import-outside-toplevel
+    return SearchManager()
+
+@lru_cache(maxsize=None)
+def get_job_manager():
+    """
+    Get the job manager, importing it on first use
+    Returns:
+        JobManager: Job manager
+    """
+    from job_manager import JobManager  # pylint: disable=import-outside-toplevel
+    return JobManager()
+
+@lru_cache(maxsize=None)
+def get_attachment_manager():
+    """
+    Get the attachment manager, importing it on first use
+    Returns:
+        AttachmentManager: Attachment manager
+    """
+    from attachment_manager import AttachmentManager  # pylint: disable=import-outside-toplevel
+    return AttachmentManager()
+
+@lru_cache(maxsize=None)
+def get_comment_manager():
+    """
+    Get the comment manager, importing it on first use
+    Returns:
+        CommentManager: Comment manager
+    """
+    from comment_manager import CommentManager  # pylint: disable=import-outside-toplevel
+    return CommentManager()
+
+def idempotent_create(event: dict[str, Any], context: Any, func, compact=None, expand=None) -> dict[str, Any]:
+    """
+    Run a create route once per idempotency key, importing the idempotency store on first use
+    Args:
+        event (dict): Event data
+        context: Lambda context
+        func (Callable): Manager method called with the request body
+        compact (Callable): Get the stored form of a response, see utils/idempotency.py
+        expand (Callable): Rebuild a response from its stored form
+    Returns:
+        dict: Response
+    """
+    from utils.idempotency import idempotent_create as run  # pylint: disable=import-outside-toplevel
+    return run(event, context, func, compact, expand)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def get_limit(queryparam: dict[str, Any]) -> Optional[int]:
+    """
+    Read the limit parameter from the query string
+    Args:
+        queryparam (dict): Query string parameters
+    Returns:
+        int: Limit, None when not given so that the route's own default applies
+    """
+    limit = queryparam.get("limit")
+    if not limit:
+        return None
+    limit = int(limit)
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+def get_pagination(queryparam: dict[str, Any]) -> Tuple[int, Optional[str]]:
+    """
+    Read the pagination parameters of a listing from the query string. Listings are
+    always read one page at a time, DEFAULT_PAGE_SIZE items when no limit is given.
+    Args:
+        queryparam (dict): Query string parameters
+    Returns:
+        tuple: Page size and cursor, None for the first page
+    """
+    return get_limit(queryparam) or DEFAULT_PAGE_SIZE, queryparam.get("cursor") or None
 
 @generate_response
-def lambda_handler(event: dict[str, Any], _) -> dict[str, Any]:
+def lambda_handler(event: dict[str, Any], context) -> dict[str, Any]:
     """
     Lambda handler function to upload files to s3
     Args:
@@ -29,31 +153,84 @@ def lambda_handler(event: dict[str, Any], _) -> dict[str, Any]:
         if action == "project":
             sub_action = queryparam.get("sub_action")
             if sub_action == "all":
-                response = project_manager.get_all_projects()
+                response = get_project_manager().get_all_projects(*get_pagination(queryparam))
+            else:
+                response = get_project_manager().get_project_by_id(body)
+        elif action == "board":
+            response = get_board_manager().get_board(queryparam["id"])
+        elif action == "sync":
+            response = get_sync_manager().get_changes(
+                queryparam.get("since"), get_limit(queryparam), queryparam.get("cursor") or None
+            )
+        elif action == "search":
+            response = get_search_manager().search(queryparam.get("q"), get_limit(queryparam))
+        elif action == "attachment":
+            if queryparam.get("sub_action") == "all":
+                response = get_attachment_manager().get_task_attachments(queryparam["task_id"])
             else:
-                response = project_manager.get_project_by_id(body)
+                response = get_attachment_manager().get_download(queryparam["task_id"], queryparam["id"])
+        elif action == "comment":
+            response = get_comment_manager().get_task_comments(
+                queryparam["task_id"], get_limit(queryparam), queryparam.get("cursor") or None
+            )
+        elif action == "job":
+            response = get_job_manager().get_job(queryparam["id"])
+        elif action == "import":
+            response = get_job_manager().get_import_job(queryparam["key"])
         else:
-            response = task_manager.get_task_details()
+            sub_action = queryparam.get("sub_action")
+            if sub_action == "all":
+                response = get_task_manager().get_all_tasks(*get_pagination(queryparam))
+            else:
+                response = get_task_manager().get_task_by_id(body)
 
     elif method_type == "POST":
         action = queryparam.get("action")
         if action == "project":
-            response = project_manager.create_project(body)
+            response = idempotent_create(event, context, get_project_manager().create_project)
+        elif action == "attachment":
+            if queryparam.get("sub_action") == "complete":
+                response = get_attachment_manager().complete_upload(body)
+            elif queryparam.get("sub_action") == "sign":
+                response = get_attachment_manager().sign_upload(body)
+            else:
+                response = get_attachment_manager().create_upload(body)
+        elif action == "comment":
+            response = idempotent_create(event, context, get_comment_manager().create_comment)
+        elif queryparam.get("mode") == "bulk":
+            task_manager = get_task_manager()
+            response = idempotent_create(
+                event,
+                context,
+                task_manager.create_tasks,
+                task_manager.compact_created_tasks,
+                task_manager.expand_created_tasks,
+            )
         else:
-            response = task_manager.create_task(body)
+            response = idempotent_create(event, context, get_task_manager().create_task)
     
     elif method_type == "PUT":
         action = queryparam.get("action")
         if action == "project":
-            response = project_manager.update_project(body)
+            response = get_project_manager().update_project(body)
+        elif action == "search" and queryparam.get("op") == "reindex":
+            response = get_job_manager().reindex_project(body)
+        elif queryparam.get("mode") == "bulk":
+            response = get_job_manager().update_task_statuses(body)
+        elif queryparam.get("op") == "move":
+            response = get_task_manager().move_task(body)
+        elif queryparam.get("op") == "rebalance":
+            response = get_task_manager().rebalance_column(body)
         else:
-            response = task_manager.update_task(body)
+            response = get_task_manager().update_task(body)
     
     else: # DELETE
         action = queryparam.get("action")
         if action == "project":
-            response =  project_manager.delete_project(body)
+            response =  get_project_manager().delete_project(body)
+        elif action == "attachment":
+            response = get_attachment_manager().delete_attachment(queryparam["task_id"], queryparam["id"])
         else:
-            response = task_manager.delete_task(body)
+            response = get_task_manager().delete_task(body)
     
     return response
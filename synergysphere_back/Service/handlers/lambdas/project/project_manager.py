@@ -1,35 +1,111 @@
 from aws_lambda_powertools import Logger
-from exceptions.exceptions import ProjectException
+from exceptions.exceptions import ProjectException, VersionConflictException
+from db.async_generic_repository import AsyncGenericRepository
 from db.generic_repository import GenericRepository
-from projects import ProjectListResponse, ProjectCreateRequest, ProjectUpdateRequest
+from db.board_repository import SINGLE_TABLE, BoardRepository
+from schemas.projects import ProjectListResponse, ProjectCreateRequest, ProjectUpdateRequest, TaskCounts
+from utils.event_loop import run_async
+from utils.serialization import response_dict, validate
 from utils.utils import Utils
-from db.project_model import ProjectDynamoModel
+from metrics.metrics import timed
+from db.project_model import PROJECT_ENTITY, ProjectDynamoModel
+from db.project_summary_model import COUNTERS, ProjectSummaryDynamoModel
+from db.tombstone_repository import TombstoneRepository
+from db.job_model import PROJECT_DELETE_JOB
 from db.task_model import TaskDynamoModel
 
+import asyncio
 import uuid
 from http import HTTPStatus
 
 logger = Logger(service="project_manager")
 project_db = GenericRepository(ProjectDynamoModel)
 tasks_db = GenericRepository(TaskDynamoModel)
+board_db = BoardRepository()
+tombstone_db = TombstoneRepository()
+summary_db = GenericRepository(ProjectSummaryDynamoModel)
+async_project_db = AsyncGenericRepository(ProjectDynamoModel)
+async_tasks_db = AsyncGenericRepository(TaskDynamoModel)
+async_summary_db = AsyncGenericRepository(ProjectSummaryDynamoModel)
+
+# Tasks deleted per page of a project deletion job
+DELETE_PAGE_SIZE = 100
+
+
+def task_counts(summary):
+    """
+    Get the task counts of a project from its summary
+    Args:
+        summary (ProjectSummaryDynamoModel): Project summary, None when the project has no tasks yet
+    Returns:
+        dict: Task counts, the fields of TaskCounts
+    """
+    if not summary:
+        return TaskCounts().dict()
+    return {name: getattr(summary, name) or 0 for name in COUNTERS}
+
+
+async def read_project(id):
+    """
+    Read a project, the IDs of its tasks and its summary concurrently
+    Args:
+        id (str): Project ID
+    Returns:
+        tuple: Project attributes (None if the project does not exist), task IDs and summary
+    """
+    summary_read = async_summary_db.get(id, attributes_to_get=COUNTERS)
+    if SINGLE_TABLE:
+        # one Query on the project's item collection, run on a worker thread
+        (data, project_tasks), summary = await asyncio.gather(
+            asyncio.to_thread(board_db.get_project, id), summary_read
+        )
+        return data, [task["id"] for task in project_tasks], summary
+    project, project_tasks, summary = await asyncio.gather(
+        async_project_db.get(id),
+        async_tasks_db.query_index(
+            TaskDynamoModel.project_id_index.Meta.index_name, id, attributes_to_get=["id"]
+        ),
+        summary_read,
+    )
+    data = project.attribute_values.copy() if project else None
+    return data, [task.attribute_values.get("id") for task in project_tasks], summary
+
 
 class ProjectManager:
 
-    def get_all_projects(self):
+    def get_all_projects(self, limit, cursor=None):
         """
-        Get all projects
+        Get one page of the projects, with their task counts read from the project
+        summaries (no task reads)
+        Args:
+            limit (int): Maximum number of projects to return
+            cursor (str): Cursor returned by the previous page
         Returns:
-            list: List of all projects
+            dict: Projects of the page and the cursor of the next one
         """
         try:
-            projects = []
-            for val_project in project_db.list_all():
-                project = ProjectListResponse(**val_project.attribute_values)
-                projects.append(project.dict())
-            
+            projection = project_db.projection(ProjectListResponse)
+            db_projects, next_cursor = project_db.list_page(limit, cursor, attributes_to_get=projection)
+            summaries = {
+                summary.project_id: summary
+                for summary in summary_db.batch_get(
+                    [val_project.id for val_project in db_projects], attributes_to_get=COUNTERS
+                )
+            }
+
+            projects = [
+                response_dict(
+                    ProjectListResponse,
+                    val_project.attribute_values,
+                    task_counts=task_counts(summaries.get(val_project.id)),
+                )
+                for val_project in db_projects
+            ]
+
             return {
                 "status": HTTPStatus.OK.value,
                 "data": projects,
+                "next_cursor": next_cursor,
                 "message": "Projects fetched successfully",
             }
 
@@ -39,20 +115,18 @@ class ProjectManager:
 
     def get_project_by_id(self, id):
         """
-        Get project by ID
+        Get project by ID, with the IDs of its tasks and its task counts. The project,
+        its tasks and its summary are read concurrently.
         Args:
             id (str): Project ID
         Returns:
             dict: Project data
         """
         try:
-            project = project_db.get(id)
-            filter_condition = (tasks_db.model_class.project_id == id)
-            filtered_tasks = tasks_db.list_all(filter_condition=filter_condition)
-            tasks_list = [task.attribute_values.get("id") for task in filtered_tasks]
-            if project:
-                data = project.attribute_values.copy()
+            data, tasks_list, summary = run_async(read_project(id))
+            if data:
                 data["tasks"] = tasks_list
+                data["task_counts"] = task_counts(summary)
                 return {
                     "status": HTTPStatus.OK.value,
                     "data": data,
@@ -78,8 +152,8 @@ class ProjectManager:
             dict: Created project data
         """
         try:
-            project = ProjectCreateRequest(**project_data)
-            project_dict = project.dict()
+            with timed("ValidationTime"):
+                project_dict = validate(ProjectCreateRequest, project_data)
             project_dict["id"] = uuid.uuid4().hex
             project_dict["created_date"] = Utils.get_current_timestamp()
             project_dict["updated_date"] = "NA"
@@ -103,30 +177,50 @@ class ProjectManager:
             dict: Updated project data
         """
         try:
-            project = ProjectUpdateRequest(**project_data)
-            project_details = project_db.get(project_data["id"])
-            project_details.update(project)
-            project_db.update(project_data["id"], project_details)
+            with timed("ValidationTime"):
+                project = ProjectUpdateRequest(**project_data)
+            updates = project.dict(exclude={"id", "version"})
+            updates["updated_date"] = Utils.get_current_timestamp()
+            updated_project = project_db.update(
+                project.id, updates, expected_version=project.version
+            )
+            if updated_project:
+                return {
+                    "status": HTTPStatus.OK.value,
+                    "data": updated_project.attribute_values,
+                    "message": "Project updated successfully",
+                }
+            else:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Project not found",
+                }
+        except VersionConflictException as e:
+            return {
+                "status": HTTPStatus.CONFLICT.value,
+                "data": None,
+                "message": str(e),
+            }
         except Exception as e:
             logger.error(f"Error updating project: {e}")
             raise ProjectException("Failed to update project") from e
 
     def delete_project(self, id):
         """
-        Delete project by ID
+        Delete project by ID. Its tasks, their comments and attachments, and its summary
+        are deleted by a background job, returned to poll.
         Args:
             id (str): Project ID
         Returns:
-            dict: Deletion status
+            dict: Job deleting the tasks, with status 202
         """
         try:
             deleted = project_db.delete(id)
             if deleted:
-                return {
-                    "status": HTTPStatus.OK.value,
-                    "data": None,
-                    "message": "Project deleted successfully",
-                }
+                tombstone_db.record_deletions(PROJECT_ENTITY, [id])
+                from job_manager import accepted, submit_job  # pylint: disable=import-outside-toplevel
+                return accepted(submit_job(PROJECT_DELETE_JOB, {"project_id": id}))
             else:
                 return {
                     "status": HTTPStatus.NOT_FOUND.value,
@@ -136,3 +230,37 @@ class ProjectManager:
         except Exception as e:
             logger.error(f"Error deleting project: {e}")
             raise ProjectException("Failed to delete project") from e
+
+    def delete_project_page(self, project_id, cursor=None):
+        """
+        Delete one page of the tasks of a deleted project, and its summary after the last page.
+        Run by the project deletion jobs, page after page.
+        Args:
+            project_id (str): Project ID
+            cursor (str): Cursor of the page, None for the first one
+        Returns:
+            dict: Number of tasks deleted, and the cursor of the next page
+        """
+        try:
+            tasks, next_cursor = tasks_db.query_page(
+                project_id,
+                DELETE_PAGE_SIZE,
+                next_token=cursor,
+                index_name=TaskDynamoModel.project_id_index.Meta.index_name,
+                attributes_to_get=["id"],
+            )
+            task_ids = [task.id for task in tasks]
+            if task_ids:
+                from task_manager import delete_tasks  # pylint: disable=import-outside-toplevel
+                delete_tasks(task_ids)
+            if not next_cursor:
+                summary_db.delete(project_id)
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": {"deleted": len(task_ids)},
+                "next_cursor": next_cursor,
+                "message": "Project tasks deleted successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error deleting project tasks: {e}")
+            raise ProjectException("Failed to delete project tasks") from e
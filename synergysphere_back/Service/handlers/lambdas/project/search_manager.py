@@ -0,0 +1,81 @@
+from aws_lambda_powertools import Logger
+from http import HTTPStatus
+
+from exceptions.exceptions import ProjectException
+from db.generic_repository import GenericRepository
+from db.project_model import PROJECT_ENTITY, ProjectDynamoModel
+from db.search_repository import SearchRepository
+from db.task_model import TASK_ENTITY, TaskDynamoModel
+
+logger = Logger(service="search_manager")
+search_db = SearchRepository()
+project_db = GenericRepository(ProjectDynamoModel)
+task_db = GenericRepository(TaskDynamoModel)
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+REINDEX_PAGE_SIZE = 100
+DOCUMENT_ATTRIBUTES = ["id", "project_id", "title", "description"]
+
+
+class SearchManager:
+
+    def search(self, query, limit=None):
+        """
+        Search projects and tasks by title and description, matching word prefixes
+        Args:
+            query (str): Search text
+            limit (int): Maximum number of results
+        Returns:
+            dict: Matching projects and tasks, best ranked first, and whether a term matched
+                too many documents to read them all
+        """
+        try:
+            limit = min(limit or DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT)
+            results, truncated = search_db.search(query or "", limit)
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": {"results": results, "truncated": truncated},
+                "message": "Search completed successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error searching: {e}")
+            raise ProjectException("Failed to search") from e
+
+    def reindex_project_page(self, project_id, cursor=None):
+        """
+        Reindex one page of the tasks of a project, and the project itself on the first page.
+        Run by the reindex jobs, page after page.
+        Args:
+            project_id (str): Project ID
+            cursor (str): Cursor of the page, None for the first one
+        Returns:
+            dict: Number of documents indexed, and the cursor of the next page
+        """
+        try:
+            indexed = 0
+            if cursor is None:
+                project = project_db.get(project_id, attributes_to_get=["id", "title", "description"])
+                if project:
+                    search_db.index_documents(PROJECT_ENTITY, [project.attribute_values])
+                    indexed += 1
+            tasks, next_cursor = task_db.query_page(
+                project_id,
+                REINDEX_PAGE_SIZE,
+                next_token=cursor,
+                index_name=TaskDynamoModel.project_id_index.Meta.index_name,
+                attributes_to_get=DOCUMENT_ATTRIBUTES,
+            )
+            if tasks:
+                search_db.index_documents(TASK_ENTITY, [task.attribute_values for task in tasks])
+                indexed += len(tasks)
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": {"indexed": indexed},
+                "next_cursor": next_cursor,
+                "message": "Project reindexed successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error reindexing project: {e}")
+            raise ProjectException("Failed to reindex project") from e
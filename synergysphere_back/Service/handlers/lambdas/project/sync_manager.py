@@ -0,0 +1,157 @@
+from aws_lambda_powertools import Logger
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+
+from exceptions.exceptions import ProjectException
+from db.generic_repository import GenericRepository, decode_next_token, encode_next_token
+from db.project_model import PROJECT_ENTITY, ProjectDynamoModel
+from db.task_model import TASK_ENTITY, TaskDynamoModel
+from db.tombstone_model import TOMBSTONE_RETENTION_DAYS
+from db.tombstone_repository import TombstoneRepository
+from utils.utils import Utils
+
+logger = Logger(service="sync_manager")
+project_db = GenericRepository(ProjectDynamoModel)
+tasks_db = GenericRepository(TaskDynamoModel)
+tombstone_db = TombstoneRepository()
+
+DEFAULT_SYNC_PAGE_SIZE = 500
+
+# The watermark never gets closer to now than this, so writes still propagating
+# to the change_bucket indexes are picked up by the next sync
+SYNC_SAFETY_WINDOW_SECONDS = 5
+
+# The four index reads are independent and run side by side
+executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sync")
+
+
+def read_changed_page(repository, model_class, since, until, bucket, limit, next_token):
+    """
+    Read a page of the items of a day bucket changed between two timestamps, oldest first
+    Args:
+        repository (GenericRepository): Repository of the model
+        model_class (Type): PynamoDB model with a change_bucket_index
+        since (str): Watermark
+        until (str): Upper bound of the sync
+        bucket (str): Day bucket, see Utils.get_change_bucket
+        limit (int): Maximum number of items to return
+        next_token (str): Token returned by the previous page
+    Returns:
+        tuple: Item attributes and the token of the next page, None after the last one
+    """
+    items, next_token = repository.query_page(
+        bucket,
+        limit,
+        next_token=next_token,
+        range_key_condition=model_class.changed_at.between(since, until),
+        index_name=model_class.change_bucket_index.Meta.index_name,
+    )
+    return [item.attribute_values for item in items], next_token
+
+
+def read_buckets(read_page, buckets, limit, position):
+    """
+    Read the next page of changes spread over partitions, one partition after the other
+    Args:
+        read_page (function): Reads a page of one partition, (bucket, limit, next_token) -> (rows, next_token)
+        buckets (list): Partitions, oldest first
+        limit (int): Maximum number of rows to return
+        position (list): Partition and token the page starts at, None when everything was read
+    Returns:
+        tuple: Rows and the position of the next page, None when everything was read
+    """
+    if position is None:
+        return [], None
+    bucket, next_token = position
+    rows = []
+    for bucket in buckets[buckets.index(bucket):]:
+        while True:
+            if len(rows) >= limit:
+                return rows, [bucket, next_token]
+            page, next_token = read_page(bucket, limit - len(rows), next_token)
+            rows += page
+            if not next_token:
+                break
+    return rows, None
+
+
+class SyncManager:
+
+    def get_changes(self, since, limit=None, cursor=None):
+        """
+        Get the projects and tasks created, updated or deleted at or after a watermark.
+        The changes up to the start of the sync are returned page after page, the
+        cursor of a page reads the next one.
+        Args:
+            since (str): ISO timestamp, the next_since of the previous sync
+            limit (int): Maximum number of items of each kind to return per page
+            cursor (str): next_cursor of the previous page, None for the first one
+        Returns:
+            dict: Changed projects and tasks, tombstones of deleted ones, the next watermark
+                and the cursor of the next page, None on the last one
+        """
+        if not since:
+            return {"status": HTTPStatus.BAD_REQUEST.value, "data": None, "message": "since is required"}
+        try:
+            since = Utils.normalize_timestamp(since)
+            state = decode_next_token(cursor)
+        except ValueError as e:
+            return {"status": HTTPStatus.BAD_REQUEST.value, "data": None, "message": str(e)}
+        try:
+            limit = limit or DEFAULT_SYNC_PAGE_SIZE
+            # every page of a sync reads up to the same bound, later changes go to the next sync
+            until = state["until"] if state else max(since, Utils.get_change_timestamp(SYNC_SAFETY_WINDOW_SECONDS))
+            # tombstones older than the retention are gone, the client has to reload everything
+            full_resync = since < Utils.get_change_timestamp(TOMBSTONE_RETENTION_DAYS * 86400)
+            sources = {
+                "projects": (
+                    partial(read_changed_page, project_db, ProjectDynamoModel, since, until),
+                    Utils.get_change_buckets(PROJECT_ENTITY, since, until),
+                ),
+                "tasks": (
+                    partial(read_changed_page, tasks_db, TaskDynamoModel, since, until),
+                    Utils.get_change_buckets(TASK_ENTITY, since, until),
+                ),
+                "deleted_projects": (
+                    partial(tombstone_db.get_page, since, until),
+                    tombstone_db.get_buckets(PROJECT_ENTITY, since, until),
+                ),
+                "deleted_tasks": (
+                    partial(tombstone_db.get_page, since, until),
+                    tombstone_db.get_buckets(TASK_ENTITY, since, until),
+                ),
+            }
+            if state:
+                positions = state["positions"]
+            elif full_resync:
+                positions = dict.fromkeys(sources)
+            else:
+                positions = {name: [buckets[0], None] for name, (_, buckets) in sources.items()}
+
+            futures = {
+                name: executor.submit(read_buckets, read_page, buckets, limit, positions[name])
+                for name, (read_page, buckets) in sources.items()
+            }
+            rows = {}
+            for name, future in futures.items():
+                rows[name], positions[name] = future.result()
+            has_more = any(positions.values())
+
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": {
+                    "projects": rows["projects"],
+                    "tasks": rows["tasks"],
+                    "deleted": rows["deleted_projects"] + rows["deleted_tasks"],
+                    # the watermark of the next sync, once every page has been read
+                    "next_since": until,
+                    "has_more": has_more,
+                    "full_resync": full_resync,
+                },
+                "next_cursor": encode_next_token({"until": until, "positions": positions}) if has_more else None,
+                "message": "Changes fetched successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error fetching changes: {e}")
+            raise ProjectException("Failed to fetch changes") from e
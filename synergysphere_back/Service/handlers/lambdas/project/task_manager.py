@@ -1,30 +1,141 @@
 from aws_lambda_powertools import Logger
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 import uuid
 
-from exceptions.exceptions import ProjectException
+from exceptions.exceptions import ProjectException, VersionConflictException
 from db.generic_repository import GenericRepository
-from tasks import TaskCreateRequest, TaskUpdateRequest
+from schemas.tasks import (
+    TaskColumnRequest,
+    TaskCreateRequest,
+    TaskMoveRequest,
+    TaskUpdateRequest,
+)
+from utils.rank import evenly_spaced_ranks, item_rank, rank_between, rank_order, time_rank
+from utils.serialization import validate, validate_many
 from utils.utils import Utils
-from db.task_model import TaskDynamoModel
+from metrics.metrics import timed
+from db.job_model import REBALANCE_JOB
+from db.task_model import TASK_ENTITY, TaskDynamoModel
+from db.tombstone_repository import TombstoneRepository
 
 logger = Logger(service="task_manager")
 task_db = GenericRepository(TaskDynamoModel)
+tombstone_db = TombstoneRepository()
+
+MAX_BULK_TASKS = 1000
+
+# A move producing a longer rank gets its column rebalanced in the background
+REBALANCE_RANK_LENGTH = 24
+COLUMN_PAGE_SIZE = 500
+REBALANCE_ATTEMPTS = 3
+
+# rank updates of a rebalance and status updates of a bulk change, reused across invocations
+executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="task-writes")
+
+
+def read_column(project_id, status):
+    """
+    Read the tasks of a column from the project_id index, bypassing the cache
+    Args:
+        project_id (str): Project ID
+        status (str): Column status
+    Returns:
+        list: Tasks attributes in column order
+    """
+    tasks = []
+    next_token = None
+    while True:
+        page, next_token = task_db.query_page(
+            project_id,
+            COLUMN_PAGE_SIZE,
+            next_token=next_token,
+            filter_condition=TaskDynamoModel.status == status,
+            index_name=TaskDynamoModel.project_id_index.Meta.index_name,
+            attributes_to_get=["id", "rank", "created_date", "version"],
+        )
+        tasks += [task.attribute_values for task in page]
+        if not next_token:
+            return sorted(tasks, key=rank_order)
+
+
+def rebalance_task(project_id, status, task, rank):
+    """
+    Write the new rank of a task while it is still where read_column found it. The
+    column is read from the eventually consistent index, so the write is checked against
+    the version read: a task changed since is read again and retried while it keeps its
+    column and rank, and skipped once it moved.
+    Args:
+        project_id (str): Project ID
+        status (str): Column status
+        task (dict): Task attributes as read by read_column
+        rank (str): New rank
+    Returns:
+        bool: True when the rank was written
+    """
+    for _ in range(REBALANCE_ATTEMPTS):
+        try:
+            return task_db.update(task["id"], {"rank": rank}, expected_version=task.get("version") or 1) is not None
+        except VersionConflictException:
+            current = task_db.get(task["id"])
+            if current is None or (current.project_id, current.status, current.rank) != (project_id, status, task.get("rank")):
+                return False
+            task = {**task, "version": current.version}
+    return False
+
+
+def schedule_rebalance(project_id, status):
+    """
+    Rebalance the ranks of a column after the response, as a background job
+    Args:
+        project_id (str): Project ID
+        status (str): Column status
+    """
+    from job_manager import submit_job  # pylint: disable=import-outside-toplevel
+    submit_job(REBALANCE_JOB, params={"project_id": project_id, "status": status})
+
+def delete_task_children(task_ids):
+    """
+    Delete the comments and attachments of tasks
+    Args:
+        task_ids (list): Task IDs
+    """
+    from attachment_manager import delete_task_attachments  # pylint: disable=import-outside-toplevel
+    from comment_manager import delete_task_comments  # pylint: disable=import-outside-toplevel
+    delete_task_comments(task_ids)
+    delete_task_attachments(task_ids)
+
+
+def delete_tasks(task_ids):
+    """
+    Delete tasks with their comments and attachments, using batched deletes sent in
+    parallel. The children go first, so that a failed call can be run again.
+    Args:
+        task_ids (list): Task IDs
+    """
+    delete_task_children(task_ids)
+    task_db.batch_delete(task_ids, parallel=True)
+    tombstone_db.record_deletions(TASK_ENTITY, task_ids)
 
 class TaskManager:
-    def get_all_tasks(self):
+    def get_all_tasks(self, limit, cursor=None):
         """
-        Get all tasks
+        Get one page of the tasks
+        Args:
+            limit (int): Maximum number of tasks to return
+            cursor (str): Cursor returned by the previous page
         Returns:
-            list: List of all tasks
+            dict: Tasks of the page and the cursor of the next one
         """
         try:
+            db_tasks, next_cursor = task_db.list_page(limit, cursor)
             tasks = []
-            for val_task in task_db.list_all():
+            for val_task in db_tasks:
                 tasks.append(val_task.attribute_values)
             return {
                 "status": HTTPStatus.OK.value,
                 "data": tasks,
+                "next_cursor": next_cursor,
                 "message": "Tasks fetched successfully",
             }
         except Exception as e:
@@ -66,12 +177,13 @@ class TaskManager:
             dict: Created task data
         """
         try:
-            task = TaskCreateRequest(**task_data)
-            task_dict = task.dict()
+            with timed("ValidationTime"):
+                task_dict = validate(TaskCreateRequest, task_data)
             task_dict["id"] = uuid.uuid4().hex
             task_dict["created_date"] = Utils.get_current_timestamp()
             task_dict["updated_date"] = "NA"
-            task_dict["updated_by"] = "NA"
+            task_dict["update_by"] = "NA"
+            task_dict["rank"] = time_rank()
             created_task = task_db.create(task_dict)
             return {
                 "status": HTTPStatus.OK.value,
@@ -82,6 +194,64 @@ class TaskManager:
             logger.error(f"Error creating task: {e}")
             raise ProjectException("Failed to create task") from e
 
+    def create_tasks(self, tasks_data):
+        """
+        Create many tasks with batched writes
+        Args:
+            tasks_data (list): Data for each new task
+        Returns:
+            dict: Created tasks data
+        """
+        try:
+            if len(tasks_data) > MAX_BULK_TASKS:
+                raise ValueError(f"At most {MAX_BULK_TASKS} tasks can be created at once")
+            with timed("ValidationTime"):
+                tasks_list = validate_many(TaskCreateRequest, tasks_data)
+            created_date = Utils.get_current_timestamp()
+            for index, task_dict in enumerate(tasks_list):
+                task_dict["id"] = uuid.uuid4().hex
+                task_dict["created_date"] = created_date
+                task_dict["updated_date"] = "NA"
+                task_dict["update_by"] = "NA"
+                # in request order at the end of their column
+                task_dict["rank"] = time_rank(created_date, offset=index)
+            created_tasks = task_db.batch_create(tasks_list)
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": [task.attribute_values for task in created_tasks],
+                "message": "Tasks created successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error creating tasks: {e}")
+            raise ProjectException("Failed to create tasks") from e
+
+    def compact_created_tasks(self, response):
+        """
+        Get the form of a create_tasks response stored for idempotent retries: the IDs of
+        the created tasks, since up to MAX_BULK_TASKS tasks may not fit in one item
+        Args:
+            response (dict): create_tasks response
+        Returns:
+            dict: Response with task IDs as data
+        """
+        if response["status"] != HTTPStatus.OK.value:
+            return response
+        return {**response, "data": [task["id"] for task in response["data"]]}
+
+    def expand_created_tasks(self, response):
+        """
+        Rebuild a create_tasks response stored by compact_created_tasks, with the tasks
+        as they are now, without those deleted since
+        Args:
+            response (dict): Stored response
+        Returns:
+            dict: Response with the created tasks as data
+        """
+        if response["status"] != HTTPStatus.OK.value:
+            return response
+        tasks = {task.id: task.attribute_values for task in task_db.batch_get(response["data"], use_cache=False)}
+        return {**response, "data": [tasks[task_id] for task_id in response["data"] if task_id in tasks]}
+
     def update_task(self, task_data):
         """
         Update current task
@@ -91,19 +261,167 @@ class TaskManager:
             dict: Updated task data
         """
         try:
-            task = TaskUpdateRequest(**task_data)
-            task_details = task_db.get(task_data["id"])
-            task_details.update(task)
-            task_db.update(task_data["id"], task_details)
+            with timed("ValidationTime"):
+                task = TaskUpdateRequest(**task_data)
+            updates = task.dict(exclude={"id", "version"})
+            updates["updated_date"] = Utils.get_current_timestamp()
+            task_details = task_db.update(task.id, updates, expected_version=task.version)
+            if task_details:
+                return {
+                    "status": HTTPStatus.OK.value,
+                    "data": task_details.attribute_values,
+                    "message": "Task updated successfully",
+                }
+            else:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Task not found",
+                }
+        except VersionConflictException as e:
             return {
-                "status": HTTPStatus.OK.value,
-                "data": task_details.attribute_values,
-                "message": "Task updated successfully",
+                "status": HTTPStatus.CONFLICT.value,
+                "data": None,
+                "message": str(e),
             }
         except Exception as e:
             logger.error(f"Error updating task: {e}")
             raise ProjectException("Failed to update task") from e
 
+    def move_task(self, move_data):
+        """
+        Move a task between two neighbours of a column, possibly of another status. Only
+        the moved task is written, with a rank between the ranks of its new neighbours.
+        Args:
+            move_data (dict): Task ID, destination status and the IDs of the tasks before
+                and after it there
+        Returns:
+            dict: Moved task data
+        """
+        try:
+            with timed("ValidationTime"):
+                move = TaskMoveRequest(**move_data)
+            neighbour_ids = [task_id for task_id in (move.before_id, move.after_id) if task_id]
+            if move.id in neighbour_ids:
+                raise ValueError("A task cannot be its own neighbour")
+            tasks = {
+                task.id: task.attribute_values
+                for task in task_db.batch_get([move.id, *neighbour_ids], use_cache=False)
+            }
+            task = tasks.get(move.id)
+            if task is None:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Task not found",
+                }
+            before = tasks.get(move.before_id)
+            after = tasks.get(move.after_id)
+            lower = item_rank(before) if before else None
+            upper = item_rank(after) if after else None
+            neighbours_moved = len(neighbour_ids) != len(tasks) - 1 or any(
+                neighbour["project_id"] != task["project_id"] or neighbour["status"] != move.status
+                for neighbour in (before, after) if neighbour
+            )
+            if neighbours_moved or (lower and upper and lower >= upper):
+                if lower and upper and lower >= upper:
+                    schedule_rebalance(task["project_id"], move.status)
+                return {
+                    "status": HTTPStatus.CONFLICT.value,
+                    "data": None,
+                    "message": "The column changed, reload the board",
+                }
+            now_rank = time_rank()
+            if upper is None and (lower is None or lower < now_rank):
+                # the end of a column is now, where new tasks are added
+                rank = now_rank
+            else:
+                rank = rank_between(lower, upper)
+            updates = {
+                "status": move.status,
+                "rank": rank,
+                "update_by": move.update_by,
+                "updated_date": Utils.get_current_timestamp(),
+            }
+            task_details = task_db.update(move.id, updates, expected_version=move.version)
+            if not task_details:
+                return {
+                    "status": HTTPStatus.NOT_FOUND.value,
+                    "data": None,
+                    "message": "Task not found",
+                }
+            if len(rank) > REBALANCE_RANK_LENGTH:
+                schedule_rebalance(task_details.project_id, move.status)
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": task_details.attribute_values,
+                "message": "Task moved successfully",
+            }
+        except VersionConflictException as e:
+            return {
+                "status": HTTPStatus.CONFLICT.value,
+                "data": None,
+                "message": str(e),
+            }
+        except Exception as e:
+            logger.error(f"Error moving task: {e}")
+            raise ProjectException("Failed to move task") from e
+
+    def rebalance_column(self, column_data):
+        """
+        Give the tasks of a column short, evenly spaced ranks in their current order.
+        Only the tasks whose rank changes are written, and only while they have not been
+        moved since the column was read, see rebalance_task.
+        Args:
+            column_data (dict): Project ID and status of the column
+        Returns:
+            dict: Number of tasks rewritten, and skipped because they moved
+        """
+        try:
+            column = TaskColumnRequest(**column_data)
+            tasks = read_column(column.project_id, column.status)
+            ranks = evenly_spaced_ranks(len(tasks), time_rank())
+            changes = [(task, rank) for task, rank in zip(tasks, ranks) if task.get("rank") != rank]
+            updated = sum(executor.map(
+                lambda change: rebalance_task(column.project_id, column.status, *change), changes
+            ))
+            skipped = len(changes) - updated
+            logger.info(
+                "column rebalanced",
+                extra={**column.dict(), "tasks": len(tasks), "updated": updated, "skipped": skipped},
+            )
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": {"tasks": len(tasks), "updated": updated, "skipped": skipped},
+                "message": "Column rebalanced successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error rebalancing column: {e}")
+            raise ProjectException("Failed to rebalance column") from e
+
+    def set_task_statuses(self, ids, status, update_by):
+        """
+        Set the status of many tasks, in parallel, without version checks. Run by the
+        bulk status jobs, one chunk of tasks at a time.
+        Args:
+            ids (list): Task IDs
+            status (str): New status
+            update_by (str): User making the change
+        Returns:
+            dict: Number of tasks updated, and skipped because they no longer exist
+        """
+        try:
+            updates = {"status": status, "update_by": update_by, "updated_date": Utils.get_current_timestamp()}
+            updated_tasks = [task for task in executor.map(lambda id: task_db.update(id, updates), ids) if task]
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": {"updated": len(updated_tasks), "skipped": len(ids) - len(updated_tasks)},
+                "message": "Task statuses updated successfully",
+            }
+        except Exception as e:
+            logger.error(f"Error updating task statuses: {e}")
+            raise ProjectException("Failed to update task statuses") from e
+
     def delete_task(self, id):
         """
         Delete task by ID
@@ -115,6 +433,8 @@ class TaskManager:
         try:
             deleted = task_db.delete(id)
             if deleted:
+                tombstone_db.record_deletions(TASK_ENTITY, [id])
+                delete_task_children([id])
                 return {
                     "status": HTTPStatus.OK.value,
                     "data": None,
@@ -0,0 +1,38 @@
+"""
+Lambda maintaining the task counts of projects from the tasks table stream
+"""
+
+import time
+from typing import Any
+
+from aws_lambda_powertools import Logger
+
+from metrics.capacity import pop_consumed_capacity
+from metrics.metrics import elapsed_ms, publish_request_metrics
+from summary_manager import SummaryManager
+
+logger = Logger()
+summary_manager = SummaryManager()
+
+# Route dimensions of the stream batches in the latency and capacity metrics
+STREAM_ROUTE = {"method": "STREAM", "action": "tasks", "sub_action": "none"}
+
+
+def lambda_handler(event: dict[str, Any], _) -> dict[str, Any]:
+    """
+    Lambda handler function for DynamoDB stream batches
+    Args:
+        event (dict): Stream event
+    Returns:
+        dict: Partial batch response
+    """
+    start = time.perf_counter()
+    records = event.get("Records", [])
+    failures = summary_manager.apply_records(records)
+    duration_ms = elapsed_ms(start)
+    logger.info(
+        "stream batch applied",
+        extra={"records": len(records), "failed": bool(failures), "duration_ms": duration_ms},
+    )
+    publish_request_metrics(STREAM_ROUTE, duration_ms, pop_consumed_capacity())
+    return {"batchItemFailures": failures}
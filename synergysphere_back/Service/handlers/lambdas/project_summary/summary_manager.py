@@ -0,0 +1,68 @@
+from aws_lambda_powertools import Logger
+from collections import Counter
+
+from db.generic_repository import GenericRepository
+from db.project_summary_model import ProjectSummaryDynamoModel, status_counter
+
+logger = Logger(service="summary_manager")
+summary_db = GenericRepository(ProjectSummaryDynamoModel)
+
+
+def get_task_key(image):
+    """
+    Get the project and counter a stream image of a task is counted in
+    Args:
+        image (dict): NewImage or OldImage of a stream record, in DynamoDB JSON
+    Returns:
+        tuple: Project ID and counter attribute, None without an image
+    """
+    if not image or "project_id" not in image:
+        return None
+    return image["project_id"]["S"], status_counter(image.get("status", {}).get("S"))
+
+
+def get_record_deltas(record):
+    """
+    Get the counter deltas of a tasks stream record
+    Args:
+        record (dict): DynamoDB stream record
+    Returns:
+        dict: Counter deltas per project ID, empty when the counts do not change
+    """
+    old_key = get_task_key(record["dynamodb"].get("OldImage"))
+    new_key = get_task_key(record["dynamodb"].get("NewImage"))
+    if old_key == new_key:
+        return {}
+    deltas = {}
+    if old_key:
+        project_id, counter = old_key
+        deltas.setdefault(project_id, Counter()).update({counter: -1, "total": -1})
+    if new_key:
+        project_id, counter = new_key
+        deltas.setdefault(project_id, Counter()).update({counter: 1, "total": 1})
+    return deltas
+
+
+class SummaryManager:
+
+    def apply_records(self, records):
+        """
+        Apply the tasks stream records to the project summaries, in stream order.
+        Processing stops at the first failure so that the records already applied
+        are not retried (counter updates are not idempotent).
+        Args:
+            records (list): DynamoDB stream records
+        Returns:
+            list: Batch item failures, at most the first failed record
+        """
+        for record in records:
+            try:
+                for project_id, deltas in get_record_deltas(record).items():
+                    # a task removed without a replacement never creates a summary: its
+                    # project was deleted along with the summary, see delete_project
+                    summary_db.add_counters(project_id, deltas, only_existing=deltas["total"] < 0)
+            except Exception as e:
+                sequence_number = record["dynamodb"]["SequenceNumber"]
+                logger.error(f"Error applying stream record {sequence_number}: {e}")
+                return [{"itemIdentifier": sequence_number}]
+        return []
@@ -0,0 +1,129 @@
+from aws_lambda_powertools import Logger
+
+from db.board_model import project_item, task_item
+from db.board_repository import BoardRepository
+from db.project_model import PROJECT_ENTITY, ProjectDynamoModel
+from db.search_repository import SearchRepository
+from db.task_model import TASK_ENTITY, TaskDynamoModel
+
+logger = Logger(service="projection_manager")
+board_db = BoardRepository()
+search_db = SearchRepository()
+
+DOCUMENT_ATTRIBUTES = ["id", "project_id", "title", "description"]
+
+
+def get_image_item(image):
+    """
+    Get the entity type and attributes of a stream image of a project or task
+    Args:
+        image (dict): NewImage or OldImage of a stream record, in DynamoDB JSON
+    Returns:
+        tuple: Entity type and item attributes, (None, None) without an image
+    """
+    if not image:
+        return None, None
+    # only tasks have a project_id
+    if "project_id" in image:
+        return TASK_ENTITY, TaskDynamoModel.from_raw_data(image).attribute_values
+    return PROJECT_ENTITY, ProjectDynamoModel.from_raw_data(image).attribute_values
+
+
+def get_board_item(image):
+    """
+    Get the single table item of a stream image of a project or task
+    Args:
+        image (dict): NewImage or OldImage of a stream record, in DynamoDB JSON
+    Returns:
+        dict: Item attributes, None without an image
+    """
+    entity_type, attributes = get_image_item(image)
+    if entity_type is None:
+        return None
+    if entity_type == TASK_ENTITY:
+        return task_item(attributes)
+    return project_item(attributes)
+
+
+def get_record_document(record):
+    """
+    Get the search index update of a projects or tasks stream record
+    Args:
+        record (dict): DynamoDB stream record
+    Returns:
+        tuple: (entity_type, id) and the document to index, None to remove it, or None
+            when the title and description did not change
+    """
+    old_type, old_item = get_image_item(record["dynamodb"].get("OldImage"))
+    new_type, new_item = get_image_item(record["dynamodb"].get("NewImage"))
+    if new_item is None:
+        return (old_type, old_item["id"]), None
+    if old_item and all(old_item.get(name) == new_item.get(name) for name in ("title", "description")):
+        return None
+    document = {name: new_item[name] for name in DOCUMENT_ATTRIBUTES if name in new_item}
+    return (new_type, new_item["id"]), document
+
+
+def get_record_writes(record):
+    """
+    Get the single table writes of a projects or tasks stream record
+    Args:
+        record (dict): DynamoDB stream record
+    Returns:
+        list: ((pk, sk), item) pairs in order, item None for a delete
+    """
+    old_item = get_board_item(record["dynamodb"].get("OldImage"))
+    new_item = get_board_item(record["dynamodb"].get("NewImage"))
+    writes = []
+    if old_item and (not new_item or (old_item["pk"], old_item["sk"]) != (new_item["pk"], new_item["sk"])):
+        writes.append(((old_item["pk"], old_item["sk"]), None))
+    if new_item:
+        writes.append(((new_item["pk"], new_item["sk"]), new_item))
+    return writes
+
+
+class ProjectionManager:
+
+    def apply_records(self, records):
+        """
+        Apply the projects and tasks stream records to the board single table and to the
+        search index. Only the last write of every item in the batch is sent: the puts,
+        deletes and index updates are idempotent, so a failed batch is retried as a whole.
+        Args:
+            records (list): DynamoDB stream records
+        Returns:
+            list: Batch item failures, the first record of the batch on failure
+        """
+        if not records:
+            return []
+        try:
+            writes = {}
+            documents = {}
+            for record in records:
+                for key, item in get_record_writes(record):
+                    writes[key] = item
+                update = get_record_document(record)
+                if update:
+                    documents[update[0]] = update[1]
+            board_db.write(
+                [item for item in writes.values() if item],
+                [key for key, item in writes.items() if item is None],
+            )
+            for entity_type in (PROJECT_ENTITY, TASK_ENTITY):
+                indexed = [
+                    document for (document_type, _), document in documents.items()
+                    if document_type == entity_type and document
+                ]
+                removed = [
+                    item_id for (document_type, item_id), document in documents.items()
+                    if document_type == entity_type and document is None
+                ]
+                if indexed:
+                    search_db.index_documents(entity_type, indexed)
+                if removed:
+                    search_db.remove_documents(entity_type, removed)
+        except Exception as e:
+            sequence_number = records[0]["dynamodb"]["SequenceNumber"]
+            logger.error(f"Error applying stream batch from record {sequence_number}: {e}")
+            return [{"itemIdentifier": sequence_number}]
+        return []
@@ -0,0 +1,252 @@
+from aws_lambda_powertools import Logger
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from http import HTTPStatus
+from itertools import islice
+import re
+import time
+import uuid
+
+import ijson
+
+from exceptions.exceptions import ImportException
+from db.generic_repository import BATCH_WRITE_LIMIT, GenericRepository
+from db.job_model import TRELLO_IMPORT_JOB, job_id
+from db.job_repository import JobRepository
+from db.project_model import ProjectDynamoModel
+from db.task_model import TaskDynamoModel
+from metrics.metrics import elapsed_ms
+from schemas.projects import ProjectCreateRequest
+from schemas.tasks import TaskCreateRequest
+from utils.rank import time_rank
+from utils.s3 import get_s3_client
+from utils.utils import Utils
+
+logger = Logger(service="import_manager")
+project_db = GenericRepository(ProjectDynamoModel)
+task_db = GenericRepository(TaskDynamoModel)
+job_db = JobRepository()
+
+IMPORT_CREATED_BY = "trello-import"
+# S3 object metadata (x-amz-meta-created-by) naming the user the import is made for
+CREATED_BY_METADATA = "created-by"
+
+IMPORT_CHUNK_SIZE = BATCH_WRITE_LIMIT * 20
+IMPORT_WORKERS = 8
+# chunks parsed ahead of the writers, bounds the cards held in memory
+MAX_PENDING_CHUNKS = IMPORT_WORKERS * 2
+
+# IDs derived from the Trello IDs, so that importing a board again overwrites its items
+IMPORT_NAMESPACE = uuid.UUID("b3e0c6a2-8f41-4d5e-a7c9-1f2e3d4c5b6a")
+
+# Trello list names, lowercased without separators, mapped to task statuses.
+# Cards of other lists are imported as todo.
+LIST_STATUSES = {
+    "todo": "todo",
+    "backlog": "todo",
+    "doing": "inProgress",
+    "inprogress": "inProgress",
+    "review": "review",
+    "inreview": "review",
+    "done": "done",
+    "complete": "done",
+    "completed": "done",
+}
+LIST_FIELDS = ("id", "name", "closed")
+
+
+def import_id(board_id, trello_id):
+    """
+    Get the ID of an item imported from a Trello board
+    Args:
+        board_id (str): Trello board ID
+        trello_id (str): Trello ID of the board or card
+    Returns:
+        str: ID of the project or task
+    """
+    return uuid.uuid5(IMPORT_NAMESPACE, f"{board_id}:{trello_id}").hex
+
+
+def list_status(name):
+    """
+    Get the task status of the cards of a Trello list
+    Args:
+        name (str): List name
+    Returns:
+        str: Task status
+    """
+    return LIST_STATUSES.get(re.sub(r"[^a-z]", "", (name or "").lower()), "todo")
+
+
+def batched(iterable, size):
+    """
+    Split an iterable into lists of at most size items, consuming it lazily
+    Args:
+        iterable (Iterable): Items
+        size (int): Batch size
+    Returns:
+        Iterator: Batches
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def read_board(body):
+    """
+    Read the board attributes and its lists from a Trello export, streaming the
+    document so that its cards are parsed but not kept
+    Args:
+        body (StreamingBody): Export content
+    Returns:
+        tuple: Board id, name and desc, and the lists by ID
+    """
+    board = {}
+    lists = {}
+    current_list = None
+    for prefix, event, value in ijson.parse(body):
+        if prefix in ("id", "name", "desc") and event == "string":
+            board[prefix] = value
+        elif prefix == "lists.item":
+            if event == "start_map":
+                current_list = {}
+            elif event == "end_map":
+                lists[current_list.get("id")] = current_list
+                current_list = None
+        elif current_list is not None and prefix.startswith("lists.item."):
+            field = prefix[len("lists.item."):]
+            if field in LIST_FIELDS:
+                current_list[field] = value
+    return board, lists
+
+
+class ImportManager:
+
+    def open_export(self, bucket, key):
+        """
+        Open a streaming read of an uploaded export
+        Args:
+            bucket (str): Bucket name
+            key (str): Object key
+        Returns:
+            dict: GetObject response
+        """
+        return get_s3_client().get_object(Bucket=bucket, Key=key)
+
+    def write_project(self, project):
+        """
+        Write the project of the board
+        Args:
+            project (dict): Project attributes
+        """
+        project_db.create(project)
+
+    def write_tasks(self, job, tasks):
+        """
+        Write a chunk of tasks with batched writes and report it to the job
+        Args:
+            job (str): Job ID
+            tasks (list): Task attributes
+        """
+        created_tasks = task_db.batch_create(tasks)
+        job_db.add_progress(job, processed=len(created_tasks))
+
+    def iter_tasks(self, cards, board_id, project_id, lists, created_by, counts):
+        """
+        Map the open cards of open lists to tasks
+        Args:
+            cards (Iterator): Cards of the export
+            board_id (str): Trello board ID
+            project_id (str): Project ID
+            lists (dict): Lists of the board by ID
+            created_by (str): User the import is made for
+            counts (dict): Counters, skipped is incremented for every card left out
+        Returns:
+            Iterator: Task attributes
+        """
+        created_date = Utils.get_current_timestamp()
+        for position, card in enumerate(cards):
+            card_list = lists.get(card.get("idList"), {})
+            if card.get("closed") or card_list.get("closed"):
+                counts["skipped"] += 1
+                continue
+            task = TaskCreateRequest(
+                project_id=project_id,
+                title=card.get("name") or "",
+                description=card.get("desc") or "",
+                creator=created_by,
+                status=list_status(card_list.get("name")),
+                end_date=card.get("due") or "NA",
+                created_by=created_by,
+            )
+            task_dict = task.dict()
+            task_dict["id"] = import_id(board_id, card["id"])
+            task_dict["created_date"] = created_date
+            task_dict["updated_date"] = "NA"
+            task_dict["update_by"] = "NA"
+            # cards keep their export order within their column
+            task_dict["rank"] = time_rank(created_date, offset=position)
+            yield task_dict
+
+    def import_board(self, bucket, key):
+        """
+        Import a Trello board export uploaded to S3 as a project with its tasks.
+        The export is streamed twice, for the board and its lists, then for the
+        cards, which are written in chunks by parallel workers. Items get IDs
+        derived from their Trello IDs, so importing a board again overwrites them.
+        Progress is reported in the job item of the object key.
+        Args:
+            bucket (str): Bucket name
+            key (str): Object key
+        Returns:
+            dict: Imported project ID, task count and skipped card count
+        """
+        start = time.perf_counter()
+        job = job_id(TRELLO_IMPORT_JOB, key)
+        try:
+            job_db.start(job, TRELLO_IMPORT_JOB, f"s3://{bucket}/{key}")
+            export = self.open_export(bucket, key)
+            created_by = export.get("Metadata", {}).get(CREATED_BY_METADATA) or IMPORT_CREATED_BY
+            board, lists = read_board(export["Body"])
+            if "id" not in board:
+                raise ValueError("Not a Trello board export")
+
+            project = ProjectCreateRequest(
+                title=board.get("name") or "",
+                description=board.get("desc") or "",
+                created_by=created_by,
+            )
+            project_dict = project.dict()
+            project_dict["id"] = import_id(board["id"], board["id"])
+            project_dict["created_date"] = Utils.get_current_timestamp()
+            project_dict["updated_date"] = "NA"
+            project_dict["updated_by"] = "NA"
+            self.write_project(project_dict)
+
+            counts = {"tasks": 0, "skipped": 0}
+            cards = ijson.items(self.open_export(bucket, key)["Body"], "cards.item", use_float=True)
+            tasks = self.iter_tasks(cards, board["id"], project_dict["id"], lists, created_by, counts)
+            with ThreadPoolExecutor(max_workers=IMPORT_WORKERS, thread_name_prefix="import") as executor:
+                pending = set()
+                for chunk in batched(tasks, IMPORT_CHUNK_SIZE):
+                    if len(pending) >= MAX_PENDING_CHUNKS:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    pending.add(executor.submit(self.write_tasks, job, chunk))
+                    counts["tasks"] += len(chunk)
+                for future in pending:
+                    future.result()
+
+            job_db.add_progress(job, skipped=counts["skipped"])
+            result = {"project_id": project_dict["id"], **counts, "duration_ms": elapsed_ms(start)}
+            job_db.succeed(job, result)
+            logger.info("trello board imported", extra={"key": key, **result})
+            return {
+                "status": HTTPStatus.OK.value,
+                "data": result,
+                "message": "Board imported successfully"
+            }
+        except Exception as e:
+            logger.error(f"Error importing {key}: {e}")
+            job_db.fail(job, str(e))
+            raise ImportException(f"Failed to import {key}") from e
@@ -0,0 +1,36 @@
+"""
+Lambda importing the Trello board exports uploaded to S3
+"""
+
+import time
+from typing import Any
+from urllib.parse import unquote_plus
+
+from import_manager import ImportManager
+from metrics.capacity import pop_consumed_capacity
+from metrics.metrics import elapsed_ms, publish_request_metrics
+
+import_manager = ImportManager()
+
+# Route dimensions of the imports in the latency and capacity metrics
+IMPORT_ROUTE = {"method": "S3", "action": "trello_import", "sub_action": "none"}
+
+
+def lambda_handler(event: dict[str, Any], _) -> list[dict[str, Any]]:
+    """
+    Lambda handler function for S3 object created notifications
+    Args:
+        event (dict): S3 event
+    Returns:
+        list: Result of the import of each object
+    """
+    start = time.perf_counter()
+    try:
+        return [
+            import_manager.import_board(
+                record["s3"]["bucket"]["name"], unquote_plus(record["s3"]["object"]["key"])
+            )
+            for record in event.get("Records", [])
+        ]
+    finally:
+        publish_request_metrics(IMPORT_ROUTE, elapsed_ms(start), pop_consumed_capacity())
@@ -0,0 +1,331 @@
+"""
+Asyncio counterpart of GenericRepository, so that independent reads of one invocation
+run concurrently, e.g. with asyncio.gather driven by utils.event_loop.run_async.
+
+Requests are built by PynamoDB, from the same models, conditions and actions as the
+synchronous repository, and sent with a non-blocking aiobotocore client. Items are
+new model instances and share the model cache of GenericRepository.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from botocore import xform_name
+from botocore.exceptions import ClientError
+from pynamodb.connection.base import Connection
+from pynamodb.constants import ALL_NEW, ATTRIBUTES, ITEM, ITEMS, LAST_EVALUATED_KEY
+
+from db.generic_repository import CONDITIONAL_CHECK_FAILED, BaseRepository
+from exceptions.exceptions import VersionConflictException
+from metrics.capacity import instrument_client
+from metrics.metrics import repository_operation
+
+# Clients of the event loop they were opened on, per (region, host)
+_clients: Dict[Tuple[Optional[str], Optional[str]], "asyncio.Future"] = {}
+_clients_loop = None
+
+
+class RequestBuilder(Connection):
+    """
+    PynamoDB connection returning the (operation, request) pairs it would send,
+    without sending them
+    """
+
+    def dispatch(self, operation_name: str, operation_kwargs: Dict) -> Tuple[str, Dict]:
+        return operation_name, operation_kwargs
+
+
+async def _open_client(model_class: Type) -> Any:
+    """
+    Open a DynamoDB client configured like the PynamoDB connection of a model
+    Args:
+        model_class (Type): PynamoDB model
+    Returns:
+        Any: aiobotocore DynamoDB client, kept open while the event loop lives
+    """
+    # aiohttp is only imported by the invocations that use an async repository
+    from aiobotocore.config import AioConfig  # pylint: disable=import-outside-toplevel
+    from aiobotocore.session import get_session  # pylint: disable=import-outside-toplevel
+
+    meta = model_class.Meta
+    config = AioConfig(
+        connect_timeout=meta.connect_timeout_seconds,
+        read_timeout=meta.read_timeout_seconds,
+        retries={"max_attempts": meta.max_retry_attempts},
+        max_pool_connections=meta.max_pool_connections,
+    )
+    client = await get_session().create_client(
+        "dynamodb", region_name=meta.region, endpoint_url=meta.host, config=config
+    ).__aenter__()
+    instrument_client(client)
+    return client
+
+
+async def get_client(model_class: Type) -> Any:
+    """
+    Get the DynamoDB client of the running event loop for a model, opened on first use
+    Args:
+        model_class (Type): PynamoDB model
+    Returns:
+        Any: aiobotocore DynamoDB client
+    """
+    global _clients_loop
+    loop = asyncio.get_running_loop()
+    if _clients_loop is not loop:
+        # clients are bound to the loop they were opened on
+        _clients.clear()
+        _clients_loop = loop
+    key = (model_class.Meta.region, model_class.Meta.host)
+    if key not in _clients:
+        # concurrent first calls wait for the same client
+        _clients[key] = loop.create_task(_open_client(model_class))
+    try:
+        return await asyncio.shield(_clients[key])
+    except Exception:
+        _clients.pop(key, None)
+        raise
+
+
+def condition_failed(error: ClientError) -> bool:
+    """
+    Check whether a DynamoDB error is a failed condition
+    Args:
+        error (ClientError): Error raised by the client
+    Returns:
+        bool: True for ConditionalCheckFailedException
+    """
+    return error.response.get("Error", {}).get("Code") == CONDITIONAL_CHECK_FAILED
+
+
+class AsyncGenericRepository(BaseRepository):
+    def __init__(self, model_class: Type):
+        super().__init__(model_class)
+        self.table_name = model_class.Meta.table_name
+        self.requests = RequestBuilder(region=model_class.Meta.region, host=model_class.Meta.host)
+        self.requests.add_meta_table(model_class._get_connection().connection.get_meta_table(self.table_name))
+
+    async def _send(self, request: Tuple[str, Dict]) -> Dict[str, Any]:
+        """
+        Send a request built by self.requests
+        Args:
+            request (tuple): Operation name and its parameters
+        Returns:
+            dict: Response
+        """
+        operation_name, operation_kwargs = request
+        client = await get_client(self.model_class)
+        return await getattr(client, xform_name(operation_name))(**operation_kwargs)
+
+    @repository_operation("save")
+    async def create(self, data: Dict[str, Any]) -> Any:
+        item = self.model_class(**self._stamp(data))
+        args, kwargs = item._get_save_args()
+        await self._send(self.requests.put_item(self.table_name, *args, **kwargs))
+        self._invalidate(*self._item_key(item))
+        return item
+
+    @repository_operation("get")
+    async def get(
+        self,
+        item_id: Any,
+        attributes_to_get: Optional[Sequence[str]] = None,
+        range_key: Any = None,
+    ) -> Optional[Any]:
+        cache_key = self._cache_key(item_id, range_key)
+        if self.cache:
+            item = self._cached_item(cache_key)
+            if item is not None:
+                return item
+        projection = self._projection(attributes_to_get)
+        hash_key, range_key_value = self.model_class._serialize_keys(item_id, range_key)
+        data = await self._send(
+            self.requests.get_item(
+                self.table_name, hash_key, range_key=range_key_value, attributes_to_get=projection
+            )
+        )
+        if not data.get(ITEM):
+            return None
+        item = self.model_class.from_raw_data(data[ITEM])
+        if self.cache and projection is None:
+            self._cache_item(cache_key, item)
+        return item
+
+    @repository_operation("update")
+    async def update(
+        self,
+        item_id: Any,
+        updates: Dict[str, Any],
+        expected_version: Optional[int] = None,
+        range_key: Any = None,
+    ) -> Optional[Any]:
+        """
+        Update only the given attributes with a single conditional UpdateItem
+        Args:
+            item_id (Any): ID of the item
+            updates (dict): Attributes to set, None removes the attribute
+            expected_version (int): Version the caller read, checked for optimistic locking
+            range_key (Any): Range key of the item, for models with a composite key
+        Returns:
+            Any: Updated item as stored after the update, None if it does not exist
+        Raises:
+            VersionConflictException: If the item was modified since expected_version
+        """
+        actions, condition = self._update_actions(updates, expected_version)
+        item = self.model_class(item_id, range_key)
+        hash_key, range_key_value = item._get_hash_range_key_serialized_values()
+        try:
+            data = await self._send(
+                self.requests.update_item(
+                    self.table_name,
+                    hash_key,
+                    range_key=range_key_value,
+                    actions=actions,
+                    condition=condition,
+                    return_values=ALL_NEW,
+                )
+            )
+        except ClientError as e:
+            if not condition_failed(e):
+                raise
+            self._invalidate(item_id, range_key)
+            if expected_version is not None and await self.get(item_id, range_key=range_key) is not None:
+                raise VersionConflictException(
+                    f"Item {item_id} was modified since version {expected_version}"
+                ) from e
+            return None
+
+        item.deserialize(data[ATTRIBUTES])
+        self._invalidate(item_id, range_key)
+        if self.cache:
+            self._cache_item(self._cache_key(item_id, range_key), item)
+        return item
+
+    @repository_operation("delete")
+    async def delete(self, item_id: Any, range_key: Any = None) -> bool:
+        """
+        Delete an item with a single conditional DeleteItem
+        Args:
+            item_id (Any): ID of the item
+            range_key (Any): Range key of the item, for models with a composite key
+        Returns:
+            bool: False if the item does not exist
+        """
+        hash_key, range_key_value = self.model_class(item_id, range_key)._get_hash_range_key_serialized_values()
+        try:
+            await self._send(
+                self.requests.delete_item(
+                    self.table_name,
+                    hash_key,
+                    range_key=range_key_value,
+                    condition=self.model_class._hash_key_attribute().exists(),
+                )
+            )
+        except ClientError as e:
+            if not condition_failed(e):
+                raise
+            return False
+        finally:
+            self._invalidate(item_id, range_key)
+        return True
+
+    async def list_all(self, filter_condition=None, attributes_to_get: Optional[Sequence[str]] = None) -> List[Any]:
+        # a whole table is not cached, it would crowd out every other entry
+        return await self._scan(filter_condition, self._projection(attributes_to_get))
+
+    @repository_operation("scan")
+    async def _scan(self, filter_condition, projection: Optional[List[str]]) -> List[Any]:
+        """
+        Read every item of the table, one Scan page after the other
+        Args:
+            filter_condition (Condition): Optional scan filter
+            projection (list): Attributes to read, None for the whole item
+        Returns:
+            list: Items of the table
+        """
+        items = []
+        last_evaluated_key = None
+        while True:
+            data = await self._send(
+                self.requests.scan(
+                    self.table_name,
+                    filter_condition=filter_condition,
+                    attributes_to_get=projection,
+                    exclusive_start_key=last_evaluated_key,
+                )
+            )
+            items.extend(self.model_class.from_raw_data(raw_item) for raw_item in data.get(ITEMS, []))
+            last_evaluated_key = data.get(LAST_EVALUATED_KEY)
+            if not last_evaluated_key:
+                return items
+
+    async def query(
+        self,
+        hash_key: Any,
+        range_key_condition=None,
+        filter_condition=None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """
+        Read every item sharing a hash key, e.g. an item collection of a composite key table
+        Args:
+            hash_key (Any): Hash key to query
+            range_key_condition (Condition): Optional range key condition
+            filter_condition (Condition): Optional filter
+            attributes_to_get (Sequence): Attributes to read, None for the whole item
+        Returns:
+            list: Items ordered by range key
+        """
+        return await self._query(None, hash_key, range_key_condition, filter_condition, attributes_to_get)
+
+    async def query_index(
+        self,
+        index_name: str,
+        hash_key: Any,
+        range_key_condition=None,
+        filter_condition=None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        return await self._query(index_name, hash_key, range_key_condition, filter_condition, attributes_to_get)
+
+    @repository_operation("query")
+    async def _query(
+        self,
+        index_name: Optional[str],
+        hash_key: Any,
+        range_key_condition=None,
+        filter_condition=None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        projection = self._projection(attributes_to_get)
+        cache_key = (
+            "query", index_name, hash_key, str(range_key_condition), str(filter_condition), str(projection)
+        )
+        if self.cache:
+            items = self._cached_items(cache_key)
+            if items is not None:
+                return items
+        if index_name:
+            serialized_key = self.model_class._indexes[index_name]._hash_key_attribute().serialize(hash_key)
+        else:
+            serialized_key = self.model_class._serialize_keys(hash_key)[0]
+        items = []
+        last_evaluated_key = None
+        while True:
+            data = await self._send(
+                self.requests.query(
+                    self.table_name,
+                    serialized_key,
+                    range_key_condition=range_key_condition,
+                    filter_condition=filter_condition,
+                    attributes_to_get=projection,
+                    exclusive_start_key=last_evaluated_key,
+                    index_name=index_name,
+                )
+            )
+            items.extend(self.model_class.from_raw_data(raw_item) for raw_item in data.get(ITEMS, []))
+            last_evaluated_key = data.get(LAST_EVALUATED_KEY)
+            if not last_evaluated_key:
+                break
+        if self.cache:
+            self._cache_items(cache_key, items)
+        return items
@@ -0,0 +1,46 @@
+from pynamodb.models import Model
+from pynamodb.attributes import NumberAttribute, TTLAttribute, UnicodeAttribute
+
+ATTACHMENT_PENDING = "pending"
+ATTACHMENT_UPLOADED = "uploaded"
+
+# Attachments whose upload is never completed expire after this long
+PENDING_ATTACHMENT_TTL_HOURS = 24
+# Tag of the objects of pending attachments, removed when their upload is completed.
+# Tagged objects are expired by a lifecycle rule of the bucket, see s3_construct.py.
+PENDING_OBJECT_TAG = ("attachment-status", "pending")
+PENDING_OBJECT_TAGGING = "=".join(PENDING_OBJECT_TAG)
+
+
+def attachment_key(task_id, attachment_id, file_name):
+    """
+    Get the S3 key of an attachment
+    Args:
+        task_id (str): Task ID
+        attachment_id (str): Attachment ID
+        file_name (str): File name, without directories
+    Returns:
+        str: Object key
+    """
+    return f"attachments/{task_id}/{attachment_id}/{file_name}"
+
+
+# PynamoDB model for the metadata of the files attached to tasks, the content is in S3
+class AttachmentDynamoModel(Model):
+    class Meta:
+        table_name = "attachments-int-427547500501"
+        region = "ap-south-1"
+    task_id = UnicodeAttribute(hash_key=True)
+    id = UnicodeAttribute(range_key=True)
+    file_name = UnicodeAttribute()
+    content_type = UnicodeAttribute()
+    size = NumberAttribute()
+    key = UnicodeAttribute()
+    status = UnicodeAttribute()
+    # multipart upload of a pending attachment
+    upload_id = UnicodeAttribute(null=True)
+    created_by = UnicodeAttribute()
+    created_date = UnicodeAttribute()
+    uploaded_date = UnicodeAttribute(null=True)
+    # set while pending, removed once uploaded
+    expires_at = TTLAttribute(null=True)
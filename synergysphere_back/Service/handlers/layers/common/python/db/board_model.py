@@ -0,0 +1,107 @@
+from pynamodb.models import Model
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+
+from db.project_model import PROJECT_ENTITY
+from db.task_model import TASK_ENTITY
+
+# Single table layout: a project and its tasks share the partition key
+#   pk = PROJECT#<project id>, sk = META        -> project
+#   pk = PROJECT#<project id>, sk = TASK#<id>   -> task
+PROJECT_PREFIX = "PROJECT#"
+TASK_PREFIX = "TASK#"
+META_SORT_KEY = "META"
+
+# Attributes that only exist for the layout and are not part of a project or task
+KEY_ATTRIBUTES = ("pk", "sk")
+
+
+def project_key(project_id):
+    """
+    Get the partition key of a project's item collection
+    Args:
+        project_id (str): Project ID
+    Returns:
+        str: Partition key
+    """
+    return f"{PROJECT_PREFIX}{project_id}"
+
+
+def task_sort_key(task_id):
+    """
+    Get the sort key of a task
+    Args:
+        task_id (str): Task ID
+    Returns:
+        str: Sort key
+    """
+    return f"{TASK_PREFIX}{task_id}"
+
+
+def project_item(project):
+    """
+    Get the single table item of a project
+    Args:
+        project (dict): Project attributes
+    Returns:
+        dict: Item attributes
+    """
+    return {**project, "pk": project_key(project["id"]), "sk": META_SORT_KEY, "entity_type": PROJECT_ENTITY}
+
+
+def task_item(task):
+    """
+    Get the single table item of a task
+    Args:
+        task (dict): Task attributes
+    Returns:
+        dict: Item attributes
+    """
+    return {
+        **task,
+        "pk": project_key(task["project_id"]),
+        "sk": task_sort_key(task["id"]),
+        "entity_type": TASK_ENTITY,
+    }
+
+
+def strip_key_attributes(item):
+    """
+    Get the project or task attributes of a single table item
+    Args:
+        item (dict): Item attributes
+    Returns:
+        dict: Attributes without the layout keys
+    """
+    return {name: value for name, value in item.items() if name not in KEY_ATTRIBUTES}
+
+
+# PynamoDB model for the single table holding projects and their tasks
+class BoardItemDynamoModel(Model):
+    class Meta:
+        table_name = "board-int-427547500501"
+        region = "ap-south-1"
+        billing_mode = "PAY_PER_REQUEST"
+        # warm container read cache, see db/cache.py
+        cache_ttl = 10
+        cache_max_size = 512
+    pk = UnicodeAttribute(hash_key=True)
+    sk = UnicodeAttribute(range_key=True)
+    entity_type = UnicodeAttribute()
+    id = UnicodeAttribute()
+    project_id = UnicodeAttribute(null=True)
+    title = UnicodeAttribute()
+    description = UnicodeAttribute()
+    created_by = UnicodeAttribute()
+    created_date = UnicodeAttribute()
+    updated_date = UnicodeAttribute(null=True)
+    # project attributes
+    updated_by = UnicodeAttribute(null=True)
+    # task attributes
+    creator = UnicodeAttribute(null=True)
+    status = UnicodeAttribute(null=True)
+    end_date = UnicodeAttribute(null=True)
+    update_by = UnicodeAttribute(null=True)
+    rank = UnicodeAttribute(null=True)
+    version = NumberAttribute(default=1, null=True)
+    changed_at = UnicodeAttribute(null=True)
+    change_bucket = UnicodeAttribute(null=True)
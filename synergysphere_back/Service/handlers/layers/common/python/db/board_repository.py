@@ -0,0 +1,48 @@
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from db.board_model import BoardItemDynamoModel, project_key, strip_key_attributes
+from db.generic_repository import GenericRepository
+from db.project_model import PROJECT_ENTITY
+
+# Project reads are served from the single table, kept up to date from the projects
+# and tasks streams by the projection Lambda
+SINGLE_TABLE = os.environ.get("SINGLE_TABLE", "false").lower() == "true"
+
+
+class BoardRepository:
+    """
+    Projects and their tasks in the single table layout, see db/board_model.py
+    """
+
+    def __init__(self):
+        self.repository = GenericRepository(BoardItemDynamoModel)
+
+    def write(self, items: Sequence[Dict[str, Any]], keys: Sequence[Tuple[str, str]]) -> None:
+        """
+        Put and delete single table items with batched writes
+        Args:
+            items (Sequence): Attributes of the items to put, see project_item and task_item
+            keys (Sequence): (pk, sk) of the items to delete, none of them put as well
+        """
+        if items:
+            self.repository.batch_create(items)
+        if keys:
+            self.repository.batch_delete(keys)
+
+    def get_project(self, project_id: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Read a project and all its tasks with a single Query on the item collection
+        Args:
+            project_id (str): Project ID
+        Returns:
+            tuple: Project attributes (None if the project does not exist) and its tasks
+        """
+        project = None
+        tasks = []
+        for item in self.repository.query(project_key(project_id)):
+            if item.entity_type == PROJECT_ENTITY:
+                project = strip_key_attributes(item.attribute_values)
+            else:
+                tasks.append(strip_key_attributes(item.attribute_values))
+        return project, tasks
@@ -0,0 +1,179 @@
+"""
+In-process read-through cache shared by the repositories of a warm Lambda container
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Type
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a fixed time to live. Entries have a
+    weight, e.g. the number of items of a cached query result, and the bound applies to
+    their total weight.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        Args:
+            max_size (int): Maximum total weight kept, least recently used entries are evicted first
+            ttl (float): Seconds an entry stays valid
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # counters already published, see pop_counters
+        self._published = (0, 0, 0)
+        self.size = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a live entry and mark it as recently used
+        Args:
+            key (Hashable): Cache key
+            default (Any): Value returned on a miss
+        Returns:
+            Any: Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value, _ = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._pop(key)
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, weight: int = 1) -> None:
+        """
+        Store an entry, evicting the least recently used ones while the total weight is above
+        max_size. An entry heavier than max_size is not stored.
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to cache
+            weight (int): Weight of the entry, e.g. the number of items it holds
+        """
+        weight = max(weight, 1)
+        with self._lock:
+            self._pop(key)
+            if weight > self.max_size:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value, weight)
+            self.size += weight
+            while self.size > self.max_size:
+                _, (_, _, evicted_weight) = self._entries.popitem(last=False)
+                self.size -= evicted_weight
+                self.evictions += 1
+
+    def _pop(self, key: Hashable) -> None:
+        """
+        Drop an entry and its weight, the lock being held
+        Args:
+            key (Hashable): Cache key
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a single entry
+        Args:
+            key (Hashable): Cache key
+        """
+        with self._lock:
+            self._pop(key)
+
+    def invalidate_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        """
+        Drop every entry whose key matches the predicate
+        Args:
+            predicate (Callable): Returns True for the keys to drop
+        """
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._pop(key)
+
+    def clear(self) -> None:
+        """
+        Drop every entry
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache counters
+        Returns:
+            dict: Hits, misses, evictions, hit rate, current total weight and entries
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": self.size,
+                "entries": len(self._entries),
+            }
+
+    def pop_counters(self) -> Dict[str, int]:
+        """
+        Get the hits, misses and evictions since the previous call, for metrics summed
+        over the containers
+        Returns:
+            dict: Hits, misses and evictions
+        """
+        with self._lock:
+            counters = (self.hits, self.misses, self.evictions)
+            published, self._published = self._published, counters
+        return dict(zip(("hits", "misses", "evictions"), (new - old for new, old in zip(counters, published))))
+
+
+_caches: Dict[str, TTLCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_model_cache(model_class: Type) -> Optional[TTLCache]:
+    """
+    Get the cache shared by every repository of a model.
+    Caching is enabled per model by setting `cache_ttl` (and optionally `cache_max_size`) on its Meta.
+    Args:
+        model_class (Type): PynamoDB model class
+    Returns:
+        TTLCache: Cache of the model, or None when caching is disabled for it
+    """
+    ttl = getattr(model_class.Meta, "cache_ttl", None)
+    if not ttl:
+        return None
+    table_name = model_class.Meta.table_name
+    with _caches_lock:
+        if table_name not in _caches:
+            max_size = getattr(model_class.Meta, "cache_max_size", 256)
+            _caches[table_name] = TTLCache(max_size=max_size, ttl=ttl)
+        return _caches[table_name]
+
+
+def pop_cache_counters() -> Dict[str, Dict[str, int]]:
+    """
+    Get the counters of every model cache since the previous call, see TTLCache.pop_counters
+    Returns:
+        dict: Hits, misses and evictions per table, for the caches used since the previous call
+    """
+    with _caches_lock:
+        caches = dict(_caches)
+    counters = {table_name: cache.pop_counters() for table_name, cache in caches.items()}
+    return {table_name: values for table_name, values in counters.items() if any(values.values())}
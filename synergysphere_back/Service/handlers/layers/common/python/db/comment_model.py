@@ -0,0 +1,29 @@
+from pynamodb.models import Model
+from pynamodb.attributes import UnicodeAttribute
+
+
+def comment_key(created_at, comment_id):
+    """
+    Get the sort key of a comment, ordered by creation time
+    Args:
+        created_at (str): Creation timestamp, see Utils.get_change_timestamp
+        comment_id (str): Comment ID
+    Returns:
+        str: Sort key
+    """
+    return f"{created_at}#{comment_id}"
+
+
+# PynamoDB model for the comments of tasks, one item collection per task ordered by time
+class CommentDynamoModel(Model):
+    class Meta:
+        table_name = "comments-int-427547500501"
+        region = "ap-south-1"
+    task_id = UnicodeAttribute(hash_key=True)
+    comment_key = UnicodeAttribute(range_key=True)
+    id = UnicodeAttribute()
+    project_id = UnicodeAttribute()
+    content = UnicodeAttribute()
+    author_id = UnicodeAttribute()
+    parent_comment_id = UnicodeAttribute(null=True)
+    created_at = UnicodeAttribute()
@@ -1,37 +1,746 @@
-from typing import Type, Any, Dict, List, Optional
+import base64
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Type, Any, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from pynamodb.constants import UNPROCESSED_ITEMS, PUT_REQUEST, DELETE_REQUEST, ITEM, KEY
+from pynamodb.exceptions import DeleteError, GetError, PutError, UpdateError
+
+from db.cache import get_model_cache
+from exceptions.exceptions import VersionConflictException
+from metrics.capacity import instrument_model
+from metrics.metrics import repository_operation
+from utils.utils import Utils
+
+CONDITIONAL_CHECK_FAILED = "ConditionalCheckFailedException"
+
+# Models with this attribute get it stamped on every write, see Utils.get_change_timestamp
+CHANGED_AT = "changed_at"
+CHANGE_BUCKET = "change_bucket"
+
+# DynamoDB limits per BatchGetItem / BatchWriteItem request
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+BATCH_MAX_RETRIES = 8
+BATCH_BASE_BACKOFF_SECONDS = 0.05
+BATCH_MAX_BACKOFF_SECONDS = 2.0
+
+# BatchWriteItem requests sent at once by parallel batch writes, shared by every repository
+BATCH_WRITE_WORKERS = 4
+batch_write_executor = ThreadPoolExecutor(max_workers=BATCH_WRITE_WORKERS, thread_name_prefix="batch-write")
+
+
+def chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """
+    Split a sequence into consecutive chunks
+    Args:
+        items (Sequence): Items to split
+        size (int): Maximum chunk size
+    Returns:
+        Iterator: Chunks of at most size items
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def backoff(attempt: int) -> None:
+    """
+    Sleep with exponential backoff and full jitter before retrying unprocessed batch items
+    Args:
+        attempt (int): Zero based retry attempt
+    """
+    delay = min(BATCH_MAX_BACKOFF_SECONDS, BATCH_BASE_BACKOFF_SECONDS * 2 ** attempt)
+    time.sleep(random.uniform(0, delay))
+
+
+def encode_next_token(last_evaluated_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Encode a DynamoDB last_evaluated_key into an opaque, url safe token
+    Args:
+        last_evaluated_key (dict): Key returned by DynamoDB for the last item read
+    Returns:
+        str: Token, or None when there are no more pages
+    """
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_next_token(next_token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a token produced by encode_next_token
+    Args:
+        next_token (str): Token sent back by the client
+    Returns:
+        dict: last_evaluated_key to resume the read from
+    """
+    if not next_token:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(next_token.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid pagination token") from e
+
+
+class BaseRepository:
+    """
+    Key, projection and cache helpers shared by GenericRepository and AsyncGenericRepository
+    """
 
-class GenericRepository:
     def __init__(self, model_class: Type):
         self.model_class = model_class
+        self.cache = get_model_cache(model_class)
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the hit/miss counters of the model cache
+        Returns:
+            dict: Cache counters, or None when caching is disabled for the model
+        """
+        return self.cache.stats() if self.cache else None
+
+    def projection(self, response_model: Type) -> List[str]:
+        """
+        Get the attributes a pydantic response model needs from this model
+        Args:
+            response_model (Type): Pydantic model the items are serialized with
+        Returns:
+            list: Attribute names to read, to be passed as attributes_to_get
+        """
+        fields = getattr(response_model, "model_fields", None) or response_model.__fields__
+        attributes = self.model_class.get_attributes()
+        return [name for name in fields if name in attributes]
+
+    def _projection(self, attributes_to_get: Optional[Sequence[str]]) -> Optional[List[str]]:
+        """
+        Normalize a projection so it always contains the key attributes
+        Args:
+            attributes_to_get (Sequence): Requested attribute names, None for the whole item
+        Returns:
+            list: Attribute names, or None for the whole item
+        """
+        if attributes_to_get is None:
+            return None
+        key_names = [self.model_class._hash_keyname]
+        if self.model_class._range_keyname:
+            key_names.append(self.model_class._range_keyname)
+        return list(dict.fromkeys([*key_names, *attributes_to_get]))
+
+    def _cache_key(self, item_id: Any, range_key: Any = None) -> Tuple[str, Any]:
+        """
+        Get the cache key of a single item
+        Args:
+            item_id (Any): Hash key of the item
+            range_key (Any): Range key of the item, for models with a composite key
+        Returns:
+            tuple: Cache key
+        """
+        return ("get", item_id if range_key is None else (item_id, range_key))
+
+    def _item_key(self, item: Any) -> Tuple[Any, Any]:
+        """
+        Get the key of a model instance
+        Args:
+            item (Any): Model instance
+        Returns:
+            tuple: Hash key and range key (None for hash only models)
+        """
+        range_keyname = self.model_class._range_keyname
+        return (
+            getattr(item, self.model_class._hash_keyname),
+            getattr(item, range_keyname) if range_keyname else None,
+        )
+
+    @staticmethod
+    def _key_parts(key: Any) -> Tuple[Any, Any]:
+        """
+        Split a key into hash and range key, composite keys are passed as (hash_key, range_key)
+        Args:
+            key (Any): Hash key or (hash_key, range_key) tuple
+        Returns:
+            tuple: Hash key and range key (None for hash only models)
+        """
+        return key if isinstance(key, tuple) else (key, None)
+
+    def _cached_item(self, cache_key: Hashable) -> Optional[Any]:
+        """
+        Get a cached item as a new model instance, so that callers never share one
+        Args:
+            cache_key (Hashable): Cache key
+        Returns:
+            Any: Model instance, None on a miss
+        """
+        raw_item = self.cache.get(cache_key)
+        return self.model_class.from_raw_data(raw_item) if raw_item is not None else None
+
+    def _cache_item(self, cache_key: Hashable, item: Any) -> None:
+        """
+        Cache the raw data of an item
+        Args:
+            cache_key (Hashable): Cache key
+            item (Any): Model instance
+        """
+        self.cache.set(cache_key, item.serialize(null_check=False))
+
+    def _cached_items(self, cache_key: Hashable) -> Optional[List[Any]]:
+        """
+        Get a cached query result as new model instances
+        Args:
+            cache_key (Hashable): Cache key
+        Returns:
+            list: Model instances, None on a miss
+        """
+        raw_items = self.cache.get(cache_key)
+        if raw_items is None:
+            return None
+        return [self.model_class.from_raw_data(raw_item) for raw_item in raw_items]
+
+    def _cache_items(self, cache_key: Hashable, items: Sequence[Any]) -> None:
+        """
+        Cache the raw data of a query result, weighing one entry per item
+        Args:
+            cache_key (Hashable): Cache key
+            items (Sequence): Model instances
+        """
+        self.cache.set(cache_key, tuple(item.serialize(null_check=False) for item in items), weight=len(items))
+
+    def _invalidate(self, item_id: Any, range_key: Any = None) -> None:
+        """
+        Drop the cached item and every cached listing after a write
+        Args:
+            item_id (Any): Hash key of the written item
+            range_key (Any): Range key of the written item, for models with a composite key
+        """
+        if self.cache:
+            self.cache.invalidate(self._cache_key(item_id, range_key))
+            self.cache.invalidate_matching(lambda key: key[0] != "get")
+
+    def _stamp(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Set the change timestamp and its day bucket on new item data, unless already given
+        Args:
+            data (dict): Item attributes
+        Returns:
+            dict: Item attributes
+        """
+        attributes = self.model_class.get_attributes()
+        if CHANGED_AT in attributes and not data.get(CHANGED_AT):
+            data = {**data, CHANGED_AT: Utils.get_change_timestamp()}
+        if CHANGE_BUCKET in attributes and not data.get(CHANGE_BUCKET):
+            data = {**data, CHANGE_BUCKET: self._change_bucket(data[CHANGED_AT], data.get("entity_type"))}
+        return data
 
+    def _change_bucket(self, changed_at: str, entity_type: Optional[str] = None) -> str:
+        """
+        Get the day bucket of a change of an item of this model
+        Args:
+            changed_at (str): Change timestamp
+            entity_type (str): Entity type of the item, the model's default when not given
+        Returns:
+            str: Bucket, see Utils.get_change_bucket
+        """
+        return Utils.get_change_bucket(
+            entity_type or self.model_class.get_attributes()["entity_type"].default, changed_at
+        )
+
+    def _update_actions(self, updates: Dict[str, Any], expected_version: Optional[int]) -> Tuple[List[Any], Any]:
+        """
+        Build the actions and condition of a partial update
+        Args:
+            updates (dict): Attributes to set, None removes the attribute
+            expected_version (int): Version the caller read, checked for optimistic locking
+        Returns:
+            tuple: UpdateItem actions and the condition the item must meet
+        """
+        hash_key_attribute = self.model_class._hash_key_attribute()
+        attributes = self.model_class.get_attributes()
+        actions = []
+        for key, value in updates.items():
+            if key in (hash_key_attribute.attr_name, self.model_class._range_keyname, "version"):
+                continue
+            attribute = attributes[key]
+            actions.append(attribute.remove() if value is None else attribute.set(value))
+        if CHANGED_AT in attributes and CHANGED_AT not in updates:
+            changed_at = Utils.get_change_timestamp()
+            actions.append(attributes[CHANGED_AT].set(changed_at))
+            if CHANGE_BUCKET in attributes and CHANGE_BUCKET not in updates:
+                actions.append(attributes[CHANGE_BUCKET].set(self._change_bucket(changed_at)))
+
+        condition = hash_key_attribute.exists()
+        if "version" in attributes:
+            version = attributes["version"]
+            # items written before versioning have no version and are read as version 1
+            actions.append(version.set((version | 1) + 1))
+            if expected_version == 1:
+                condition &= (version == expected_version) | version.does_not_exist()
+            elif expected_version is not None:
+                condition &= version == expected_version
+        return actions, condition
+
+
+class GenericRepository(BaseRepository):
+    @repository_operation("save")
     def create(self, data: Dict[str, Any]) -> Any:
-        item = self.model_class(**data)
+        item = self.model_class(**self._stamp(data))
         item.save()
+        self._invalidate(*self._item_key(item))
         return item
 
-    def get(self, item_id: str) -> Optional[Any]:
+    @repository_operation("get")
+    def get(
+        self,
+        item_id: Any,
+        attributes_to_get: Optional[Sequence[str]] = None,
+        range_key: Any = None,
+    ) -> Optional[Any]:
+        cache_key = self._cache_key(item_id, range_key)
+        if self.cache:
+            item = self._cached_item(cache_key)
+            if item is not None:
+                return item
+        projection = self._projection(attributes_to_get)
         try:
-            return self.model_class.get(item_id)
+            item = self.model_class.get(item_id, range_key, attributes_to_get=projection)
         except self.model_class.DoesNotExist:
             return None
+        if self.cache and projection is None:
+            self._cache_item(cache_key, item)
+        return item
 
-    def update(self, item_id: str, updates: Dict[str, Any]) -> Optional[Any]:
-        item = self.get(item_id)
-        if item:
-            for key, value in updates.items():
-                setattr(item, key, value)
-            item.save()
-            return item
-        return None
+    @repository_operation("update")
+    def update(
+        self,
+        item_id: Any,
+        updates: Dict[str, Any],
+        expected_version: Optional[int] = None,
+        range_key: Any = None,
+    ) -> Optional[Any]:
+        """
+        Update only the given attributes with a single conditional UpdateItem
+        Args:
+            item_id (Any): ID of the item
+            updates (dict): Attributes to set, None removes the attribute
+            expected_version (int): Version the caller read, checked for optimistic locking
+            range_key (Any): Range key of the item, for models with a composite key
+        Returns:
+            Any: Updated item as stored after the update, None if it does not exist
+        Raises:
+            VersionConflictException: If the item was modified since expected_version
+        """
+        actions, condition = self._update_actions(updates, expected_version)
+        item = self.model_class(item_id, range_key)
+        try:
+            item.update(actions=actions, condition=condition)
+        except UpdateError as e:
+            if e.cause_response_code != CONDITIONAL_CHECK_FAILED:
+                raise
+            self._invalidate(item_id, range_key)
+            if expected_version is not None and self.get(item_id, range_key=range_key) is not None:
+                raise VersionConflictException(
+                    f"Item {item_id} was modified since version {expected_version}"
+                ) from e
+            return None
+
+        self._invalidate(item_id, range_key)
+        if self.cache:
+            self._cache_item(self._cache_key(item_id, range_key), item)
+        return item
+
+    @repository_operation("update")
+    def add_counters(
+        self,
+        item_id: Any,
+        deltas: Dict[str, int],
+        range_key: Any = None,
+        only_existing: bool = False,
+        once_per: Optional[Tuple[str, str]] = None,
+    ) -> Optional[Any]:
+        """
+        Atomically add deltas to number attributes with a single UpdateItem, creating the item if needed
+        Args:
+            item_id (Any): ID of the item
+            deltas (dict): Amount to add per attribute, may be negative
+            range_key (Any): Range key of the item, for models with a composite key
+            only_existing (bool): Leave the item missing instead of creating it
+            once_per (tuple): Set attribute and member: the deltas are only added, with the
+                member to the set, while the set does not contain it, so that a retried
+                call adds them once
+        Returns:
+            Any: Item as stored after the update, None if every delta is zero, the item
+                does not exist with only_existing or the member is already in the set
+        """
+        attributes = self.model_class.get_attributes()
+        actions = [attributes[name].add(delta) for name, delta in deltas.items() if delta]
+        if not actions and not once_per:
+            return None
+        item = self.model_class(item_id, range_key)
+        condition = self.model_class._hash_key_attribute().exists() if only_existing else None
+        if once_per:
+            set_name, member = once_per
+            actions.append(attributes[set_name].add({member}))
+            not_added = ~attributes[set_name].contains(member)
+            condition = not_added if condition is None else condition & not_added
+        try:
+            item.update(actions=actions, condition=condition)
+        except UpdateError as e:
+            if condition is None or e.cause_response_code != CONDITIONAL_CHECK_FAILED:
+                raise
+            return None
+        finally:
+            self._invalidate(item_id, range_key)
+        return item
+
+    @repository_operation("delete")
+    def delete(self, item_id: Any, range_key: Any = None) -> bool:
+        """
+        Delete an item with a single conditional DeleteItem
+        Args:
+            item_id (Any): ID of the item
+            range_key (Any): Range key of the item, for models with a composite key
+        Returns:
+            bool: False if the item does not exist
+        """
+        item = self.model_class(item_id, range_key)
+        try:
+            item.delete(condition=self.model_class._hash_key_attribute().exists())
+        except DeleteError as e:
+            if e.cause_response_code != CONDITIONAL_CHECK_FAILED:
+                raise
+            return False
+        finally:
+            self._invalidate(item_id, range_key)
+        return True
+
+    @repository_operation("batch_get")
+    def batch_get(
+        self,
+        item_ids: Iterable[Any],
+        attributes_to_get: Optional[Sequence[str]] = None,
+        use_cache: bool = True,
+    ) -> List[Any]:
+        """
+        Fetch many items with BatchGetItem, 100 keys per request
+        Args:
+            item_ids (Iterable): IDs of the items, (hash_key, range_key) tuples for
+                models with a composite key; missing items are skipped
+            attributes_to_get (Sequence): Attributes to read, None for the whole item
+            use_cache (bool): False to read every item from the table, e.g. before a
+                write that depends on other items
+        Returns:
+            list: Found items, in no particular order
+        """
+        projection = self._projection(attributes_to_get)
+        items = []
+        missing_ids = []
+        for item_id in dict.fromkeys(item_ids):
+            cached = self.cache and use_cache
+            item = self._cached_item(self._cache_key(*self._key_parts(item_id))) if cached else None
+            if item is not None:
+                items.append(item)
+            else:
+                missing_ids.append(item_id)
+
+        hash_keyname = self.model_class._hash_keyname
+        range_keyname = self.model_class._range_keyname
+        for chunk in chunks(missing_ids, BATCH_GET_LIMIT):
+            keys = []
+            for item_id in chunk:
+                hash_key, range_key = self.model_class._serialize_keys(*self._key_parts(item_id))
+                key = {hash_keyname: hash_key}
+                if range_keyname:
+                    key[range_keyname] = range_key
+                keys.append(key)
+            attempt = 0
+            while keys:
+                page, unprocessed_keys = self.model_class._batch_get_page(
+                    keys, consistent_read=None, attributes_to_get=projection
+                )
+                for raw_item in page:
+                    item = self.model_class.from_raw_data(raw_item)
+                    items.append(item)
+                    if self.cache and projection is None:
+                        self._cache_item(self._cache_key(*self._item_key(item)), item)
+                keys = unprocessed_keys or []
+                if keys:
+                    if attempt >= BATCH_MAX_RETRIES:
+                        raise GetError(f"Failed to batch get {len(keys)} items: max retries exceeded")
+                    backoff(attempt)
+                    attempt += 1
+        return items
+
+    def batch_create(self, data_list: Iterable[Dict[str, Any]]) -> List[Any]:
+        """
+        Create many items with BatchWriteItem, 25 items per request
+        Args:
+            data_list (Iterable): Attributes of each item
+        Returns:
+            list: Created items
+        """
+        items = [self.model_class(**self._stamp(data)) for data in data_list]
+        self._batch_write(put_items=items)
+        return items
+
+    def batch_delete(self, item_ids: Iterable[Any], parallel: bool = False) -> None:
+        """
+        Delete many items with BatchWriteItem, 25 items per request
+        Args:
+            item_ids (Iterable): IDs of the items, (hash_key, range_key) tuples for
+                models with a composite key
+            parallel (bool): Send the requests across the batch write workers instead of
+                one after the other
+        """
+        items = [self.model_class(*self._key_parts(item_id)) for item_id in dict.fromkeys(item_ids)]
+        self._batch_write(delete_items=items, parallel=parallel)
+
+    @repository_operation("batch_write")
+    def _batch_write(
+        self, put_items: Sequence[Any] = (), delete_items: Sequence[Any] = (), parallel: bool = False
+    ) -> None:
+        """
+        Write puts and deletes in chunks, retrying unprocessed items with backoff
+        Args:
+            put_items (Sequence): Model instances to put
+            delete_items (Sequence): Model instances to delete
+            parallel (bool): Write the chunks across the batch write workers
+        """
+        requests = [(PUT_REQUEST, item) for item in put_items]
+        requests += [(DELETE_REQUEST, item) for item in delete_items]
+        try:
+            request_chunks = list(chunks(requests, BATCH_WRITE_LIMIT))
+            if parallel and len(request_chunks) > 1:
+                # consume the results so that the first failure is raised
+                list(batch_write_executor.map(self._write_chunk, request_chunks))
+            else:
+                for chunk in request_chunks:
+                    self._write_chunk(chunk)
+        finally:
+            if self.cache:
+                self.cache.clear()
+
+    def _write_chunk(self, chunk: Sequence[Tuple[str, Any]]) -> None:
+        """
+        Send one BatchWriteItem request, then retry its unprocessed items with backoff
+        Args:
+            chunk (Sequence): At most 25 (PUT_REQUEST or DELETE_REQUEST, model instance) pairs
+        """
+        # the connection, and its client, belong to the calling thread
+        instrument_model(self.model_class)
+        connection = self.model_class._get_connection()
+        table_name = self.model_class.Meta.table_name
+        puts = [item.serialize() for action, item in chunk if action == PUT_REQUEST]
+        deletes = [item._get_keys() for action, item in chunk if action == DELETE_REQUEST]
+        attempt = 0
+        while puts or deletes:
+            data = connection.batch_write_item(put_items=puts, delete_items=deletes)
+            unprocessed = (data or {}).get(UNPROCESSED_ITEMS, {}).get(table_name, [])
+            puts = [request[PUT_REQUEST][ITEM] for request in unprocessed if PUT_REQUEST in request]
+            deletes = [request[DELETE_REQUEST][KEY] for request in unprocessed if DELETE_REQUEST in request]
+            if puts or deletes:
+                if attempt >= BATCH_MAX_RETRIES:
+                    raise PutError(f"Failed to batch write {len(unprocessed)} items: max retries exceeded")
+                backoff(attempt)
+                attempt += 1
+
+    def list_all(self, filter_condition=None, attributes_to_get: Optional[Sequence[str]] = None) -> List[Any]:
+        # a whole table is not cached, it would crowd out every other entry
+        return list(self.iter_all(filter_condition=filter_condition, attributes_to_get=attributes_to_get))
+
+    @repository_operation("scan")
+    def list_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        filter_condition=None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Read a single page of items
+        Args:
+            limit (int): Maximum number of items to return
+            next_token (str): Token returned by the previous page
+            filter_condition (Condition): Optional scan filter
+            attributes_to_get (Sequence): Attributes to read, None for the whole item
+        Returns:
+            tuple: Items of the page and the token of the next page
+        """
+        results = self.model_class.scan(
+            filter_condition,
+            limit=limit,
+            last_evaluated_key=decode_next_token(next_token),
+            attributes_to_get=self._projection(attributes_to_get),
+        )
+        items = list(results)
+        return items, encode_next_token(results.last_evaluated_key)
+
+    @repository_operation("scan")
+    def iter_all(
+        self,
+        filter_condition=None,
+        page_size: Optional[int] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+        segment: Optional[int] = None,
+        total_segments: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """
+        Lazily iterate over every item, one DynamoDB page at a time
+        Args:
+            filter_condition (Condition): Optional scan filter
+            page_size (int): Number of items read per DynamoDB call
+            attributes_to_get (Sequence): Attributes to read, None for the whole item
+            segment (int): Segment to read in a parallel scan, None for the whole table
+            total_segments (int): Number of segments of the parallel scan
+        Returns:
+            Iterator: Items of the table, or of the segment
+        """
+        yield from self.model_class.scan(
+            filter_condition,
+            page_size=page_size,
+            attributes_to_get=self._projection(attributes_to_get),
+            segment=segment,
+            total_segments=total_segments,
+        )
+
+    @repository_operation("query")
+    def query(
+        self,
+        hash_key: Any,
+        range_key_condition=None,
+        filter_condition=None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """
+        Read every item sharing a hash key, e.g. an item collection of a composite key table
+        Args:
+            hash_key (Any): Hash key to query
+            range_key_condition (Condition): Optional range key condition
+            filter_condition (Condition): Optional filter
+            attributes_to_get (Sequence): Attributes to read, None for the whole item
+        Returns:
+            list: Items ordered by range key
+        """
+        return self._query(None, hash_key, range_key_condition, filter_condition, attributes_to_get)
+
+    @repository_operation("query")
+    def query_page(
+        self,
+        hash_key: Any,
+        limit: int,
+        next_token: Optional[str] = None,
+        range_key_condition=None,
+        filter_condition=None,
+        index_name: Optional[str] = None,
+        scan_index_forward: Optional[bool] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Read a single page of the items sharing a hash key, on the table or an index
+        Args:
+            hash_key (Any): Hash key to query
+            limit (int): Maximum number of items to return
+            next_token (str): Token returned by the previous page
+            range_key_condition (Condition): Optional range key condition
+            filter_condition (Condition): Optional filter
+            index_name (str): Index to query, None for the table
+            scan_index_forward (bool): False to read in descending range key order
+            attributes_to_get (Sequence): Attributes to read, None for the whole item
+        Returns:
+            tuple: Items of the page and the token of the next page
+        """
+        results = self.model_class.query(
+            hash_key,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            index_name=index_name,
+            scan_index_forward=scan_index_forward,
+            limit=limit,
+            last_evaluated_key=decode_next_token(next_token),
+            attributes_to_get=self._projection(attributes_to_get),
+        )
+        items = list(results)
+        return items, encode_next_token(results.last_evaluated_key)
+
+    def query_range(
+        self,
+        hash_key: Any,
+        limit: int,
+        start: Any = None,
+        end: Any = None,
+        descending: bool = False,
+        next_token: Optional[str] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Read a single page of the items of a hash key whose range key is within bounds,
+        in range key order. Only the items of the page are read, whatever the number of
+        items under the hash key.
+        Args:
+            hash_key (Any): Hash key to query
+            limit (int): Maximum number of items to return
+            start (Any): Lowest range key to return, inclusive, None for no lower bound
+            end (Any): Highest range key to return, inclusive, None for no upper bound
+            descending (bool): True to read from the highest range key down
+            next_token (str): Token returned by the previous page
+            attributes_to_get (Sequence): Attributes to read, None for the whole item
+        Returns:
+            tuple: Items of the page and the token of the next page
+        """
+        range_key_attribute = self.model_class._range_key_attribute()
+        if start is not None and end is not None:
+            range_key_condition = range_key_attribute.between(start, end)
+        elif start is not None:
+            range_key_condition = range_key_attribute >= start
+        elif end is not None:
+            range_key_condition = range_key_attribute <= end
+        else:
+            range_key_condition = None
+        return self.query_page(
+            hash_key,
+            limit,
+            next_token=next_token,
+            range_key_condition=range_key_condition,
+            scan_index_forward=not descending,
+            attributes_to_get=attributes_to_get,
+        )
+
+    @repository_operation("query")
+    def query_index(
+        self,
+        index_name: str,
+        hash_key: Any,
+        range_key_condition=None,
+        filter_condition=None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        return self._query(index_name, hash_key, range_key_condition, filter_condition, attributes_to_get)
 
-    def delete(self, item_id: str) -> bool:
-        item = self.get(item_id)
-        if item:
-            item.delete()
-            return True
-        return False
-
-    def list_all(self, filter_condition=None) -> List[Any]:
-        if filter_condition:
-            return list(self.model_class.scan(filter_condition))
-        return list(self.model_class.scan())
+    def _query(
+        self,
+        index_name: Optional[str],
+        hash_key: Any,
+        range_key_condition=None,
+        filter_condition=None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        projection = self._projection(attributes_to_get)
+        cache_key = (
+            "query", index_name, hash_key, str(range_key_condition), str(filter_condition), str(projection)
+        )
+        if self.cache:
+            items = self._cached_items(cache_key)
+            if items is not None:
+                return items
+        items = list(
+            self.model_class.query(
+                hash_key,
+                range_key_condition=range_key_condition,
+                filter_condition=filter_condition,
+                index_name=index_name,
+                attributes_to_get=projection,
+            )
+        )
+        if self.cache:
+            self._cache_items(cache_key, items)
+        return items
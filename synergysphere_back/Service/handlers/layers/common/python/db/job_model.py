@@ -0,0 +1,65 @@
+import uuid
+
+from pynamodb.models import Model
+from pynamodb.attributes import JSONAttribute, NumberAttribute, TTLAttribute, UnicodeAttribute, UnicodeSetAttribute
+
+# Finished jobs stay readable this long, then expire via TTL
+JOB_RETENTION_DAYS = 7
+
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+# Job types
+TRELLO_IMPORT_JOB = "trello_import"
+TASK_STATUS_JOB = "task_status"
+REINDEX_JOB = "reindex"
+REBALANCE_JOB = "rebalance"
+PROJECT_DELETE_JOB = "project_delete"
+
+# Deliveries of a job queue message before it goes to the dead letter queue, as in
+# the redrive policy of the jobs queue
+JOB_MAX_RECEIVE_COUNT = 3
+
+JOB_NAMESPACE = uuid.UUID("6f1d3c7e-2a4b-4c8e-9d0f-5b7a1e3c9f42")
+
+
+def job_id(job_type, source):
+    """
+    Get the ID of the job processing a source, the same for every retry of it
+    Args:
+        job_type (str): Job type, e.g. trello_import
+        source (str): What the job processes, e.g. an S3 object key
+    Returns:
+        str: Job ID
+    """
+    return uuid.uuid5(JOB_NAMESPACE, f"{job_type}:{source}").hex
+
+
+# attributes of the job items kept from clients
+JOB_STEP_ATTRIBUTES = ("recorded_steps", "finished_steps")
+
+
+# PynamoDB model for the status and progress of background jobs
+class JobDynamoModel(Model):
+    class Meta:
+        table_name = "jobs-int-427547500501"
+        region = "ap-south-1"
+    id = UnicodeAttribute(hash_key=True)
+    job_type = UnicodeAttribute()
+    status = UnicodeAttribute()
+    source = UnicodeAttribute(null=True)
+    # number of items to process, None when only known once the job is done
+    total = NumberAttribute(null=True)
+    # progress counters, added to while the job runs
+    processed = NumberAttribute(default=0)
+    skipped = NumberAttribute(default=0)
+    # steps (chunks or pages) of the job whose progress was added, and those whose next
+    # page was queued too, so that redelivered messages are counted and followed once
+    recorded_steps = UnicodeSetAttribute(null=True)
+    finished_steps = UnicodeSetAttribute(null=True)
+    result = JSONAttribute(null=True)
+    error = UnicodeAttribute(null=True)
+    created_date = UnicodeAttribute()
+    updated_date = UnicodeAttribute(null=True)
+    expires_at = TTLAttribute(null=True)
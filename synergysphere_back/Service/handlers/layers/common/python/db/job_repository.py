@@ -0,0 +1,133 @@
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from db.generic_repository import GenericRepository
+from db.job_model import (
+    JOB_FAILED,
+    JOB_RETENTION_DAYS,
+    JOB_RUNNING,
+    JOB_STEP_ATTRIBUTES,
+    JOB_SUCCEEDED,
+    JobDynamoModel,
+)
+from utils.utils import Utils
+
+
+def job_attributes(job: Any) -> Dict[str, Any]:
+    """
+    Get the attributes of a job item returned to clients
+    Args:
+        job (JobDynamoModel): Job item
+    Returns:
+        dict: Job attributes without its recorded steps
+    """
+    return {key: value for key, value in job.attribute_values.items() if key not in JOB_STEP_ATTRIBUTES}
+
+
+class JobRepository:
+    """
+    Status items of background jobs, polled by clients while the job runs
+    """
+
+    def __init__(self):
+        self.repository = GenericRepository(JobDynamoModel)
+
+    def start(self, job_id: str, job_type: str, source: Optional[str] = None, total: Optional[int] = None) -> None:
+        """
+        Mark a job as running, resetting the progress of a previous attempt
+        Args:
+            job_id (str): Job ID
+            job_type (str): Job type
+            source (str): What the job processes
+            total (int): Number of items to process, if known upfront
+        """
+        self.repository.create({
+            "id": job_id,
+            "job_type": job_type,
+            "status": JOB_RUNNING,
+            "source": source,
+            "total": total,
+            "processed": 0,
+            "skipped": 0,
+            "created_date": Utils.get_current_timestamp(),
+            "expires_at": timedelta(days=JOB_RETENTION_DAYS),
+        })
+
+    def add_progress(
+        self, job_id: str, processed: int = 0, skipped: int = 0, step: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Add to the progress counters of a running job
+        Args:
+            job_id (str): Job ID
+            processed (int): Items processed since the last call
+            skipped (int): Items skipped since the last call
+            step (str): Chunk or page the counts are for, added once however often it is
+                recorded
+        Returns:
+            dict: Job attributes after the update, None if nothing was added
+        """
+        job = self.repository.add_counters(
+            job_id,
+            {"processed": processed, "skipped": skipped},
+            once_per=("recorded_steps", step) if step else None,
+        )
+        return job_attributes(job) if job else None
+
+    def finish_step(self, job_id: str, step: str) -> None:
+        """
+        Record that a step of a job is done, its next page queued if it has one
+        Args:
+            job_id (str): Job ID
+            step (str): Chunk or page
+        """
+        self.repository.add_counters(job_id, {}, only_existing=True, once_per=("finished_steps", step))
+
+    def is_finished(self, job_id: str, step: str) -> bool:
+        """
+        Check whether a step of a job is done, e.g. for a redelivered message
+        Args:
+            job_id (str): Job ID
+            step (str): Chunk or page
+        Returns:
+            bool: True once finish_step was called for it
+        """
+        job = self.repository.get(job_id, attributes_to_get=["id", "finished_steps"])
+        return bool(job and step in (job.finished_steps or ()))
+
+    def succeed(self, job_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Mark a job as succeeded
+        Args:
+            job_id (str): Job ID
+            result (dict): Result of the job
+        """
+        self.repository.update(job_id, {
+            "status": JOB_SUCCEEDED,
+            "result": result,
+            "updated_date": Utils.get_current_timestamp(),
+        })
+
+    def fail(self, job_id: str, error: str) -> None:
+        """
+        Mark a job as failed
+        Args:
+            job_id (str): Job ID
+            error (str): Error message
+        """
+        self.repository.update(job_id, {
+            "status": JOB_FAILED,
+            "error": error,
+            "updated_date": Utils.get_current_timestamp(),
+        })
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the status of a job
+        Args:
+            job_id (str): Job ID
+        Returns:
+            dict: Job attributes, None if it does not exist
+        """
+        job = self.repository.get(job_id)
+        return job_attributes(job) if job else None
@@ -1,11 +1,28 @@
 from pynamodb.models import Model
-from pynamodb.attributes import UnicodeAttribute
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
+
+PROJECT_ENTITY = "project"
+
+# Global secondary index to read the projects changed after a timestamp, one partition
+# per day of changes (see Utils.get_change_bucket) so that writes spread over time
+class ProjectChangeBucketIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = "change_bucket-index"
+        read_capacity_units = 5
+        write_capacity_units = 5
+        projection = AllProjection()
+    change_bucket = UnicodeAttribute(hash_key=True)
+    changed_at = UnicodeAttribute(range_key=True)
 
 # PynamoDB model for Project
 class ProjectDynamoModel(Model):
     class Meta:
         table_name = "projects-int-427547500501"
         region = "ap-south-1"
+        # warm container read cache, see db/cache.py
+        cache_ttl = 30
+        cache_max_size = 512
     id = UnicodeAttribute(hash_key=True)
     title = UnicodeAttribute()
     description = UnicodeAttribute()
@@ -13,3 +30,10 @@ class ProjectDynamoModel(Model):
     created_date = UnicodeAttribute()
     updated_by = UnicodeAttribute()
     updated_date = UnicodeAttribute()
+    # optimistic locking counter, incremented by every update
+    version = NumberAttribute(default=1, null=True)
+    # stamped by GenericRepository on every write, see change_bucket_index
+    entity_type = UnicodeAttribute(default=PROJECT_ENTITY)
+    changed_at = UnicodeAttribute(null=True)
+    change_bucket = UnicodeAttribute(null=True)
+    change_bucket_index = ProjectChangeBucketIndex()
@@ -0,0 +1,37 @@
+from pynamodb.models import Model
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+
+# Counter attribute of each board status (CardStatus in the app), anything else is counted as other
+STATUS_COUNTERS = {
+    "todo": "todo",
+    "inProgress": "in_progress",
+    "review": "review",
+    "done": "done",
+}
+OTHER_COUNTER = "other"
+COUNTERS = (*STATUS_COUNTERS.values(), OTHER_COUNTER, "total")
+
+
+def status_counter(status):
+    """
+    Get the counter attribute a task status is counted in
+    Args:
+        status (str): Task status
+    Returns:
+        str: Counter attribute name
+    """
+    return STATUS_COUNTERS.get(status, OTHER_COUNTER)
+
+
+# PynamoDB model for the task counts of a project, maintained from the tasks stream
+class ProjectSummaryDynamoModel(Model):
+    class Meta:
+        table_name = "project-summaries-int-427547500501"
+        region = "ap-south-1"
+    project_id = UnicodeAttribute(hash_key=True)
+    todo = NumberAttribute(default=0)
+    in_progress = NumberAttribute(default=0)
+    review = NumberAttribute(default=0)
+    done = NumberAttribute(default=0)
+    other = NumberAttribute(default=0)
+    total = NumberAttribute(default=0)
@@ -0,0 +1,62 @@
+from pynamodb.models import Model
+from pynamodb.attributes import JSONAttribute, NumberAttribute, UnicodeAttribute
+
+# Inverted index over the title and description of projects and tasks
+#   shard = first 2 characters of the token, sk = <token>#<entity_type>#<id>  -> posting
+#   shard = DOC#<entity_type>#<id>,          sk = DOC                        -> indexed tokens of a document
+SHARD_PREFIX_LENGTH = 2
+DOC_SORT_KEY = "DOC"
+
+
+def token_shard(token):
+    """
+    Get the shard holding the postings of a token, or of every token starting with a prefix
+    Args:
+        token (str): Token or prefix, at least SHARD_PREFIX_LENGTH characters long
+    Returns:
+        str: Shard key
+    """
+    return token[:SHARD_PREFIX_LENGTH]
+
+
+def posting_sort_key(token, entity_type, item_id):
+    """
+    Get the sort key of a posting
+    Args:
+        token (str): Token
+        entity_type (str): project or task
+        item_id (str): Document ID
+    Returns:
+        str: Sort key
+    """
+    return f"{token}#{entity_type}#{item_id}"
+
+
+def doc_shard(entity_type, item_id):
+    """
+    Get the key of the record listing the indexed tokens of a document
+    Args:
+        entity_type (str): project or task
+        item_id (str): Document ID
+    Returns:
+        str: Shard key
+    """
+    return f"DOC#{entity_type}#{item_id}"
+
+
+# PynamoDB model for the search index postings and document records
+class SearchIndexDynamoModel(Model):
+    class Meta:
+        table_name = "search-index-int-427547500501"
+        region = "ap-south-1"
+        billing_mode = "PAY_PER_REQUEST"
+    shard = UnicodeAttribute(hash_key=True)
+    sk = UnicodeAttribute(range_key=True)
+    entity_type = UnicodeAttribute(null=True)
+    id = UnicodeAttribute(null=True)
+    project_id = UnicodeAttribute(null=True)
+    title = UnicodeAttribute(null=True)
+    # postings: 2 when the token is in the title, 1 when only in the description
+    weight = NumberAttribute(null=True)
+    # document records: indexed token -> weight
+    tokens = JSONAttribute(null=True)
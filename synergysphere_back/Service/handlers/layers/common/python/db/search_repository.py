@@ -0,0 +1,216 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from db.cache import TTLCache
+from db.generic_repository import GenericRepository
+from db.search_index_model import (
+    DOC_SORT_KEY,
+    SHARD_PREFIX_LENGTH,
+    SearchIndexDynamoModel,
+    doc_shard,
+    posting_sort_key,
+    token_shard,
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+TITLE_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+# a query term equal to the indexed token scores this many times a prefix match
+EXACT_MATCH_FACTOR = 2
+
+MAX_TOKENS_PER_DOCUMENT = 200
+MAX_QUERY_TERMS = 5
+# postings of a query term are read POSTINGS_PAGE_SIZE at a time, up to
+# MAX_TERM_POSTINGS: past it the results of the search are reported truncated
+POSTINGS_PAGE_SIZE = 1000
+MAX_TERM_POSTINGS = 5000
+
+# Postings of a query term stay in the warm container this long. Writes made by
+# the container clear it, writes made elsewhere show up after at most this time.
+# The size bounds the number of postings kept, over all the cached terms.
+POSTINGS_CACHE_TTL = 60
+POSTINGS_CACHE_MAX_SIZE = 20000
+
+# shared by every SearchRepository of the container, like the model caches
+postings_cache = TTLCache(POSTINGS_CACHE_MAX_SIZE, POSTINGS_CACHE_TTL)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split a text into unique lowercase alphanumeric tokens, in order of appearance
+    Args:
+        text (str): Text to split
+    Returns:
+        list: Tokens of at least SHARD_PREFIX_LENGTH characters
+    """
+    tokens = TOKEN_PATTERN.findall((text or "").lower())
+    return list(dict.fromkeys(token for token in tokens if len(token) >= SHARD_PREFIX_LENGTH))
+
+
+def document_tokens(title: Optional[str], description: Optional[str]) -> Dict[str, int]:
+    """
+    Get the tokens of a document with their weight
+    Args:
+        title (str): Title
+        description (str): Description
+    Returns:
+        dict: Weight per token, title tokens first
+    """
+    tokens = {token: DESCRIPTION_WEIGHT for token in tokenize(description)}
+    tokens.update({token: TITLE_WEIGHT for token in tokenize(title)})
+    ordered = sorted(tokens.items(), key=lambda item: -item[1])
+    return dict(ordered[:MAX_TOKENS_PER_DOCUMENT])
+
+
+class SearchRepository:
+    """
+    Inverted index over the title and description of projects and tasks, see db/search_index_model.py
+    """
+
+    def __init__(self):
+        self.repository = GenericRepository(SearchIndexDynamoModel)
+        self.postings_cache = postings_cache
+
+    def _doc_records(self, entity_type: str, item_ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Read the document records of indexed documents
+        Args:
+            entity_type (str): project or task
+            item_ids (Iterable): Document IDs
+        Returns:
+            dict: Document record per ID, missing for documents that are not indexed
+        """
+        keys = [(doc_shard(entity_type, item_id), DOC_SORT_KEY) for item_id in item_ids]
+        return {record.id: record for record in self.repository.batch_get(keys)}
+
+    def index_documents(self, entity_type: str, documents: List[Dict[str, Any]], is_new: bool = False) -> None:
+        """
+        Add or refresh documents, writing only the postings that changed
+        Args:
+            entity_type (str): project or task
+            documents (list): Attributes of each document: id, title, description and
+                project_id for tasks
+            is_new (bool): True for documents that were just created, skips reading their records
+        """
+        records = {} if is_new else self._doc_records(entity_type, [document["id"] for document in documents])
+        puts, deletes = [], []
+        for document in documents:
+            item_id = document["id"]
+            project_id = document.get("project_id") or item_id
+            title = document.get("title")
+            tokens = document_tokens(title, document.get("description"))
+            record = records.get(item_id)
+            old_tokens = (record.tokens or {}) if record else {}
+            # postings carry the title, so all of them are rewritten when it changes
+            title_changed = record is None or record.title != title
+            for token, weight in tokens.items():
+                if title_changed or old_tokens.get(token) != weight:
+                    puts.append({
+                        "shard": token_shard(token),
+                        "sk": posting_sort_key(token, entity_type, item_id),
+                        "entity_type": entity_type,
+                        "id": item_id,
+                        "project_id": project_id,
+                        "title": title,
+                        "weight": weight,
+                    })
+            deletes += [
+                (token_shard(token), posting_sort_key(token, entity_type, item_id))
+                for token in old_tokens if token not in tokens
+            ]
+            puts.append({
+                "shard": doc_shard(entity_type, item_id),
+                "sk": DOC_SORT_KEY,
+                "entity_type": entity_type,
+                "id": item_id,
+                "title": title,
+                "tokens": tokens,
+            })
+        self.repository.batch_create(puts)
+        if deletes:
+            self.repository.batch_delete(deletes)
+        self.postings_cache.clear()
+
+    def remove_documents(self, entity_type: str, item_ids: Iterable[str]) -> None:
+        """
+        Remove documents and all their postings
+        Args:
+            entity_type (str): project or task
+            item_ids (Iterable): Document IDs
+        """
+        records = self._doc_records(entity_type, item_ids)
+        deletes = []
+        for item_id, record in records.items():
+            deletes += [
+                (token_shard(token), posting_sort_key(token, entity_type, item_id))
+                for token in (record.tokens or {})
+            ]
+            deletes.append((doc_shard(entity_type, item_id), DOC_SORT_KEY))
+        if deletes:
+            self.repository.batch_delete(deletes)
+        self.postings_cache.clear()
+
+    def _postings(self, term: str) -> Tuple[List[Tuple[str, str, str, Optional[str], Optional[str], int]], bool]:
+        """
+        Get the postings of every token starting with a term, from the container cache
+        or a Query paged up to MAX_TERM_POSTINGS
+        Args:
+            term (str): Query term
+        Returns:
+            tuple: (token, entity_type, id, project_id, title, weight) of each posting, and
+                True when postings past MAX_TERM_POSTINGS were left unread
+        """
+        cached = self.postings_cache.get(term)
+        if cached is not None:
+            return cached
+        postings = []
+        next_token = None
+        while True:
+            items, next_token = self.repository.query_page(
+                token_shard(term),
+                min(POSTINGS_PAGE_SIZE, MAX_TERM_POSTINGS - len(postings)),
+                next_token=next_token,
+                range_key_condition=SearchIndexDynamoModel.sk.startswith(term),
+            )
+            postings += [
+                (item.sk.split("#", 1)[0], item.entity_type, item.id, item.project_id, item.title, int(item.weight))
+                for item in items
+            ]
+            if not next_token or len(postings) >= MAX_TERM_POSTINGS:
+                break
+        truncated = next_token is not None
+        self.postings_cache.set(term, (postings, truncated), weight=len(postings))
+        return postings, truncated
+
+    def search(self, query: str, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Find the documents containing a token starting with every term of the query
+        Args:
+            query (str): Search text
+            limit (int): Maximum number of results
+        Returns:
+            tuple: Best ranked documents first, with their entity_type, id, project_id, title
+                and score, and True when a term had more than MAX_TERM_POSTINGS postings, so
+                that matching documents may be missing
+        """
+        scores = None
+        documents = {}
+        truncated = False
+        for term in tokenize(query)[:MAX_QUERY_TERMS]:
+            term_scores = {}
+            postings, term_truncated = self._postings(term)
+            truncated |= term_truncated
+            for token, entity_type, item_id, project_id, title, weight in postings:
+                key = (entity_type, item_id)
+                score = weight * (EXACT_MATCH_FACTOR if token == term else 1)
+                term_scores[key] = max(term_scores.get(key, 0), score)
+                documents[key] = {"entity_type": entity_type, "id": item_id, "project_id": project_id, "title": title}
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {key: score + term_scores[key] for key, score in scores.items() if key in term_scores}
+        ranked = sorted(
+            (scores or {}).items(), key=lambda item: (-item[1], documents[item[0]]["title"] or "")
+        )
+        return [{**documents[key], "score": score} for key, score in ranked[:limit]], truncated
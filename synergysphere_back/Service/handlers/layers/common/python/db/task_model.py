@@ -1,11 +1,35 @@
 from pynamodb.models import Model
-from pynamodb.attributes import UnicodeAttribute
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
+
+TASK_ENTITY = "task"
+
+# Global secondary index to look up the tasks of a project
+class ProjectIdIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = "project_id-index"
+        projection = AllProjection()
+    project_id = UnicodeAttribute(hash_key=True)
+
+# Global secondary index to read the tasks changed after a timestamp, one partition
+# per day of changes (see Utils.get_change_bucket) so that writes spread over time
+class TaskChangeBucketIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = "change_bucket-index"
+        projection = AllProjection()
+    change_bucket = UnicodeAttribute(hash_key=True)
+    changed_at = UnicodeAttribute(range_key=True)
 
 # PynamoDB model for Task
 class TaskDynamoModel(Model):
     class Meta:
-        table_name = "tasks-int-427547500501"
+        table_name = "tasks-v2-int-427547500501"
         region = "ap-south-1"
+        # on demand like the table, see billing_mode in dynamoDb.json
+        billing_mode = "PAY_PER_REQUEST"
+        # warm container read cache, see db/cache.py
+        cache_ttl = 10
+        cache_max_size = 512
     id = UnicodeAttribute(hash_key=True)
     project_id = UnicodeAttribute()
     title = UnicodeAttribute()
@@ -17,3 +41,13 @@ class TaskDynamoModel(Model):
     updated_date = UnicodeAttribute()
     created_by = UnicodeAttribute()
     created_date = UnicodeAttribute()
+    # position in its status column, see utils/rank.py
+    rank = UnicodeAttribute(null=True)
+    # optimistic locking counter, incremented by every update
+    version = NumberAttribute(default=1, null=True)
+    # stamped by GenericRepository on every write, see change_bucket_index
+    entity_type = UnicodeAttribute(default=TASK_ENTITY)
+    changed_at = UnicodeAttribute(null=True)
+    change_bucket = UnicodeAttribute(null=True)
+    project_id_index = ProjectIdIndex()
+    change_bucket_index = TaskChangeBucketIndex()
@@ -0,0 +1,31 @@
+from pynamodb.models import Model
+from pynamodb.attributes import TTLAttribute, UnicodeAttribute
+
+# Deleted items stay visible to sync clients this long, then expire via TTL
+TOMBSTONE_RETENTION_DAYS = 30
+
+
+def tombstone_key(changed_at, item_id):
+    """
+    Get the sort key of a tombstone, ordered by deletion time
+    Args:
+        changed_at (str): Deletion timestamp
+        item_id (str): ID of the deleted item
+    Returns:
+        str: Sort key
+    """
+    return f"{changed_at}#{item_id}"
+
+
+# PynamoDB model for the deletions of projects and tasks
+class TombstoneDynamoModel(Model):
+    class Meta:
+        table_name = "tombstones-int-427547500501"
+        region = "ap-south-1"
+    # day bucket of the deletion (see Utils.get_change_bucket), stored in the entity_type
+    # key attribute of the table
+    change_bucket = UnicodeAttribute(hash_key=True, attr_name="entity_type")
+    tombstone_key = UnicodeAttribute(range_key=True)
+    id = UnicodeAttribute()
+    changed_at = UnicodeAttribute()
+    expires_at = TTLAttribute()
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from db.generic_repository import GenericRepository
+from db.tombstone_model import TOMBSTONE_RETENTION_DAYS, TombstoneDynamoModel, tombstone_key
+from utils.utils import Utils
+
+
+class TombstoneRepository:
+    """
+    Deletions of projects and tasks, read by sync clients after a watermark
+    """
+
+    def __init__(self):
+        self.repository = GenericRepository(TombstoneDynamoModel)
+
+    def record_deletions(self, entity_type: str, item_ids: Iterable[str]) -> None:
+        """
+        Write a tombstone for every deleted item, batched for more than one item
+        Args:
+            entity_type (str): project or task
+            item_ids (Iterable): IDs of the deleted items
+        """
+        changed_at = Utils.get_change_timestamp()
+        tombstones = [
+            {
+                "change_bucket": Utils.get_change_bucket(entity_type, changed_at),
+                "tombstone_key": tombstone_key(changed_at, item_id),
+                "id": item_id,
+                "changed_at": changed_at,
+                "expires_at": timedelta(days=TOMBSTONE_RETENTION_DAYS),
+            }
+            for item_id in item_ids
+        ]
+        if len(tombstones) == 1:
+            self.repository.create(tombstones[0])
+        elif tombstones:
+            self.repository.batch_create(tombstones)
+
+    @staticmethod
+    def get_buckets(entity_type: str, since: str, until: str) -> List[str]:
+        """
+        Get the partitions holding the tombstones written between two timestamps, oldest first
+        Args:
+            entity_type (str): project or task
+            since (str): Watermark, as returned by Utils.get_change_timestamp
+            until (str): Upper bound, as returned by Utils.get_change_timestamp
+        Returns:
+            list: Day buckets
+        """
+        return Utils.get_change_buckets(entity_type, since, until)
+
+    def get_page(
+        self, since: str, until: str, bucket: str, limit: int, next_token: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Read a page of the tombstones of a partition written between two timestamps, oldest first
+        Args:
+            since (str): Watermark, as returned by Utils.get_change_timestamp
+            until (str): Upper bound, as returned by Utils.get_change_timestamp
+            bucket (str): Partition, see get_buckets
+            limit (int): Maximum number of tombstones to return
+            next_token (str): Token returned by the previous page
+        Returns:
+            tuple: Tombstones and the token of the next page, None after the last one
+        """
+        items, next_token = self.repository.query_page(
+            bucket,
+            limit,
+            next_token=next_token,
+            range_key_condition=TombstoneDynamoModel.tombstone_key.between(
+                since, tombstone_key(until, "\uffff")
+            ),
+        )
+        entity_type = bucket.split("#", 1)[0]
+        tombstones = [
+            {"entity_type": entity_type, "id": item.id, "deleted_at": item.changed_at} for item in items
+        ]
+        return tombstones, next_token
@@ -6,3 +6,15 @@ class ProjectException(Exception):
 class TaskException(Exception):
     """Custom exception for task-related errors."""
     pass
+
+class VersionConflictException(Exception):
+    """Raised when an optimistic locking version check fails."""
+    pass
+
+class ExportException(Exception):
+    """Raised when a table export fails."""
+    pass
+
+class ImportException(Exception):
+    """Raised when an import fails."""
+    pass
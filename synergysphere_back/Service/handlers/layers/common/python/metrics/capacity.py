@@ -0,0 +1,105 @@
+"""
+DynamoDB consumed capacity accounting
+
+Every DynamoDB call made through an instrumented botocore client asks for
+ReturnConsumedCapacity=TOTAL and the returned units are summed per table
+until the end of the invocation.
+"""
+
+import json
+import threading
+from collections import defaultdict
+
+RETURN_CONSUMED_CAPACITY = "TOTAL"
+
+READ_OPERATIONS = {"GetItem", "BatchGetItem", "Query", "Scan", "TransactGetItems"}
+WRITE_OPERATIONS = {"PutItem", "UpdateItem", "DeleteItem", "BatchWriteItem", "TransactWriteItems"}
+
+_consumed: dict[str, dict[str, float]] = defaultdict(lambda: {"read": 0.0, "write": 0.0})
+_consumed_lock = threading.Lock()
+
+
+def _request_consumed_capacity(params, model, **_) -> None:
+    """
+    botocore provide-client-params handler adding ReturnConsumedCapacity to supporting operations
+    """
+    if model.name in READ_OPERATIONS or model.name in WRITE_OPERATIONS:
+        params.setdefault("ReturnConsumedCapacity", RETURN_CONSUMED_CAPACITY)
+
+
+def _record_consumed_capacity(parsed, model, **_) -> None:
+    """
+    botocore after-call handler summing the ConsumedCapacity of a response
+    """
+    consumed = (parsed or {}).get("ConsumedCapacity")
+    if not consumed:
+        return
+    kind = "read" if model.name in READ_OPERATIONS else "write"
+    entries = consumed if isinstance(consumed, list) else [consumed]
+    with _consumed_lock:
+        for entry in entries:
+            _consumed[entry.get("TableName", "unknown")][kind] += float(entry.get("CapacityUnits", 0))
+
+
+def instrument_client(client) -> None:
+    """
+    Register the consumed capacity handlers on a DynamoDB botocore client, once per client
+    Args:
+        client: botocore DynamoDB client
+    """
+    if getattr(client, "_consumed_capacity_instrumented", False):
+        return
+    client.meta.events.register("provide-client-params.dynamodb", _request_consumed_capacity)
+    client.meta.events.register("after-call.dynamodb", _record_consumed_capacity)
+    client._consumed_capacity_instrumented = True
+
+
+def instrument_model(model_class) -> None:
+    """
+    Instrument the client the current thread uses for a PynamoDB model.
+    PynamoDB keeps one client per thread, so this is called before every repository call.
+    Args:
+        model_class (Type): PynamoDB model
+    """
+    instrument_client(model_class._get_connection().connection.client)
+
+
+def pop_consumed_capacity() -> dict[str, dict[str, float]]:
+    """
+    Get the capacity consumed since the last call and reset the counters
+    Returns:
+        dict: Read and write capacity units per table
+    """
+    with _consumed_lock:
+        consumed = {table: dict(units) for table, units in _consumed.items()}
+        _consumed.clear()
+    return consumed
+
+
+def total_consumed_capacity(consumed: dict[str, dict[str, float]]) -> dict[str, float]:
+    """
+    Sum the consumed capacity over all tables
+    Args:
+        consumed (dict): Read and write capacity units per table
+    Returns:
+        dict: Read and write capacity units
+    """
+    return {
+        kind: round(sum(units[kind] for units in consumed.values()), 3) for kind in ("read", "write")
+    }
+
+
+def format_consumed_capacity(consumed: dict[str, dict[str, float]]) -> str:
+    """
+    Render the consumed capacity as a compact JSON header value
+    Args:
+        consumed (dict): Read and write capacity units per table
+    Returns:
+        str: e.g. {"total":{"read":1.5,"write":0.0},"tables":{"tasks-int":{"read":1.5,"write":0.0}}}
+    """
+    tables = {
+        table: {kind: round(value, 3) for kind, value in units.items()} for table, units in consumed.items()
+    }
+    return json.dumps(
+        {"total": total_consumed_capacity(consumed), "tables": tables}, separators=(",", ":")
+    )
@@ -0,0 +1,175 @@
+"""
+Latency metrics published as CloudWatch Embedded Metric Format
+"""
+
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from inspect import iscoroutinefunction, isgeneratorfunction
+
+from aws_lambda_powertools.metrics import EphemeralMetrics, Metrics, MetricUnit
+
+from db.cache import pop_cache_counters
+from metrics.capacity import instrument_model, total_consumed_capacity
+
+METRICS_NAMESPACE = os.environ.get("POWERTOOLS_METRICS_NAMESPACE", "SynergySphere")
+
+# Per invocation metrics that only carry the service dimension, flushed by
+# generate_response. Alarms are defined on these.
+metrics = Metrics(namespace=METRICS_NAMESPACE)
+
+_repository_latencies: dict[tuple[str, str], list[float]] = defaultdict(list)
+_repository_lock = threading.Lock()
+
+
+def elapsed_ms(start: float) -> float:
+    """
+    Get the milliseconds elapsed since a perf_counter reading
+    Args:
+        start (float): time.perf_counter() value
+    Returns:
+        float: Elapsed milliseconds
+    """
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+@contextmanager
+def timed(metric_name: str):
+    """
+    Record the duration of a block as a per invocation metric
+    Args:
+        metric_name (str): Metric name, e.g. ValidationTime
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_metric(name=metric_name, unit=MetricUnit.Milliseconds, value=elapsed_ms(start))
+
+
+def record_repository_call(model: str, operation: str, duration_ms: float) -> None:
+    """
+    Buffer the latency of a repository call until the end of the invocation
+    Args:
+        model (str): Model name
+        operation (str): Operation, e.g. get, scan, query, save, delete
+        duration_ms (float): Call latency
+    """
+    with _repository_lock:
+        _repository_latencies[(model, operation)].append(duration_ms)
+
+
+def repository_operation(operation: str):
+    """
+    Decorator recording the latency of a GenericRepository method, tagged by model and operation.
+    For generators only the time spent producing items is counted, for coroutines the time
+    until they complete. The model's client is instrumented so the call also reports its
+    consumed capacity (async repositories instrument their own client).
+    Args:
+        operation (str): Operation name
+    Returns:
+        function: Decorator
+    """
+
+    def decorator(func):
+        if isgeneratorfunction(func):
+            @wraps(func)
+            def generator_wrapper(self, *args, **kwargs):
+                instrument_model(self.model_class)
+                iterator = func(self, *args, **kwargs)
+                duration = 0.0
+                try:
+                    while True:
+                        start = time.perf_counter()
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            return
+                        finally:
+                            duration += elapsed_ms(start)
+                        yield item
+                finally:
+                    record_repository_call(self.model_class.__name__, operation, duration)
+
+            return generator_wrapper
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def coroutine_wrapper(self, *args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(self, *args, **kwargs)
+                finally:
+                    record_repository_call(self.model_class.__name__, operation, elapsed_ms(start))
+
+            return coroutine_wrapper
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            instrument_model(self.model_class)
+            start = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                record_repository_call(self.model_class.__name__, operation, elapsed_ms(start))
+
+        return wrapper
+
+    return decorator
+
+
+def publish_request_metrics(
+    route: dict[str, str], duration_ms: float, consumed_capacity: dict[str, dict[str, float]]
+) -> None:
+    """
+    Flush the metrics of the invocation: handler latency and consumed capacity (with
+    and without the route dimensions), capacity per table, the model cache hits, misses
+    and evictions per table, the buffered repository latencies and the phase timers
+    Args:
+        route (dict): Route dimensions, e.g. method, action and sub_action
+        duration_ms (float): Total handler time
+        consumed_capacity (dict): Read and write capacity units per table
+    """
+    total = total_consumed_capacity(consumed_capacity)
+    metrics.add_metric(name="HandlerLatency", unit=MetricUnit.Milliseconds, value=duration_ms)
+    metrics.add_metric(name="ConsumedReadCapacity", unit=MetricUnit.Count, value=total["read"])
+    metrics.add_metric(name="ConsumedWriteCapacity", unit=MetricUnit.Count, value=total["write"])
+
+    route_metrics = EphemeralMetrics(namespace=METRICS_NAMESPACE)
+    for name, value in route.items():
+        route_metrics.add_dimension(name=name, value=value)
+    route_metrics.add_metric(name="HandlerLatency", unit=MetricUnit.Milliseconds, value=duration_ms)
+    route_metrics.add_metric(name="ConsumedReadCapacity", unit=MetricUnit.Count, value=total["read"])
+    route_metrics.add_metric(name="ConsumedWriteCapacity", unit=MetricUnit.Count, value=total["write"])
+    route_metrics.flush_metrics()
+
+    for table, units in consumed_capacity.items():
+        table_metrics = EphemeralMetrics(namespace=METRICS_NAMESPACE)
+        table_metrics.add_dimension(name="table", value=table)
+        table_metrics.add_metric(name="ConsumedReadCapacity", unit=MetricUnit.Count, value=units["read"])
+        table_metrics.add_metric(name="ConsumedWriteCapacity", unit=MetricUnit.Count, value=units["write"])
+        table_metrics.flush_metrics()
+
+    for table, counters in pop_cache_counters().items():
+        cache_metrics = EphemeralMetrics(namespace=METRICS_NAMESPACE)
+        cache_metrics.add_dimension(name="table", value=table)
+        cache_metrics.add_metric(name="CacheHits", unit=MetricUnit.Count, value=counters["hits"])
+        cache_metrics.add_metric(name="CacheMisses", unit=MetricUnit.Count, value=counters["misses"])
+        cache_metrics.add_metric(name="CacheEvictions", unit=MetricUnit.Count, value=counters["evictions"])
+        cache_metrics.flush_metrics()
+
+    with _repository_lock:
+        latencies = dict(_repository_latencies)
+        _repository_latencies.clear()
+    for (model, operation), values in latencies.items():
+        call_metrics = EphemeralMetrics(namespace=METRICS_NAMESPACE)
+        call_metrics.add_dimension(name="model", value=model)
+        call_metrics.add_dimension(name="operation", value=operation)
+        for value in values:
+            call_metrics.add_metric(name="RepositoryLatency", unit=MetricUnit.Milliseconds, value=value)
+        call_metrics.flush_metrics()
+
+    metrics.flush_metrics()
@@ -2,12 +2,92 @@
 response wrapper for lambda response management
 """
 
+import logging
+import os
+import reprlib
+import time
 from http import HTTPStatus
 
 from aws_lambda_powertools import Logger
 
+from metrics.capacity import format_consumed_capacity, pop_consumed_capacity, total_consumed_capacity
+from metrics.metrics import elapsed_ms, publish_request_metrics, timed
+from utils.json_encoder import dumps
+
+# Debug sampling is controlled by POWERTOOLS_LOGGER_SAMPLE_RATE, payloads are
+# only rendered when a record is actually emitted and never beyond this size.
+LOG_PAYLOAD_MAX_BYTES = int(os.environ.get("LOG_PAYLOAD_MAX_BYTES", "2048"))
+
+# ?debug=true returns the DynamoDB capacity consumed by the request in this header
+CONSUMED_CAPACITY_HEADER = "X-Consumed-Capacity"
+
 logger = Logger()
 
+_payload_repr = reprlib.Repr()
+_payload_repr.maxlevel = 4
+_payload_repr.maxdict = 20
+_payload_repr.maxlist = 10
+_payload_repr.maxstring = 200
+_payload_repr.maxother = 200
+
+
+class TruncatedPayload:
+    """
+    Lazily rendered, size capped view of a payload for log messages
+    """
+
+    def __init__(self, payload, max_bytes: int = LOG_PAYLOAD_MAX_BYTES):
+        self.payload = payload
+        self.max_bytes = max_bytes
+
+    def __str__(self) -> str:
+        rendered = _payload_repr.repr(self.payload)
+        if len(rendered) > self.max_bytes:
+            return f"{rendered[:self.max_bytes]}... [truncated]"
+        return rendered
+
+
+def get_route_dimensions(event) -> dict[str, str]:
+    """
+    Get the route of the request as metric dimensions
+    Args:
+        event (dict): Event data
+    Returns:
+        dict: method, action and sub_action of the request
+    """
+    queryparam = event.get("params", {}).get("querystring", {})
+    return {
+        "method": event.get("context", {}).get("http-method", "UNKNOWN"),
+        "action": queryparam.get("action") or "none",
+        "sub_action": queryparam.get("sub_action") or queryparam.get("mode") or "none",
+    }
+
+
+def is_debug_request(event) -> bool:
+    """
+    Check whether the debug query parameter is set
+    Args:
+        event (dict): Event data
+    Returns:
+        bool: True for ?debug=true or ?debug=1
+    """
+    debug = event.get("params", {}).get("querystring", {}).get("debug", "")
+    return debug.lower() in ("1", "true")
+
+
+def get_route(event) -> str:
+    """
+    Get a short route name for the request
+    Args:
+        event (dict): Event data
+    Returns:
+        str: Route, e.g. "GET project/all"
+    """
+    dimensions = get_route_dimensions(event)
+    parts = [dimensions[name] for name in ("action", "sub_action") if dimensions[name] != "none"]
+    return f"{dimensions['method']} {'/'.join(parts)}"
+
+
 def generate_response(func):
     """
     Lambda response generator
@@ -18,28 +98,60 @@ def generate_response(func):
     """
 
     def wrapper(event, context):
+        start = time.perf_counter()
+        logger.refresh_sample_rate_calculation()
+        request_id = event.get("context", {}).get("request-id") or getattr(context, "aws_request_id", None)
+        logger.set_correlation_id(request_id)
+        logger.debug("starting to generate response for event - %s", TruncatedPayload(event))
         try:
-            logger.info(f"starting to generate response for event - {event}")
             result = func(event, context)
 
             response = {
-                "statusCode": result["statusCode"],
+                "statusCode": result["status"],
                 "body": {"message": result["message"]}
             }
 
-            data = result.get("body")
+            data = result.get("data")
 
             if data is not None:
                 response["body"]["data"] = data
-        
+
+            # paged routes always return the cursor, None on their last page
+            if "next_cursor" in result:
+                response["body"]["next_cursor"] = result["next_cursor"]
+
         except Exception as err:
-            logger.info(f"The exception is - {str(err)}")
+            logger.warning("The exception is - %s", err)
             response = {
                 "statusCode": HTTPStatus.BAD_REQUEST.value,
                 "body": {"message": str(err)}
             }
-        
-        logger.info(f"response generated - {response}")
+
+        logger.debug("response generated - %s", TruncatedPayload(response))
+        debug = is_debug_request(event)
+        # API Gateway encodes the body again, it is only measured for debug and sampled requests
+        response_bytes = None
+        if debug or logger.log_level <= logging.DEBUG:
+            with timed("SerializationTime"):
+                response_bytes = len(dumps(response["body"]))
+        duration_ms = elapsed_ms(start)
+        consumed_capacity = pop_consumed_capacity()
+        total_capacity = total_consumed_capacity(consumed_capacity)
+        if debug:
+            response["headers"] = {CONSUMED_CAPACITY_HEADER: format_consumed_capacity(consumed_capacity)}
+        data = response["body"].get("data")
+        summary = {
+            "route": get_route(event),
+            "status": response["statusCode"],
+            "item_count": len(data) if isinstance(data, list) else int(data is not None),
+            "duration_ms": duration_ms,
+            "consumed_rcu": total_capacity["read"],
+            "consumed_wcu": total_capacity["write"],
+        }
+        if response_bytes is not None:
+            summary["response_bytes"] = response_bytes
+        logger.info("request completed", extra=summary)
+        publish_request_metrics(get_route_dimensions(event), duration_ms, consumed_capacity)
         return response
-    
+
     return wrapper
@@ -0,0 +1,24 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+class AttachmentUploadRequest(BaseModel):
+    task_id: str
+    file_name: str
+    content_type: str = "application/octet-stream"
+    size: int
+    created_by: str
+
+class AttachmentPart(BaseModel):
+    part_number: int
+    etag: str
+
+class AttachmentCompleteRequest(BaseModel):
+    task_id: str
+    id: str
+    parts: Optional[List[AttachmentPart]] = None
+
+class AttachmentSignRequest(BaseModel):
+    task_id: str
+    id: str
+    part_numbers: Optional[List[int]] = None
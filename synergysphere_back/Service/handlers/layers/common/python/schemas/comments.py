@@ -0,0 +1,11 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+MAX_COMMENT_LENGTH = 10000
+
+class CommentCreateRequest(BaseModel):
+    task_id: str
+    content: str = Field(min_length=1, max_length=MAX_COMMENT_LENGTH)
+    author_id: str
+    parent_comment_id: Optional[str] = None
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 class ProjectCreateRequest(BaseModel):
@@ -10,11 +12,24 @@ class ProjectUpdateRequest(BaseModel):
     title: str
     description: str
     updated_by: str
+    version: Optional[int] = None
+
+class ProjectReindexRequest(BaseModel):
+    project_id: str
+
+class TaskCounts(BaseModel):
+    todo: int = 0
+    in_progress: int = 0
+    review: int = 0
+    done: int = 0
+    other: int = 0
+    total: int = 0
 
 class ProjectListResponse(BaseModel):
     id: str
     title: str
     description: str
+    task_counts: TaskCounts = TaskCounts()
 
 
 class ProjectIdResponse(BaseModel):
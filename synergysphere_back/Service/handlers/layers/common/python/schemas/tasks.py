@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+class TaskCreateRequest(BaseModel):
+    project_id: str
+    title: str
+    description: str
+    creator: str
+    status: str = "todo"
+    end_date: str
+    created_by: str
+
+class TaskBulkCreateRequest(BaseModel):
+    tasks: List[TaskCreateRequest]
+
+class TaskUpdateRequest(BaseModel):
+    id: str
+    title: str
+    description: str
+    status: str
+    end_date: str
+    update_by: str
+    version: Optional[int] = None
+
+class TaskMoveRequest(BaseModel):
+    id: str
+    status: str
+    # neighbours in the destination column, None at its start or end
+    before_id: Optional[str] = None
+    after_id: Optional[str] = None
+    update_by: str
+    version: Optional[int] = None
+
+class TaskColumnRequest(BaseModel):
+    project_id: str
+    status: str
+
+class TaskBulkStatusRequest(BaseModel):
+    ids: List[str] = Field(min_length=1)
+    status: str
+    update_by: str
@@ -0,0 +1,33 @@
+"""
+Event loop of the container, driving the async repositories from synchronous handlers
+"""
+
+import asyncio
+from typing import Any, Awaitable
+
+_loop = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop of the container, created on first use and kept across invocations
+    so that the async clients bound to it stay open while the container is warm
+    Returns:
+        asyncio.AbstractEventLoop: Event loop
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop
+
+
+def run_async(awaitable: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine to completion on the event loop of the container. Only to be called
+    from the handler thread, the loop runs one coroutine at a time.
+    Args:
+        awaitable (Awaitable): Coroutine, e.g. an asyncio.gather of independent reads
+    Returns:
+        Any: Result of the coroutine
+    """
+    return get_event_loop().run_until_complete(awaitable)
@@ -0,0 +1,158 @@
+"""
+Idempotent create requests
+
+A create request is run once per idempotency key: the response is stored in the
+idempotency table, and a retry with the same key gets it back without the data
+tables being read or written. While the first request runs its record is marked
+in progress, so a concurrent retry is answered with 409 instead of creating a
+duplicate.
+
+The key is the Idempotency-Key header when the client sends one. Otherwise it is
+the hash of the request body, kept for a short time only, since two identical
+creates minutes apart are more likely wanted than a retry.
+
+Responses too large for a DynamoDB item, e.g. of bulk creates, are stored in a
+compact form, rebuilt for the retries (see the compact and expand arguments of
+idempotent_create).
+"""
+
+import hashlib
+import json
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Optional
+
+import boto3
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.idempotency import (
+    DynamoDBPersistenceLayer,
+    IdempotencyConfig,
+    idempotent_function,
+)
+from aws_lambda_powertools.utilities.idempotency.exceptions import (
+    IdempotencyAlreadyInProgressError,
+    IdempotencyValidationError,
+)
+
+from metrics.capacity import instrument_client
+from response.response_handler import get_route
+
+logger = Logger(service="idempotency")
+
+IDEMPOTENCY_TABLE = "idempotency-int-427547500501"
+IDEMPOTENCY_KEY_HEADER = "idempotency-key"
+
+# Clients sending a key may retry for a day, e.g. after coming back online
+IDEMPOTENCY_KEY_TTL_SECONDS = 24 * 60 * 60
+# Retries without a key come within seconds of the first request
+BODY_HASH_TTL_SECONDS = 2 * 60
+
+_client = boto3.client("dynamodb", region_name="ap-south-1")
+instrument_client(_client)
+
+# a persistence layer keeps the first config it is used with, so one per config
+key_store = DynamoDBPersistenceLayer(table_name=IDEMPOTENCY_TABLE, boto3_client=_client)
+body_hash_store = DynamoDBPersistenceLayer(table_name=IDEMPOTENCY_TABLE, boto3_client=_client)
+
+# the stored response belongs to a route and a key, and a key reused with another
+# body is rejected
+key_config = IdempotencyConfig(
+    event_key_jmespath="[route, key]",
+    payload_validation_jmespath="body",
+    expires_after_seconds=IDEMPOTENCY_KEY_TTL_SECONDS,
+    use_local_cache=True,
+)
+body_hash_config = IdempotencyConfig(
+    event_key_jmespath="[route, key]",
+    expires_after_seconds=BODY_HASH_TTL_SECONDS,
+    use_local_cache=True,
+)
+
+
+@idempotent_function(data_keyword_argument="request", persistence_store=key_store, config=key_config)
+def _run_with_key(func: Callable[..., dict], request: dict) -> dict:
+    return func(request["body"])
+
+
+@idempotent_function(data_keyword_argument="request", persistence_store=body_hash_store, config=body_hash_config)
+def _run_with_body_hash(func: Callable[..., dict], request: dict) -> dict:
+    return func(request["body"])
+
+
+def get_idempotency_key(event: dict) -> Optional[str]:
+    """
+    Get the Idempotency-Key header of a request, whatever its case
+    Args:
+        event (dict): Event data
+    Returns:
+        str: Idempotency key, None if the header is not set
+    """
+    headers = event.get("params", {}).get("header") or {}
+    for name, value in headers.items():
+        if name.lower() == IDEMPOTENCY_KEY_HEADER and value:
+            return value
+    return None
+
+
+def body_hash(body: Any) -> str:
+    """
+    Hash a request body, the same for the same JSON whatever the order of its keys
+    Args:
+        body (Any): Request body
+    Returns:
+        str: SHA-256 hex digest
+    """
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def idempotent_create(
+    event: dict,
+    context: Any,
+    func: Callable[[Any], dict],
+    compact: Optional[Callable[[dict], dict]] = None,
+    expand: Optional[Callable[[dict], dict]] = None,
+) -> Dict[str, Any]:
+    """
+    Run a create route at most once per idempotency key
+    Args:
+        event (dict): Event data
+        context: Lambda context, None outside Lambda
+        func (Callable): Manager method called with the request body
+        compact (Callable): Get the form of a response that is stored, the whole
+            response when not given
+        expand (Callable): Rebuild a response from its stored form, for retries
+    Returns:
+        dict: Response of func, stored or fresh
+    """
+    fresh = {}
+
+    def run_func(request_body: Any) -> dict:
+        fresh["response"] = func(request_body)
+        return compact(fresh["response"]) if compact else fresh["response"]
+
+    key = get_idempotency_key(event)
+    body = event.get("body")
+    request = {"route": get_route(event), "key": key or body_hash(body), "body": body}
+    run = _run_with_key if key else _run_with_body_hash
+    if context is not None:
+        # an in-progress record outlives a timed out invocation only until its deadline
+        (key_config if key else body_hash_config).register_lambda_context(context)
+    try:
+        stored = run(func=run_func, request=request)
+    except IdempotencyAlreadyInProgressError:
+        logger.warning(f"Request {request['route']} with key {request['key']} is already in progress")
+        return {
+            "status": HTTPStatus.CONFLICT.value,
+            "data": None,
+            "message": "A request with this idempotency key is in progress, retry later",
+        }
+    except IdempotencyValidationError:
+        logger.warning(f"Idempotency key {key} reused with another body")
+        return {
+            "status": HTTPStatus.UNPROCESSABLE_ENTITY.value,
+            "data": None,
+            "message": "Idempotency key already used for a different request",
+        }
+    if "response" in fresh:
+        return fresh["response"]
+    return expand(stored) if expand else stored
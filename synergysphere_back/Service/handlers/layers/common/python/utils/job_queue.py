@@ -0,0 +1,60 @@
+"""
+Messages of the background jobs queue
+"""
+
+import json
+import os
+from typing import Any, Dict, List
+
+import boto3
+
+from db.generic_repository import backoff
+
+# Name of the jobs queue, unset outside Lambda where jobs run inline
+JOB_QUEUE = os.environ.get("JOB_QUEUE")
+
+# SendMessageBatch takes at most 10 messages
+SEND_BATCH_LIMIT = 10
+SEND_MAX_RETRIES = 5
+
+_sqs_client = None
+_queue_url = None
+
+
+def get_queue_url() -> str:
+    """
+    Get the URL of the jobs queue, looked up once per container
+    Returns:
+        str: Queue URL
+    """
+    global _sqs_client, _queue_url
+    if _queue_url is None:
+        _sqs_client = boto3.client("sqs")
+        _queue_url = _sqs_client.get_queue_url(QueueName=JOB_QUEUE)["QueueUrl"]
+    return _queue_url
+
+
+def send_messages(messages: List[Dict[str, Any]]) -> None:
+    """
+    Send messages to the jobs queue, 10 per request, retrying the failed ones with backoff
+    Args:
+        messages (list): JSON serializable messages
+    Raises:
+        RuntimeError: If some messages still fail after the retries
+    """
+    queue_url = get_queue_url()
+    for start in range(0, len(messages), SEND_BATCH_LIMIT):
+        entries = [
+            {"Id": str(index), "MessageBody": json.dumps(message, default=str)}
+            for index, message in enumerate(messages[start:start + SEND_BATCH_LIMIT])
+        ]
+        attempt = 0
+        while entries:
+            response = _sqs_client.send_message_batch(QueueUrl=queue_url, Entries=entries)
+            failed = {failure["Id"] for failure in response.get("Failed", [])}
+            entries = [entry for entry in entries if entry["Id"] in failed]
+            if entries:
+                if attempt >= SEND_MAX_RETRIES:
+                    raise RuntimeError(f"Failed to send {len(entries)} job messages: max retries exceeded")
+                backoff(attempt)
+                attempt += 1
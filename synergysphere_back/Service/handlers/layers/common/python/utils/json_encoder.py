@@ -0,0 +1,41 @@
+"""
+Compact JSON encoding of the bodies measured or written in process: the response size
+of debug and sampled requests (see response/response_handler.py) and the export rows.
+The response returned to API Gateway is encoded by the Lambda runtime, not here.
+
+orjson is used when the external layer provides it, else the standard json module.
+Neither pydantic nor orjson is imported with this module, so that importing the
+response handler keeps them off the cold start.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any
+
+
+@lru_cache(maxsize=None)
+def get_orjson() -> Any:
+    """
+    Get the orjson module, imported on first use
+    Returns:
+        module: orjson, None when the layer does not provide it
+    """
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return orjson
+
+
+def dumps(body: Any) -> bytes:
+    """
+    Encode a body as compact JSON, values JSON does not support as their str
+    Args:
+        body (Any): Body
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    orjson = get_orjson()
+    if orjson is not None:
+        return orjson.dumps(body, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(body, separators=(",", ":"), default=str).encode("utf-8")
@@ -0,0 +1,155 @@
+"""
+Fractional ordering keys
+
+A rank is a string of base 62 digits read as the fraction 0.<digits>. Digits are
+in ASCII order, so ranks compare as plain strings and a rank can always be made
+between two others. Ranks never end with the zero digit, which would make them
+equal to a shorter rank.
+
+New items are ranked by the time they are added (time_rank), which puts them at
+the end. Every other rank is kept below the current time rank, so the end of a
+list is always "now".
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import List, Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Microseconds since the epoch fit in this many digits until the year 27000
+TIME_RANK_WIDTH = 10
+
+
+def _midpoint(lower: str, upper: Optional[str]) -> str:
+    """
+    Get a rank between two ranks
+    Args:
+        lower (str): Lower rank, "" for 0
+        upper (str): Upper rank, None for 1
+    Returns:
+        str: Shortest rank found between them
+    """
+    if upper is not None:
+        # copy the common prefix, the lower rank being padded with zeros
+        prefix_length = 0
+        while prefix_length < len(upper) and (
+            lower[prefix_length] if prefix_length < len(lower) else DIGITS[0]
+        ) == upper[prefix_length]:
+            prefix_length += 1
+        if prefix_length:
+            return upper[:prefix_length] + _midpoint(lower[prefix_length:], upper[prefix_length:])
+    lower_digit = DIGITS.index(lower[0]) if lower else 0
+    upper_digit = DIGITS.index(upper[0]) if upper is not None else BASE
+    if upper_digit - lower_digit > 1:
+        return DIGITS[(lower_digit + upper_digit + 1) // 2]
+    # consecutive first digits
+    if upper is not None and len(upper) > 1:
+        return upper[:1]
+    return DIGITS[lower_digit] + _midpoint(lower[1:], None)
+
+
+def rank_between(lower: Optional[str] = None, upper: Optional[str] = None) -> str:
+    """
+    Get a rank sorting strictly between two ranks
+    Args:
+        lower (str): Rank of the item before, None for the start
+        upper (str): Rank of the item after, None for the end
+    Returns:
+        str: New rank
+    Raises:
+        ValueError: If lower is not below upper
+    """
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError(f"rank {lower!r} is not below {upper!r}")
+    return _midpoint(lower or "", upper)
+
+
+def _encode(value: int, width: int) -> str:
+    """
+    Encode an integer as a fixed width rank, without its trailing zero digits
+    Args:
+        value (int): Value, below BASE ** width
+        width (int): Number of digits
+    Returns:
+        str: Rank
+    """
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip(DIGITS[0])
+
+
+def time_rank(timestamp: Optional[str] = None, offset: int = 0) -> str:
+    """
+    Get the rank of an item added at a time, so that new items sort after older ones.
+    Also the rank of the tasks written before ranks existed, from their created_date.
+    Args:
+        timestamp (str): ISO timestamp, now if None
+        offset (int): Microseconds added, to rank items created together in order
+    Returns:
+        str: Rank
+    """
+    if timestamp:
+        moment = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+    else:
+        moment = datetime.now(timezone.utc)
+    microseconds = (moment - datetime(1970, 1, 1, tzinfo=timezone.utc)) // datetime.resolution
+    return _encode(microseconds + offset, TIME_RANK_WIDTH)
+
+
+def item_rank(item: dict) -> str:
+    """
+    Get the rank of an item, from its created_date for items written before ranks existed
+    Args:
+        item (dict): Item attributes
+    Returns:
+        str: Rank
+    """
+    return item.get("rank") or time_rank(item.get("created_date"))
+
+
+def rank_order(item: dict) -> tuple:
+    """
+    Sort key of an item in its ranked list
+    Args:
+        item (dict): Item attributes
+    Returns:
+        tuple: Rank, then creation date and ID for items with the same rank
+    """
+    return item_rank(item), item.get("created_date") or "", item.get("id") or ""
+
+
+def _decode(rank: str, width: int) -> int:
+    """
+    Decode a rank as an integer of a fixed number of digits
+    Args:
+        rank (str): Rank, at most width digits
+        width (int): Number of digits
+    Returns:
+        int: Value
+    """
+    value = 0
+    for digit in rank.ljust(width, DIGITS[0]):
+        value = value * BASE + DIGITS.index(digit)
+    return value
+
+
+def evenly_spaced_ranks(count: int, upper: Optional[str] = None) -> List[str]:
+    """
+    Get ranks spread evenly between 0 and an upper rank, all with the same small length
+    Args:
+        count (int): Number of ranks
+        upper (str): Rank all of them sort below, None for 1
+    Returns:
+        list: Increasing ranks
+    """
+    # one extra digit leaves room for about BASE moves between two neighbours
+    width = len(upper or "") + max(1, math.ceil(math.log(count + 1, BASE))) + 1
+    upper_value = _decode(upper, width) if upper else BASE ** width
+    step = upper_value // (count + 1)
+    return [_encode(step * (index + 1), width) for index in range(count)]
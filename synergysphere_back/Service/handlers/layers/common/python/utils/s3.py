@@ -0,0 +1,214 @@
+"""
+Streaming writes to S3 and presigned URLs
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+import boto3
+from botocore.config import Config
+
+# S3 rejects parts smaller than 5 MiB, except the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+MAX_PARTS = 10000
+
+# Presigned URLs are signed with the Lambda credentials, they stop working when those
+# expire even if the URL has not
+PRESIGNED_URL_EXPIRY_SECONDS = 900
+# Upload URLs also get the time to send the whole object at MIN_UPLOAD_BYTES_PER_SECOND,
+# up to MAX_UPLOAD_URL_EXPIRY_SECONDS. Slower clients sign their upload again.
+MIN_UPLOAD_BYTES_PER_SECOND = 1024 * 1024
+MAX_UPLOAD_URL_EXPIRY_SECONDS = 6 * 3600
+
+_s3_client = None
+
+
+def get_s3_client():
+    """
+    Get the S3 client of the container, shared by every thread
+    Returns:
+        botocore.client.S3: S3 client
+    """
+    global _s3_client
+    if _s3_client is None:
+        # presigned URLs need SigV4, and regional hosts for buckets outside us-east-1
+        _s3_client = boto3.client(
+            "s3", config=Config(signature_version="s3v4", s3={"addressing_style": "virtual"})
+        )
+    return _s3_client
+
+
+def put_json(bucket: str, key: str, data: Any) -> None:
+    """
+    Write a JSON document
+    Args:
+        bucket (str): Bucket name
+        key (str): Object key
+        data (Any): JSON serializable data
+    """
+    get_s3_client().put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=json.dumps(data, indent=2, default=str).encode("utf-8"),
+        ContentType="application/json",
+    )
+
+
+def upload_url_expiry(size: int) -> int:
+    """
+    Get the validity of the URLs uploading an object, long enough to send all its bytes
+    at MIN_UPLOAD_BYTES_PER_SECOND. Parts of a multipart upload all get the one of the
+    whole object, since the last one may only be sent once the others are.
+    Args:
+        size (int): Object size in bytes
+    Returns:
+        int: Validity in seconds
+    """
+    return min(PRESIGNED_URL_EXPIRY_SECONDS + size // MIN_UPLOAD_BYTES_PER_SECOND, MAX_UPLOAD_URL_EXPIRY_SECONDS)
+
+
+def presigned_url(
+    client_method: str, bucket: str, key: str, expires_in: int = PRESIGNED_URL_EXPIRY_SECONDS, **params: Any
+) -> str:
+    """
+    Sign a request to an object, for a client to send straight to S3.
+    Signing is local, no call is made to S3.
+    Args:
+        client_method (str): S3 client method, e.g. put_object, get_object or upload_part
+        bucket (str): Bucket name
+        key (str): Object key
+        expires_in (int): Validity of the URL in seconds
+        params: Other parameters of the request, e.g. ContentType or UploadId
+    Returns:
+        str: Presigned URL
+    """
+    return get_s3_client().generate_presigned_url(
+        client_method, Params={"Bucket": bucket, "Key": key, **params}, ExpiresIn=expires_in
+    )
+
+
+class MultipartUploadWriter:
+    """
+    Write-only file object uploading to S3 in parts, so that memory stays at one part
+    whatever the object size. Use it as a context manager: the upload is completed on
+    exit, or aborted if the block raised. Objects smaller than one part are written
+    with a single PutObject.
+
+    The size and SHA-256 of the bytes written are available once it is closed.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        part_size: int = DEFAULT_PART_SIZE,
+    ):
+        """
+        Args:
+            bucket (str): Bucket name
+            key (str): Object key
+            content_type (str): Content type of the object
+            part_size (int): Bytes buffered before a part is uploaded, at least MIN_PART_SIZE
+        """
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.part_size = part_size
+        self.size = 0
+        self.sha256: Optional[str] = None
+        self._digest = hashlib.sha256()
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Dict[str, Any]] = []
+        self.closed = False
+
+    def __enter__(self) -> "MultipartUploadWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        """
+        Buffer bytes, uploading a part each time the buffer reaches the part size
+        Args:
+            data (bytes): Bytes to write
+        Returns:
+            int: Number of bytes written
+        """
+        if self.closed:
+            raise ValueError("write to a closed MultipartUploadWriter")
+        self._buffer += data
+        self._digest.update(data)
+        self.size += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+        return len(data)
+
+    def flush(self) -> None:
+        # parts are only uploaded once full, see write
+        pass
+
+    def _upload_part(self, body: bytes) -> None:
+        """
+        Upload the next part, starting the multipart upload on the first one
+        Args:
+            body (bytes): Part content
+        """
+        client = get_s3_client()
+        if self._upload_id is None:
+            self._upload_id = client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, ContentType=self.content_type
+            )["UploadId"]
+        part_number = len(self._parts) + 1
+        response = client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id, PartNumber=part_number, Body=body
+        )
+        self._parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+
+    def close(self) -> None:
+        """
+        Upload the remaining bytes and complete the object
+        """
+        if self.closed:
+            return
+        client = get_s3_client()
+        if self._upload_id is None:
+            client.put_object(
+                Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer), ContentType=self.content_type
+            )
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        self._buffer = bytearray()
+        self.sha256 = self._digest.hexdigest()
+        self.closed = True
+
+    def abort(self) -> None:
+        """
+        Drop the parts uploaded so far
+        """
+        if self.closed:
+            return
+        if self._upload_id is not None:
+            get_s3_client().abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+        self._buffer = bytearray()
+        self.closed = True
@@ -0,0 +1,112 @@
+"""
+Request and response serialization
+
+Request schemas are validated with pydantic TypeAdapters compiled once per schema
+and container, whole lists in a single call, straight into plain dicts. Items read
+from DynamoDB are trusted: their PynamoDB attribute values are shaped into response
+dicts without building a pydantic model per item. JSON encoding is in
+utils/json_encoder.py, which does not import pydantic.
+"""
+
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def get_adapter(schema: Type) -> TypeAdapter:
+    """
+    Get the compiled validator of a schema
+    Args:
+        schema (Type): Pydantic model or type
+    Returns:
+        TypeAdapter: Validator, built on first use
+    """
+    return TypeAdapter(schema)
+
+
+@lru_cache(maxsize=None)
+def get_list_adapter(schema: Type) -> TypeAdapter:
+    """
+    Get the compiled validator of a list of a schema
+    Args:
+        schema (Type): Pydantic model or type of the items
+    Returns:
+        TypeAdapter: Validator, built on first use
+    """
+    return TypeAdapter(List[schema])
+
+
+def validate(schema: Type, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a request payload
+    Args:
+        schema (Type): Pydantic model of the payload
+        data (dict): Payload
+    Returns:
+        dict: Validated payload, with the defaults of the schema
+    Raises:
+        ValidationError: If the payload does not match the schema
+    """
+    adapter = get_adapter(schema)
+    return adapter.dump_python(adapter.validate_python(data))
+
+
+def validate_many(schema: Type, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Validate a list of request payloads in a single call
+    Args:
+        schema (Type): Pydantic model of each payload
+        rows (Iterable): Payloads
+    Returns:
+        list: Validated payloads, with the defaults of the schema
+    Raises:
+        ValidationError: If a payload does not match the schema
+    """
+    adapter = get_list_adapter(schema)
+    return adapter.dump_python(adapter.validate_python(rows))
+
+
+@lru_cache(maxsize=None)
+def response_fields(schema: Type[BaseModel]) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Get the fields of a response schema with the value used when an item lacks them
+    Args:
+        schema (Type): Pydantic response model
+    Returns:
+        tuple: (name, default) pairs, nested model defaults as dicts
+    """
+    fields = getattr(schema, "model_fields", None) or schema.__fields__
+    defaults = []
+    for name, field in fields.items():
+        default = None if field.is_required() else field.get_default(call_default_factory=True)
+        if isinstance(default, BaseModel):
+            default = default.model_dump()
+        defaults.append((name, default))
+    return tuple(defaults)
+
+
+def response_dict(schema: Type[BaseModel], attribute_values: Dict[str, Any], **values: Any) -> Dict[str, Any]:
+    """
+    Shape the attribute values of an item read from DynamoDB as a response schema,
+    without validating them
+    Args:
+        schema (Type): Pydantic response model
+        attribute_values (dict): PynamoDB attribute values of the item
+        **values: Values of fields that are not attributes of the item, e.g. computed counts
+    Returns:
+        dict: Response fields of the item
+    """
+    response = {}
+    for name, default in response_fields(schema):
+        if name in values:
+            response[name] = values[name]
+        elif name in attribute_values:
+            response[name] = attribute_values[name]
+        else:
+            # nested defaults are not shared between responses
+            response[name] = deepcopy(default)
+    return response
+
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 
 class Utils:
 
@@ -10,3 +10,63 @@ class Utils:
             str: Current timestamp in ISO format
         """
         return datetime.utcnow().isoformat() + 'Z'
+
+    @staticmethod
+    def get_change_timestamp(seconds_ago=0):
+        """
+        Get a fixed width UTC timestamp, safe to compare as a string and used as a sort key
+        Args:
+            seconds_ago (float): Offset into the past
+        Returns:
+            str: Timestamp in ISO format with microseconds
+        """
+        moment = datetime.utcnow() - timedelta(seconds=seconds_ago)
+        return moment.isoformat(timespec='microseconds') + 'Z'
+
+    @staticmethod
+    def normalize_timestamp(value):
+        """
+        Convert an ISO timestamp sent by a client to the format of get_change_timestamp
+        Args:
+            value (str): ISO timestamp, naive values are taken as UTC
+        Returns:
+            str: Timestamp in ISO format with microseconds
+        Raises:
+            ValueError: If the value is not an ISO timestamp
+        """
+        moment = datetime.fromisoformat(value)
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment.isoformat(timespec='microseconds') + 'Z'
+
+    @staticmethod
+    def get_change_bucket(entity_type, changed_at):
+        """
+        Get the day bucket of a change, the partition key spreading the changes of an
+        entity type over one partition per day
+        Args:
+            entity_type (str): project or task
+            changed_at (str): Timestamp in the format of get_change_timestamp
+        Returns:
+            str: Bucket, e.g. task#2026-10-18
+        """
+        return f"{entity_type}#{changed_at[:10]}"
+
+    @staticmethod
+    def get_change_buckets(entity_type, since, until):
+        """
+        Get the day buckets of the changes made between two timestamps, oldest first
+        Args:
+            entity_type (str): project or task
+            since (str): Timestamp in the format of get_change_timestamp
+            until (str): Timestamp in the format of get_change_timestamp
+        Returns:
+            list: Buckets, one per day from since to until included
+        """
+        day = date.fromisoformat(since[:10])
+        last_day = date.fromisoformat(until[:10])
+        buckets = []
+        while day <= last_day:
+            buckets.append(f"{entity_type}#{day.isoformat()}")
+            day += timedelta(days=1)
+        return buckets
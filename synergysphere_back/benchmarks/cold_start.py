@@ -0,0 +1,126 @@
+"""
+Cold start benchmark for the project Lambda
+
+Imports the handler in fresh interpreters the way the Lambda runtime does and
+reports the wall time of the init phase together with the `-X importtime`
+breakdown of the slowest packages.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 10] [--top 15] [--max-ms 500]
+
+The external layer is picked up from service/handlers/layers/external/python
+when it has been built, otherwise the packages installed in the current
+environment are used.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HANDLERS = os.path.join(ROOT, "Service", "handlers")
+PYTHON_PATH = [
+    os.path.join(HANDLERS, "lambdas", "project"),
+    os.path.join(HANDLERS, "layers", "common", "python"),
+    os.path.join(ROOT, "service", "handlers", "layers", "external", "python"),
+]
+
+# Handler import is the init phase; the first route also builds its manager.
+PROBE = """
+import time
+start = time.perf_counter()
+import lambda_handler
+init = time.perf_counter()
+lambda_handler.get_project_manager()
+lambda_handler.get_task_manager()
+first_route = time.perf_counter()
+print(f"{(init - start) * 1000:.3f} {(first_route - init) * 1000:.3f}")
+"""
+
+
+def run_probe() -> tuple[float, float, str]:
+    """
+    Import the handler in a fresh interpreter
+    Returns:
+        tuple: Init time (ms), first route time (ms) and the raw importtime report
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [path for path in PYTHON_PATH if os.path.isdir(path)] + [env.get("PYTHONPATH", "")]
+    )
+    env.setdefault("AWS_DEFAULT_REGION", "ap-south-1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    init_ms, first_route_ms = (float(value) for value in result.stdout.split())
+    return init_ms, first_route_ms, result.stderr
+
+
+def parse_importtime(report: str) -> dict[str, int]:
+    """
+    Get the cumulative import time of every package, wherever it was first imported from
+    Args:
+        report (str): stderr of an interpreter started with -X importtime
+    Returns:
+        dict: Cumulative microseconds per package
+    """
+    timings = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        module = name.strip()
+        # submodules are already part of their package's cumulative time
+        if not cumulative.strip().isdigit() or "." in module:
+            continue
+        timings[module] = max(timings.get(module, 0), int(cumulative))
+    return timings
+
+
+def main() -> int:
+    """
+    Run the benchmark and print the report
+    Returns:
+        int: Exit code, 1 when the median init time exceeds --max-ms
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="number of fresh interpreters to start")
+    parser.add_argument("--top", type=int, default=15, help="number of packages to list")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail when the median init time is above this")
+    args = parser.parse_args()
+
+    init_times, first_route_times, reports = [], [], []
+    for _ in range(args.runs):
+        init_ms, first_route_ms, report = run_probe()
+        init_times.append(init_ms)
+        first_route_times.append(first_route_ms)
+        reports.append(parse_importtime(report))
+
+    modules = {module for report in reports for module in report}
+    median_imports = {
+        module: statistics.median(report.get(module, 0) for report in reports) for module in modules
+    }
+
+    init_median = statistics.median(init_times)
+    print(f"runs: {args.runs}")
+    print(f"handler init  median {init_median:8.1f} ms  max {max(init_times):8.1f} ms")
+    print(f"first route   median {statistics.median(first_route_times):8.1f} ms  "
+          f"max {max(first_route_times):8.1f} ms")
+    print("\nslowest packages (median cumulative import time, includes the first route):")
+    for module, micros in sorted(median_imports.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {module}")
+
+    if args.max_ms is not None and init_median > args.max_ms:
+        print(f"\nFAIL: median init {init_median:.1f} ms is above {args.max_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
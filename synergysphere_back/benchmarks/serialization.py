@@ -0,0 +1,182 @@
+"""
+Serialization benchmark for 10k row requests and responses
+
+Measures the CPU time per item of the per row pydantic path the managers used
+before utils/serialization.py and of the current one, without DynamoDB:
+
+ * project list response: ProjectListResponse(...).dict() per project vs response_dict
+ * bulk task create: TaskBulkCreateRequest then .dict() per task vs validate_many
+ * in-process JSON encoding, of the measured response size and the export rows: json.dumps
+   vs utils.json_encoder.dumps (orjson when installed)
+
+Usage:
+    python benchmarks/serialization.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Service", "handlers", "layers", "common", "python"))
+sys.path.insert(0, os.path.join(ROOT, "service", "handlers", "layers", "external", "python"))
+
+from db.project_model import ProjectDynamoModel  # noqa: E402
+from db.project_summary_model import COUNTERS  # noqa: E402
+from db.task_model import TaskDynamoModel  # noqa: E402
+from schemas.projects import ProjectListResponse, TaskCounts  # noqa: E402
+from schemas.tasks import TaskBulkCreateRequest, TaskCreateRequest  # noqa: E402
+from utils.json_encoder import dumps, get_orjson  # noqa: E402
+from utils.serialization import response_dict, validate_many  # noqa: E402
+
+# .dict() is deprecated in pydantic v2, the warnings are not part of the measure
+warnings.simplefilter("ignore", DeprecationWarning)
+
+
+def make_projects(rows: int) -> list:
+    """
+    Build project items as read by get_all_projects, with their task counts
+    Args:
+        rows (int): Number of projects
+    Returns:
+        list: (ProjectDynamoModel, task counts) pairs
+    """
+    projects = []
+    for index in range(rows):
+        item = ProjectDynamoModel(id=f"{index:032x}", title=f"Project {index}", description="Quarterly roadmap")
+        counts = {name: index % (position + 2) for position, name in enumerate(COUNTERS)}
+        projects.append((item, counts))
+    return projects
+
+
+def make_task_payloads(rows: int) -> list:
+    """
+    Build bulk task create payloads
+    Args:
+        rows (int): Number of tasks
+    Returns:
+        list: Request payloads
+    """
+    return [
+        {
+            "project_id": "0" * 32,
+            "title": f"Task {index}",
+            "description": "Write the release notes",
+            "creator": "alice",
+            "end_date": "2026-12-31",
+            "created_by": "alice",
+        }
+        for index in range(rows)
+    ]
+
+
+def make_task_body(rows: int) -> dict:
+    """
+    Build the body of a task list response
+    Args:
+        rows (int): Number of tasks
+    Returns:
+        dict: Response body
+    """
+    data = []
+    for index, payload in enumerate(make_task_payloads(rows)):
+        task = TaskDynamoModel(
+            id=f"{index:032x}",
+            created_date="2026-10-18T00:00:00Z",
+            updated_date="NA",
+            update_by="NA",
+            rank=f"{index:012d}",
+            **payload,
+        )
+        data.append(task.attribute_values)
+    return {"message": "Tasks fetched successfully", "data": data}
+
+
+def projects_before(projects: list) -> list:
+    return [
+        ProjectListResponse(**item.attribute_values, task_counts=TaskCounts(**counts)).dict()
+        for item, counts in projects
+    ]
+
+
+def projects_after(projects: list) -> list:
+    return [response_dict(ProjectListResponse, item.attribute_values, task_counts=counts) for item, counts in projects]
+
+
+def tasks_before(payloads: list) -> list:
+    return [task.dict() for task in TaskBulkCreateRequest(tasks=payloads).tasks]
+
+
+def tasks_after(payloads: list) -> list:
+    return validate_many(TaskCreateRequest, payloads)
+
+
+def encode_before(body: dict) -> bytes:
+    return json.dumps(body, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def encode_after(body: dict) -> bytes:
+    return dumps(body)
+
+
+def cpu_per_item(func, data, rows: int, repeat: int) -> float:
+    """
+    Get the best CPU time per item of a conversion
+    Args:
+        func (function): Conversion
+        data (Any): Its input
+        rows (int): Items in the input
+        repeat (int): Runs, the fastest is kept
+    Returns:
+        float: Microseconds of CPU per item
+    """
+    func(data)  # warm up, e.g. the validators compiled on first use
+    best = None
+    for _ in range(repeat):
+        start = time.process_time()
+        func(data)
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / rows * 1e6
+
+
+def main() -> int:
+    """
+    Run the benchmark and print the report
+    Returns:
+        int: Exit code, 1 when a current path is not faster than the one it replaces
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="items per request or response")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measure, the fastest is kept")
+    args = parser.parse_args()
+
+    projects = make_projects(args.rows)
+    payloads = make_task_payloads(args.rows)
+    body = make_task_body(args.rows)
+    assert projects_before(projects) == projects_after(projects)
+    assert tasks_before(payloads) == tasks_after(payloads)
+    assert json.loads(encode_before(body)) == json.loads(encode_after(body))
+
+    cases = [
+        ("project list response", projects_before, projects_after, projects),
+        ("bulk task create", tasks_before, tasks_after, payloads),
+        ("body encoding", encode_before, encode_after, body),
+    ]
+    encoder = "orjson" if get_orjson() is not None else "json"
+    print(f"rows: {args.rows}, encoder: {encoder}, CPU per item (best of {args.repeat})")
+    print(f"  {'':24}{'before':>10}{'after':>10}{'speedup':>10}")
+    slower = False
+    for name, before, after, data in cases:
+        before_us = cpu_per_item(before, data, args.rows, args.repeat)
+        after_us = cpu_per_item(after, data, args.rows, args.repeat)
+        slower |= after_us >= before_us
+        print(f"  {name:24}{before_us:8.2f}us{after_us:8.2f}us{before_us / after_us:9.1f}x")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -37,7 +37,8 @@ REQUEST_TEMPLATE = """
   "context": {
     "api-id": "$context.apiId",
     "http-method": "$context.httpMethod",
-    "resource-path": "$context.resourcePath"
+    "resource-path": "$context.resourcePath",
+    "request-id": "$context.requestId"
   }
 }
 """
\ No newline at end of file
@@ -19,6 +19,9 @@ from cdk.config.api_templates import ERROR_MAPPING_TEMPLATE, OUTPUT_MAPPING_TEMP
 access_control_allow_origin = "method.response.header.Access-Control-Allow-Origin"
 content_type = "application/json"
 response_content_type = "method.response.header.Content-Type"
+access_control_expose_headers = "method.response.header.Access-Control-Expose-Headers"
+# Only present in the lambda response when the request has ?debug=true
+consumed_capacity_header = "method.response.header.X-Consumed-Capacity"
 
 
 class ApiConstruct(Construct):
@@ -80,6 +83,8 @@ class ApiConstruct(Construct):
                 "statusCode": "200",
                 "responseParameters": {
                     access_control_allow_origin: "'*'",
+                    access_control_expose_headers: "'X-Consumed-Capacity'",
+                    consumed_capacity_header: "integration.response.body.headers.X-Consumed-Capacity",
                 },
                 "responseTemplates": {content_type: OUTPUT_MAPPING_TEMPLATE},
             }
@@ -271,6 +276,8 @@ class ApiConstruct(Construct):
                 "statusCode": "200",
                 "responseParameters": {
                     access_control_allow_origin: True,
+                    access_control_expose_headers: True,
+                    consumed_capacity_header: False,
                 },
                 "responseModels": {content_type: response_model},
             }
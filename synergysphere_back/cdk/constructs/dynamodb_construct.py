@@ -1,7 +1,7 @@
 """
 DynamoDB Construct
 Deploy:
-    - DynamoDB Tables
+    - DynamoDB Tables, with their streams
 """
 
 from constructs import Construct
@@ -18,10 +18,12 @@ class DynamoDBConstruct(Construct):
         config_path = os.path.join(os.path.dirname(__file__), 'config', 'dynamoDb.json')
         with open(config_path, 'r') as f:
             tables = json.load(f)
+        # tables by their name in dynamoDb.json, e.g. for stream event sources
+        self.tables = {}
         for table in tables:
-            self.create_dynamodb_table(table)
+            self.tables[table["name"]] = self.create_dynamodb_table(table)
 
-    def create_dynamodb_table(self, table_config: dict) -> None:
+    def create_dynamodb_table(self, table_config: dict) -> dynamodb.Table:
         partition_key = dynamodb.Attribute(
             name=table_config["partition_key"],
             type=dynamodb.AttributeType.STRING
@@ -32,13 +34,52 @@ class DynamoDBConstruct(Construct):
                 name=table_config["sort_key"],
                 type=dynamodb.AttributeType.STRING
             )
+        stream = None
+        if table_config.get("stream"):
+            stream = dynamodb.StreamViewType[table_config["stream"]]
+        # tables taking bulk writes (imports, the stream projections) are on demand,
+        # the capacities only apply to provisioned tables and their indexes
+        billing_mode = dynamodb.BillingMode[table_config.get("billing_mode", "PROVISIONED")]
+        provisioned = billing_mode == dynamodb.BillingMode.PROVISIONED
         table = dynamodb.Table(
             self,
             self.construct_helper.get_resource_name(table_config["name"]),
             table_name=self.construct_helper.get_resource_name(table_config["name"]),
             partition_key=partition_key,
             sort_key=sort_key,
-            read_capacity=table_config.get("read_capacity", 5),
-            write_capacity=table_config.get("write_capacity", 5),
-            removal_policy=RemovalPolicy.DESTROY,
+            billing_mode=billing_mode,
+            read_capacity=table_config.get("read_capacity", 5) if provisioned else None,
+            write_capacity=table_config.get("write_capacity", 5) if provisioned else None,
+            removal_policy=RemovalPolicy[table_config.get("removal_policy", "DESTROY")],
+            time_to_live_attribute=table_config.get("time_to_live_attribute"),
+            stream=stream,
+        )
+        for index_config in table_config.get("global_secondary_indexes", []):
+            self.add_global_secondary_index(table, index_config, provisioned)
+        return table
+
+    def add_global_secondary_index(self, table: dynamodb.Table, index_config: dict, provisioned: bool = True) -> None:
+        """
+        Add a global secondary index to a table
+        Args:
+            table (dynamodb.Table): Table the index belongs to
+            index_config (dict): Index config from dynamoDb.json
+            provisioned (bool): False for an on-demand table, whose indexes have no capacity
+        """
+        sort_key = None
+        if index_config.get("sort_key"):
+            sort_key = dynamodb.Attribute(
+                name=index_config["sort_key"],
+                type=dynamodb.AttributeType.STRING
+            )
+        table.add_global_secondary_index(
+            index_name=index_config["index_name"],
+            partition_key=dynamodb.Attribute(
+                name=index_config["partition_key"],
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=sort_key,
+            projection_type=dynamodb.ProjectionType[index_config.get("projection", "ALL")],
+            read_capacity=index_config.get("read_capacity", 5) if provisioned else None,
+            write_capacity=index_config.get("write_capacity", 5) if provisioned else None,
         )
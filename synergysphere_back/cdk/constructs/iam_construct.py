@@ -35,6 +35,7 @@ class IamConstruct(Construct):
         self.create_lambda_policy()
         self.create_cloud_watch_policy()
         self.create_dynamodb_policy()
+        self.create_sqs_policy()
 
         # create roles
         self.create_api_gateway_role()
@@ -50,6 +51,9 @@ class IamConstruct(Construct):
                 "s3:ListBucket",
                 "s3:PutObject",
                 "s3:DeleteObject",
+                "s3:AbortMultipartUpload",
+                "s3:PutObjectTagging",
+                "s3:DeleteObjectTagging",
             ],
             effect=iam.Effect.ALLOW,
             resources=["*"],
@@ -139,6 +143,8 @@ class IamConstruct(Construct):
                 "dynamodb:DeleteItem",
                 "dynamodb:Scan",
                 "dynamodb:Query",
+                "dynamodb:BatchGetItem",
+                "dynamodb:BatchWriteItem",
             ],
             effect=iam.Effect.ALLOW,
             resources=["*"],
@@ -147,6 +153,26 @@ class IamConstruct(Construct):
 
         self.dynamodb_policy_document = iam.PolicyDocument(statements=[dynamodb_policy_statement])
 
+    def create_sqs_policy(self) -> None:
+        """
+        Create SQS Policy
+        """
+        sqs_policy_statement = iam.PolicyStatement(
+            actions=[
+                "sqs:GetQueueUrl",
+                "sqs:SendMessage",
+                "sqs:ReceiveMessage",
+                "sqs:DeleteMessage",
+                "sqs:ChangeMessageVisibility",
+                "sqs:GetQueueAttributes",
+            ],
+            effect=iam.Effect.ALLOW,
+            resources=["*"],
+            sid="SQSPolicyStatement",
+        )
+
+        self.sqs_policy_document = iam.PolicyDocument(statements=[sqs_policy_statement])
+
     def create_api_gateway_role(self) -> None:
         """
         Create API Gateway Role
@@ -177,5 +203,6 @@ class IamConstruct(Construct):
                 "APIGatewayReadPolicy": self.apigateway_read_policy_document,
                 "CloudWatchPolicy": self.cloud_watch_policy_document,
                 "DynamoDBPolicy": self.dynamodb_policy_document,
+                "SQSPolicy": self.sqs_policy_document,
             },
         )
@@ -3,13 +3,21 @@ Lambda Construct
 
 Deploy:
     - Lambda function
+    - DynamoDB stream triggers
+    - S3 triggers
+    - SQS triggers
+    - Schedules
 """
 
 import os
 from constructs import Construct
 from aws_cdk import aws_lambda as _lambda
+from aws_cdk import aws_lambda_event_sources as event_sources
+from aws_cdk import aws_events as events
+from aws_cdk import aws_events_targets as targets
 from aws_cdk import Duration, Size
 from aws_cdk import aws_iam as iam
+from aws_cdk import aws_s3 as s3
 
 
 class LambdaConstruct(Construct):
@@ -23,6 +31,9 @@ class LambdaConstruct(Construct):
         stack_id: str,
         lambda_role: iam.Role,
         construct_helper,
+        tables: dict = None,
+        buckets: dict = None,
+        queues: dict = None,
         **kwargs,
     ) -> None:
         """
@@ -35,6 +46,9 @@ class LambdaConstruct(Construct):
             stack_id (str): Stack ID
             lambda_role (iam.Role): Lambda Role
             construct_helper (ConstructHelper): Construct helper
+            tables (dict): DynamoDB tables by name, for stream event sources
+            buckets (dict): S3 buckets by name, for S3 event sources
+            queues (dict): SQS queues by name, for SQS event sources
         Returns:
             None
         """
@@ -47,6 +61,12 @@ class LambdaConstruct(Construct):
 
         self.lambda_role = lambda_role
 
+        self.tables = tables or {}
+
+        self.buckets = buckets or {}
+
+        self.queues = queues or {}
+
         # Create Layers
         self.create_layers()
 
@@ -102,7 +122,7 @@ class LambdaConstruct(Construct):
 
         mandatory_layers = [self.common_layer, self.external_layer]
 
-        environment = {}
+        environment = {"POWERTOOLS_SERVICE_NAME": lambda_name}
         for env in lambda_config.get("environment"):
             environment[env] = self.construct_helper.get_parameter_value(env)
 
@@ -116,14 +136,105 @@ class LambdaConstruct(Construct):
                 lambda_config.get("ephemeral_storage_size"),
             ),
             runtime=_lambda.Runtime.PYTHON_3_12,
+            # a Lambda may run another handler module of the code of another one
             code=_lambda.Code.from_asset(
-                os.path.join(os.getcwd(), "service", "handlers", "lambdas", lambda_name)
+                os.path.join(
+                    os.getcwd(), "service", "handlers", "lambdas", lambda_config.get("source", lambda_name)
+                )
             ),
             role=self.lambda_role,
-            handler="lambda_handler.lambda_handler",
+            handler=lambda_config.get("handler", "lambda_handler.lambda_handler"),
             layers=mandatory_layers,
             environment=environment,
             tracing=_lambda.Tracing.ACTIVE,
         )
 
+        for stream_config in lambda_config.get("dynamodb_streams", []):
+            self.add_dynamodb_stream(lambda_function, stream_config)
+
+        for trigger_config in lambda_config.get("s3_triggers", []):
+            self.add_s3_trigger(lambda_function, trigger_config)
+
+        for trigger_config in lambda_config.get("sqs_triggers", []):
+            self.add_sqs_trigger(lambda_function, trigger_config)
+
+        if lambda_config.get("schedule"):
+            self.add_schedule(lambda_name, lambda_function, lambda_config["schedule"])
+
         return lambda_function
+
+    def add_dynamodb_stream(self, lambda_function: _lambda.Function, stream_config: dict) -> None:
+        """
+        Trigger a Lambda Function from the stream of a DynamoDB table
+        Args:
+            lambda_function (_lambda.Function): Lambda Function
+            stream_config (dict): Stream config from lambda.json
+        """
+        table = self.tables[stream_config["table"]]
+        lambda_function.add_event_source(
+            event_sources.DynamoEventSource(
+                table,
+                starting_position=_lambda.StartingPosition.TRIM_HORIZON,
+                batch_size=stream_config.get("batch_size", 100),
+                max_batching_window=Duration.seconds(stream_config.get("max_batching_window_seconds", 0)),
+                retry_attempts=stream_config.get("retry_attempts", 10),
+                bisect_batch_on_error=True,
+                report_batch_item_failures=True,
+            )
+        )
+
+    def add_s3_trigger(self, lambda_function: _lambda.Function, trigger_config: dict) -> None:
+        """
+        Trigger a Lambda Function when objects are created in a bucket
+        Args:
+            lambda_function (_lambda.Function): Lambda Function
+            trigger_config (dict): Trigger config from lambda.json, with the bucket name
+                and optional key prefix and suffix
+        """
+        bucket = self.buckets[trigger_config["bucket"]]
+        lambda_function.add_event_source(
+            event_sources.S3EventSource(
+                bucket,
+                events=[s3.EventType.OBJECT_CREATED],
+                filters=[
+                    s3.NotificationKeyFilter(
+                        prefix=trigger_config.get("prefix"), suffix=trigger_config.get("suffix")
+                    )
+                ],
+            )
+        )
+
+    def add_sqs_trigger(self, lambda_function: _lambda.Function, trigger_config: dict) -> None:
+        """
+        Trigger a Lambda Function with batches of the messages of a queue, reporting the
+        messages that failed so that only those are retried
+        Args:
+            lambda_function (_lambda.Function): Lambda Function
+            trigger_config (dict): Trigger config from lambda.json, with the queue name
+        """
+        queue = self.queues[trigger_config["queue"]]
+        lambda_function.add_event_source(
+            event_sources.SqsEventSource(
+                queue,
+                batch_size=trigger_config.get("batch_size", 10),
+                max_batching_window=Duration.seconds(trigger_config.get("max_batching_window_seconds", 0)),
+                report_batch_item_failures=True,
+            )
+        )
+
+    def add_schedule(self, lambda_name: str, lambda_function: _lambda.Function, expression: str) -> None:
+        """
+        Invoke a Lambda Function on a schedule
+        Args:
+            lambda_name (str): Lambda name
+            lambda_function (_lambda.Function): Lambda Function
+            expression (str): cron(...) or rate(...) schedule expression from lambda.json
+        """
+        rule_name = self.construct_helper.get_resource_name(f"{lambda_name}-schedule")
+        events.Rule(
+            self,
+            rule_name,
+            rule_name=rule_name,
+            schedule=events.Schedule.expression(expression),
+            targets=[targets.LambdaFunction(lambda_function, retry_attempts=0)],
+        )
@@ -0,0 +1,207 @@
+"""
+Monitoring Construct
+
+Deploy:
+    - CloudWatch dashboard for the latency metrics emitted by the lambdas
+    - consumed capacity by route and table
+    - model cache hits, misses and evictions by table
+    - p99 latency alarms
+"""
+
+from constructs import Construct
+from aws_cdk import Duration
+from aws_cdk import aws_cloudwatch as cloudwatch
+from aws_cdk import aws_lambda as _lambda
+
+
+class MonitoringConstruct(Construct):
+    """
+    Monitoring Construct
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        stack_id: str,
+        lambda_functions: dict,
+        construct_helper,
+        **kwargs,
+    ) -> None:
+        """
+        Following parameters are required to create a Monitoring Construct:
+        - lambda_functions
+        Args:
+            scope (Construct): CDK stack
+            stack_id (str): Stack ID
+            lambda_functions (dict): Lambda Functions by name
+            construct_helper (ConstructHelper): Construct helper
+        Returns:
+            None
+        """
+
+        super().__init__(scope, stack_id, **kwargs)
+
+        self.construct_helper = construct_helper
+        self.lambda_functions = lambda_functions
+
+        self.monitoring_data = self.construct_helper.read_config_data("monitoring.json")
+        self.namespace = self.construct_helper.get_parameter_value("POWERTOOLS_METRICS_NAMESPACE")
+        self.period = Duration.minutes(self.monitoring_data["period_minutes"])
+
+        self.create_dashboard()
+
+        self.create_alarms()
+
+    def get_metric(
+        self, lambda_name: str, lambda_function: _lambda.Function, metric_name: str, statistic: str
+    ) -> cloudwatch.IMetric:
+        """
+        Get a metric of a lambda, either emitted by the handler or by the Lambda service
+        Args:
+            lambda_name (str): Lambda name, used as the powertools service dimension
+            lambda_function (_lambda.Function): Lambda Function
+            metric_name (str): Metric name
+            statistic (str): Statistic, e.g. p99
+        Returns:
+            cloudwatch.IMetric: Metric
+        """
+        if metric_name == "Duration":
+            return lambda_function.metric_duration(statistic=statistic, period=self.period)
+
+        return cloudwatch.Metric(
+            namespace=self.namespace,
+            metric_name=metric_name,
+            dimensions_map={"service": lambda_name},
+            statistic=statistic,
+            period=self.period,
+        )
+
+    def get_search_expression(
+        self, lambda_name: str, metric_name: str, dimensions: list, statistic: str
+    ) -> cloudwatch.MathExpression:
+        """
+        Get one line per dimension value combination of a tagged metric
+        Args:
+            lambda_name (str): Lambda name, used as the powertools service dimension
+            metric_name (str): Metric name
+            dimensions (list): Dimensions the metric is tagged with besides service
+            statistic (str): Statistic, e.g. p99
+        Returns:
+            cloudwatch.MathExpression: SEARCH expression
+        """
+        schema = ",".join([self.namespace, "service", *dimensions])
+        return cloudwatch.MathExpression(
+            expression=(
+                f"SEARCH('{{{schema}}} MetricName=\"{metric_name}\" service=\"{lambda_name}\"', "
+                f"'{statistic}', {int(self.period.to_seconds())})"
+            ),
+            period=self.period,
+        )
+
+    def create_dashboard(self) -> None:
+        """
+        Create CloudWatch Dashboard
+        """
+        dashboard_name = self.construct_helper.get_resource_name(self.monitoring_data["dashboard_name"])
+        self.dashboard = cloudwatch.Dashboard(self, dashboard_name, dashboard_name=dashboard_name)
+
+        for lambda_name, lambda_function in self.lambda_functions.items():
+            self.dashboard.add_widgets(
+                cloudwatch.GraphWidget(
+                    title=f"{lambda_name} - handler latency p99 by route",
+                    left=[
+                        self.get_search_expression(
+                            lambda_name, "HandlerLatency", ["method", "action", "sub_action"], "p99"
+                        )
+                    ],
+                    width=12,
+                ),
+                cloudwatch.GraphWidget(
+                    title=f"{lambda_name} - DynamoDB call latency p99 by model and operation",
+                    left=[
+                        self.get_search_expression(
+                            lambda_name, "RepositoryLatency", ["model", "operation"], "p99"
+                        )
+                    ],
+                    width=12,
+                ),
+            )
+            self.dashboard.add_widgets(
+                cloudwatch.GraphWidget(
+                    title=f"{lambda_name} - phase latency",
+                    left=[
+                        self.get_metric(lambda_name, lambda_function, metric_name, statistic)
+                        for metric_name in ("HandlerLatency", "ValidationTime", "SerializationTime")
+                        for statistic in ("p50", "p99")
+                    ],
+                    width=12,
+                ),
+                cloudwatch.GraphWidget(
+                    title=f"{lambda_name} - lambda duration, errors and throttles",
+                    left=[
+                        lambda_function.metric_duration(statistic="p50", period=self.period),
+                        lambda_function.metric_duration(statistic="p99", period=self.period),
+                    ],
+                    right=[
+                        lambda_function.metric_errors(period=self.period),
+                        lambda_function.metric_throttles(period=self.period),
+                    ],
+                    width=12,
+                ),
+            )
+            self.dashboard.add_widgets(
+                cloudwatch.GraphWidget(
+                    title=f"{lambda_name} - consumed capacity by route",
+                    left=[
+                        self.get_search_expression(
+                            lambda_name, metric_name, ["method", "action", "sub_action"], "Sum"
+                        )
+                        for metric_name in ("ConsumedReadCapacity", "ConsumedWriteCapacity")
+                    ],
+                    width=12,
+                ),
+                cloudwatch.GraphWidget(
+                    title=f"{lambda_name} - consumed capacity by table",
+                    left=[
+                        self.get_search_expression(lambda_name, metric_name, ["table"], "Sum")
+                        for metric_name in ("ConsumedReadCapacity", "ConsumedWriteCapacity")
+                    ],
+                    width=12,
+                ),
+            )
+            self.dashboard.add_widgets(
+                cloudwatch.GraphWidget(
+                    title=f"{lambda_name} - cache hits, misses and evictions by table",
+                    left=[
+                        self.get_search_expression(lambda_name, metric_name, ["table"], "Sum")
+                        for metric_name in ("CacheHits", "CacheMisses", "CacheEvictions")
+                    ],
+                    width=12,
+                ),
+            )
+
+    def create_alarms(self) -> None:
+        """
+        Create p99 latency alarms from monitoring.json for every lambda
+        """
+        self.alarms = []
+        for lambda_name, lambda_function in self.lambda_functions.items():
+            for alarm_config in self.monitoring_data["alarms"]:
+                alarm_name = self.construct_helper.get_resource_name(
+                    f"{lambda_name}-{alarm_config['name']}"
+                )
+                self.alarms.append(
+                    cloudwatch.Alarm(
+                        self,
+                        alarm_name,
+                        alarm_name=alarm_name,
+                        metric=self.get_metric(
+                            lambda_name, lambda_function, alarm_config["metric"], alarm_config["statistic"]
+                        ),
+                        threshold=alarm_config["threshold"],
+                        evaluation_periods=alarm_config["evaluation_periods"],
+                        datapoints_to_alarm=alarm_config.get("datapoints_to_alarm"),
+                        comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+                        treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+                    )
+                )
@@ -7,7 +7,7 @@ Deploy:
 
 from constructs import Construct
 from aws_cdk import aws_s3 as s3
-from aws_cdk import RemovalPolicy
+from aws_cdk import Duration, RemovalPolicy
 
 buckets = ["odoo"]
 
@@ -31,10 +31,12 @@ class S3Construct(Construct):
 
         self.construct_helper = construct_helper
 
+        # buckets by their name in the buckets list, e.g. for S3 triggers
+        self.buckets = {}
         for bucket in buckets:
-            self.create_s3_bucket(bucket)
+            self.buckets[bucket] = self.create_s3_bucket(bucket)
 
-    def create_s3_bucket(self, bucket_name: str) -> None:
+    def create_s3_bucket(self, bucket_name: str) -> s3.Bucket:
         """
         Create S3 Bucket
         """
@@ -46,6 +48,18 @@ class S3Construct(Construct):
             versioned=True,
             block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
             removal_policy=RemovalPolicy.DESTROY,
+            # parts of exports whose Lambda died before completing or aborting the upload
+            lifecycle_rules=[
+                s3.LifecycleRule(abort_incomplete_multipart_upload_after=Duration.days(1)),
+                # objects of attachments whose upload was never completed, still tagged
+                # PENDING_OBJECT_TAG (db/attachment_model.py) once their record expired
+                s3.LifecycleRule(
+                    prefix="attachments/",
+                    tag_filters={"attachment-status": "pending"},
+                    expiration=Duration.days(2),
+                    noncurrent_version_expiration=Duration.days(1),
+                ),
+            ],
         )
 
         self.bucket.add_cors_rule(
@@ -56,4 +70,8 @@ class S3Construct(Construct):
             ],
             allowed_origins=["*"],
             allowed_headers=["*"],
+            # browsers uploading parts with presigned URLs read the ETag of each part
+            exposed_headers=["ETag"],
         )
+
+        return self.bucket
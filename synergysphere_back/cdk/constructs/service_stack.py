@@ -9,9 +9,11 @@ from cdk.constructs.iam_construct import IamConstruct
 from cdk.constructs.lambda_construct import LambdaConstruct
 from cdk.constructs.api_construct import ApiConstruct
 from cdk.constructs.s3_construct import S3Construct
+from cdk.constructs.sqs_construct import SqsConstruct
 from cdk.constructs.construct_helper import ConstructHelper
 from cdk.constructs.vpc_construct import VpcConstruct
 from cdk.constructs.dynamodb_construct import DynamoDBConstruct
+from cdk.constructs.monitoring_construct import MonitoringConstruct
 
 class ServiceStack(Stack):
     """Odoo CDK Stack definition"""
@@ -35,12 +37,36 @@ class ServiceStack(Stack):
             construct_helper
         )
 
+        # Initialize DynamoDB construct, before the lambdas reading its streams
+        dynamodb_construct = DynamoDBConstruct(
+            self,
+            "DynamoDBConstruct",
+            construct_helper
+        )
+
+        # Initialize S3 construct, before the lambdas triggered by its buckets
+        s3_construct = S3Construct(
+            self,
+            "S3Construct",
+            construct_helper,
+        )
+
+        # Initialize SQS construct, before the lambdas consuming its queues
+        sqs_construct = SqsConstruct(
+            self,
+            "SqsConstruct",
+            construct_helper,
+        )
+
         # Initialize Lambda construct
         lambda_construct = LambdaConstruct(
             self,
             "LambdaConstruct",
             iam_construct.lambda_role,
-            construct_helper
+            construct_helper,
+            dynamodb_construct.tables,
+            s3_construct.buckets,
+            sqs_construct.queues
         )
 
         # Initialize APi Gateway construct
@@ -53,16 +79,10 @@ class ServiceStack(Stack):
             construct_helper
         )
 
-        # Initialize S3 construct
-        S3Construct(
+        # Initialize Monitoring construct
+        MonitoringConstruct(
             self,
-            "S3Construct",
-            construct_helper,
-        )
-
-        # Initialize DynamoDB construct
-        DynamoDBConstruct(
-            self,
-            "DynamoDBConstruct",
+            "MonitoringConstruct",
+            lambda_construct.lambda_functions,
             construct_helper
         )
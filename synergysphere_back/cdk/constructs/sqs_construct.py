@@ -0,0 +1,87 @@
+"""
+SQS Construct
+Deploy:
+    - SQS Queues, each with a dead letter queue
+    - Alarm on messages reaching a dead letter queue
+"""
+
+from constructs import Construct
+from aws_cdk import aws_cloudwatch as cloudwatch
+from aws_cdk import aws_sqs as sqs
+from aws_cdk import Duration, RemovalPolicy
+
+queues = ["jobs"]
+
+# At least 6 times the timeout of the Lambdas consuming the queues, so that a message
+# is not delivered again while a batch holding it is still running or being retried
+VISIBILITY_TIMEOUT = Duration.minutes(30)
+# Deliveries before a message goes to the dead letter queue, JOB_MAX_RECEIVE_COUNT in db/job_model.py
+MAX_RECEIVE_COUNT = 3
+DEAD_LETTER_RETENTION = Duration.days(14)
+
+
+class SqsConstruct(Construct):
+    """SQS Constructs CDK definition"""
+
+    def __init__(
+        self, scope: Construct, stack_id: str, construct_helper, **kwargs
+    ) -> None:
+        """
+        Following parameters are required to create an SQS Construct:
+        - stack_id
+        Args:
+            scope (Construct): CDK stack
+            stack_id (str): Stack ID
+            construct_helper (ConstructHelper): Construct helper
+        Returns:
+            None
+        """
+        super().__init__(scope, stack_id, **kwargs)
+
+        self.construct_helper = construct_helper
+
+        # queues by their name in the queues list, e.g. for SQS triggers
+        self.queues = {}
+        for queue in queues:
+            self.queues[queue] = self.create_queue(queue)
+
+    def create_queue(self, queue_name: str) -> sqs.Queue:
+        """
+        Create an SQS Queue with its dead letter queue
+        Args:
+            queue_name (str): Queue name
+        Returns:
+            sqs.Queue: Queue
+        """
+        dead_letter_name = self.construct_helper.get_resource_name(f"{queue_name}-dlq")
+        dead_letter_queue = sqs.Queue(
+            self,
+            dead_letter_name,
+            queue_name=dead_letter_name,
+            retention_period=DEAD_LETTER_RETENTION,
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+
+        cloudwatch.Alarm(
+            self,
+            f"{dead_letter_name}-alarm",
+            alarm_name=f"{dead_letter_name}-messages",
+            alarm_description=f"Messages of the {queue_name} queue failed {MAX_RECEIVE_COUNT} times",
+            metric=dead_letter_queue.metric_approximate_number_of_messages_visible(period=Duration.minutes(5)),
+            threshold=0,
+            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+            evaluation_periods=1,
+            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+        )
+
+        resource_name = self.construct_helper.get_resource_name(queue_name)
+        return sqs.Queue(
+            self,
+            resource_name,
+            queue_name=resource_name,
+            visibility_timeout=VISIBILITY_TIMEOUT,
+            removal_policy=RemovalPolicy.DESTROY,
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=MAX_RECEIVE_COUNT, queue=dead_letter_queue
+            ),
+        )
@@ -0,0 +1,111 @@
+"""
+Backfill entity_type, changed_at and change_bucket on projects and tasks written
+before delta sync
+
+Items without change_bucket are not in the change_bucket indexes, so sync
+clients never see them. Each of them gets its changed_at, or else the time of
+its last update (or its creation), and the day bucket of that time, without
+bumping its version. The update is conditional on change_bucket still being
+missing, so the script can be re-run at any time.
+
+Usage:
+    python scripts/backfill_changed_at.py [--segments 8] [--page-size 200]
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Service", "handlers", "layers", "common", "python"))
+
+from pynamodb.exceptions import UpdateError  # noqa: E402
+
+from db.generic_repository import CONDITIONAL_CHECK_FAILED  # noqa: E402
+from db.project_model import PROJECT_ENTITY, ProjectDynamoModel  # noqa: E402
+from db.task_model import TASK_ENTITY, TaskDynamoModel  # noqa: E402
+from utils.utils import Utils  # noqa: E402
+
+SOURCES = {PROJECT_ENTITY: ProjectDynamoModel, TASK_ENTITY: TaskDynamoModel}
+
+
+def change_timestamp(item) -> str:
+    """
+    Get the time an item last changed, from its own dates when it has no changed_at
+    Args:
+        item (Model): Project or task
+    Returns:
+        str: Timestamp in the format of Utils.get_change_timestamp
+    """
+    if item.changed_at:
+        return item.changed_at
+    for value in (item.updated_date, item.created_date):
+        if value and value != "NA":
+            return Utils.normalize_timestamp(value.rstrip("Z"))
+    return Utils.get_change_timestamp()
+
+
+def backfill_segment(entity_type: str, segment: int, total_segments: int, page_size: int) -> int:
+    """
+    Backfill one scan segment of a table
+    Args:
+        entity_type (str): project or task
+        segment (int): Segment number
+        total_segments (int): Number of segments
+        page_size (int): Items read per Scan call
+    Returns:
+        int: Number of items updated
+    """
+    model_class = SOURCES[entity_type]
+    updated = 0
+    items = model_class.scan(
+        model_class.change_bucket.does_not_exist(),
+        segment=segment,
+        total_segments=total_segments,
+        page_size=page_size,
+        attributes_to_get=["id", "created_date", "updated_date", "changed_at"],
+    )
+    for item in items:
+        changed_at = change_timestamp(item)
+        try:
+            item.update(
+                actions=[
+                    model_class.entity_type.set(entity_type),
+                    model_class.changed_at.set(changed_at),
+                    model_class.change_bucket.set(Utils.get_change_bucket(entity_type, changed_at)),
+                ],
+                condition=model_class.id.exists() & model_class.change_bucket.does_not_exist(),
+            )
+            updated += 1
+        except UpdateError as e:
+            # deleted or written by the API in the meantime
+            if e.cause_response_code != CONDITIONAL_CHECK_FAILED:
+                raise
+    return updated
+
+
+def main() -> int:
+    """
+    Run the backfill
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=8, help="parallel scan segments per table")
+    parser.add_argument("--page-size", type=int, default=200, help="items read per Scan call")
+    args = parser.parse_args()
+
+    for entity_type in SOURCES:
+        with ThreadPoolExecutor(max_workers=args.segments) as executor:
+            futures = [
+                executor.submit(backfill_segment, entity_type, segment, args.segments, args.page_size)
+                for segment in range(args.segments)
+            ]
+            updated = sum(future.result() for future in futures)
+        print(f"{entity_type}: {updated} items backfilled")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
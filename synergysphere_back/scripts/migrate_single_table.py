@@ -0,0 +1,229 @@
+"""
+Move the tasks to the tasks-v2 table and fill the single table layout
+
+The tasks of the first layout live in the legacy tasks table, keyed by
+(id, project_id). CloudFormation cannot change the key schema of a live table
+in place, so the tasks model now uses the tasks-v2 table, keyed by id only,
+and this script copies the legacy tasks into it. The board single table is a
+projection of the projects and tasks-v2 streams, maintained by the
+projection Lambda: the copied tasks reach it through the tasks-v2
+stream, and the projects, written before the projects stream existed, are
+copied into it by this script.
+
+Every source table is read with a parallel segmented scan and each page is
+written as soon as it is read, so memory stays flat whatever the table size.
+Items are only written where they do not exist yet: a task or project
+written since the deploy is newer than its scanned copy and is kept. After
+every page the position of its segment is saved to a checkpoint file. An
+interrupted run continues from there.
+
+Usage:
+    python scripts/migrate_single_table.py [--segments 8] [--page-size 200]
+        [--checkpoint migrate_single_table.json] [--restart]
+
+Table names and region are taken from the PynamoDB models in the common layer.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Service", "handlers", "layers", "common", "python"))
+
+from pynamodb.connection import TableConnection  # noqa: E402
+from pynamodb.exceptions import PutError  # noqa: E402
+
+from db.board_model import BoardItemDynamoModel, project_item  # noqa: E402
+from db.generic_repository import CONDITIONAL_CHECK_FAILED  # noqa: E402
+from db.project_model import ProjectDynamoModel  # noqa: E402
+from db.task_model import TaskDynamoModel  # noqa: E402
+
+# Tasks table of the first layout, keyed by (id, project_id)
+LEGACY_TASKS_TABLE = "tasks-int-427547500501"
+
+
+def legacy_tasks_connection() -> TableConnection:
+    """
+    Returns:
+        TableConnection: Connection to the legacy tasks table
+    """
+    connection = TableConnection(
+        LEGACY_TASKS_TABLE, region=TaskDynamoModel.Meta.region, host=TaskDynamoModel.Meta.host
+    )
+    # loads the key schema of the table, needed to build its requests
+    connection.describe_table()
+    return connection
+
+
+def projects_connection() -> TableConnection:
+    """
+    Returns:
+        TableConnection: Connection to the projects table
+    """
+    return ProjectDynamoModel._get_connection()
+
+
+def task_copy(raw_item: dict) -> TaskDynamoModel:
+    """
+    Args:
+        raw_item (dict): Legacy task, in DynamoDB JSON
+    Returns:
+        TaskDynamoModel: Task for the tasks-v2 table
+    """
+    return TaskDynamoModel.from_raw_data(raw_item)
+
+
+def project_copy(raw_item: dict) -> BoardItemDynamoModel:
+    """
+    Args:
+        raw_item (dict): Project, in DynamoDB JSON
+    Returns:
+        BoardItemDynamoModel: Project item of the single table
+    """
+    return BoardItemDynamoModel(**project_item(ProjectDynamoModel.from_raw_data(raw_item).attribute_values))
+
+
+# Source table connection and the function mapping its raw items to the item to write
+SOURCES = {
+    "tasks": (legacy_tasks_connection, task_copy),
+    "projects": (projects_connection, project_copy),
+}
+
+
+def put_if_missing(item) -> bool:
+    """
+    Write an item unless an item with its key exists
+    Args:
+        item (Model): Item to write
+    Returns:
+        bool: False if the item exists
+    """
+    try:
+        item.save(condition=item._hash_key_attribute().does_not_exist())
+    except PutError as e:
+        if e.cause_response_code != CONDITIONAL_CHECK_FAILED:
+            raise
+        return False
+    return True
+
+
+class Checkpoint:
+    """
+    Last evaluated key of every (source, segment), persisted atomically after each page
+    """
+
+    def __init__(self, path: str, total_segments: int, restart: bool):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = {"total_segments": total_segments, "segments": {}}
+        if os.path.exists(path) and not restart:
+            with open(path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+            if self.state["total_segments"] != total_segments:
+                raise SystemExit(
+                    f"{path} was written with --segments {self.state['total_segments']}, "
+                    "use the same value or --restart"
+                )
+
+    def position(self, source: str, segment: int) -> dict:
+        """
+        Get the saved position of a segment
+        Args:
+            source (str): Source table key
+            segment (int): Segment number
+        Returns:
+            dict: {"last_evaluated_key": ..., "done": bool, "items": int, "skipped": int}
+        """
+        return self.state["segments"].get(
+            f"{source}/{segment}", {"last_evaluated_key": None, "done": False, "items": 0, "skipped": 0}
+        )
+
+    def save(self, source: str, segment: int, position: dict) -> None:
+        """
+        Save the position of a segment
+        Args:
+            source (str): Source table key
+            segment (int): Segment number
+            position (dict): Position of the segment
+        """
+        with self.lock:
+            self.state["segments"][f"{source}/{segment}"] = position
+            temporary_path = f"{self.path}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+            os.replace(temporary_path, self.path)
+
+
+def copy_segment(
+    source: str, segment: int, total_segments: int, page_size: int, checkpoint: Checkpoint
+) -> dict:
+    """
+    Copy one scan segment of a source table, page by page
+    Args:
+        source (str): Source table key
+        segment (int): Segment number
+        total_segments (int): Number of segments
+        page_size (int): Items read per Scan call
+        checkpoint (Checkpoint): Checkpoint to resume from and update
+    Returns:
+        dict: Position of the segment, with the items copied and skipped, including earlier runs
+    """
+    get_connection, to_item = SOURCES[source]
+    connection = get_connection()
+    position = checkpoint.position(source, segment)
+
+    while not position["done"]:
+        page = connection.scan(
+            segment=segment,
+            total_segments=total_segments,
+            limit=page_size,
+            exclusive_start_key=position["last_evaluated_key"],
+        )
+        copied = [put_if_missing(to_item(raw)) for raw in page.get("Items", [])]
+        last_evaluated_key = page.get("LastEvaluatedKey")
+        position = {
+            "last_evaluated_key": last_evaluated_key,
+            "done": last_evaluated_key is None,
+            "items": position["items"] + sum(copied),
+            "skipped": position.get("skipped", 0) + len(copied) - sum(copied),
+        }
+        checkpoint.save(source, segment, position)
+    return position
+
+
+def main() -> int:
+    """
+    Run the migration
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=8, help="parallel scan segments per source table")
+    parser.add_argument("--page-size", type=int, default=200, help="items read per Scan call")
+    parser.add_argument("--checkpoint", default="migrate_single_table.json", help="checkpoint file")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    checkpoint = Checkpoint(args.checkpoint, args.segments, args.restart)
+    start = time.perf_counter()
+    for source in SOURCES:
+        with ThreadPoolExecutor(max_workers=args.segments) as executor:
+            futures = [
+                executor.submit(copy_segment, source, segment, args.segments, args.page_size, checkpoint)
+                for segment in range(args.segments)
+            ]
+            positions = [future.result() for future in futures]
+        copied = sum(position["items"] for position in positions)
+        skipped = sum(position.get("skipped", 0) for position in positions)
+        print(f"{source}: {copied} items copied, {skipped} already there")
+    print(f"done in {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
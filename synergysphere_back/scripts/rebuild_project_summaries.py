@@ -0,0 +1,117 @@
+"""
+Recompute the task counts of every project from scratch
+
+The tasks table is read with a parallel segmented scan of only project_id
+and status, and the counts are summed in memory. Every project then gets its
+summary overwritten with batched writes in parallel, with zeros for projects
+without tasks.
+
+Stream updates applied between the scan and the write of a summary are
+overwritten. Run it while the tasks table is quiet, or disable the
+project_summary event source mapping for the duration and re-enable it
+afterwards with its position set to LATEST.
+
+Usage:
+    python scripts/rebuild_project_summaries.py [--segments 8] [--page-size 1000] [--workers 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Service", "handlers", "layers", "common", "python"))
+
+from db.generic_repository import BATCH_WRITE_LIMIT, GenericRepository, chunks  # noqa: E402
+from db.project_model import ProjectDynamoModel  # noqa: E402
+from db.project_summary_model import COUNTERS, ProjectSummaryDynamoModel, status_counter  # noqa: E402
+from db.task_model import TaskDynamoModel  # noqa: E402
+
+
+def count_segment(segment: int, total_segments: int, page_size: int) -> dict:
+    """
+    Count the tasks of one scan segment per project and status
+    Args:
+        segment (int): Segment number
+        total_segments (int): Number of segments
+        page_size (int): Items read per Scan call
+    Returns:
+        dict: Counter per project ID
+    """
+    counts = defaultdict(Counter)
+    tasks = TaskDynamoModel.scan(
+        segment=segment,
+        total_segments=total_segments,
+        page_size=page_size,
+        attributes_to_get=["id", "project_id", "status"],
+    )
+    for task in tasks:
+        counts[task.project_id].update({status_counter(task.status): 1, "total": 1})
+    return counts
+
+
+def list_project_ids(segment: int, total_segments: int, page_size: int) -> list:
+    """
+    List the project IDs of one scan segment
+    Args:
+        segment (int): Segment number
+        total_segments (int): Number of segments
+        page_size (int): Items read per Scan call
+    Returns:
+        list: Project IDs
+    """
+    projects = ProjectDynamoModel.scan(
+        segment=segment, total_segments=total_segments, page_size=page_size, attributes_to_get=["id"]
+    )
+    return [project.id for project in projects]
+
+
+def main() -> int:
+    """
+    Run the rebuild
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=8, help="parallel scan segments per table")
+    parser.add_argument("--page-size", type=int, default=1000, help="items read per Scan call")
+    parser.add_argument("--workers", type=int, default=8, help="parallel batch writers")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = defaultdict(Counter)
+    project_ids = set()
+    with ThreadPoolExecutor(max_workers=args.segments) as executor:
+        count_futures = [
+            executor.submit(count_segment, segment, args.segments, args.page_size)
+            for segment in range(args.segments)
+        ]
+        project_futures = [
+            executor.submit(list_project_ids, segment, args.segments, args.page_size)
+            for segment in range(args.segments)
+        ]
+        for future in count_futures:
+            for project_id, project_counts in future.result().items():
+                counts[project_id].update(project_counts)
+        for future in project_futures:
+            project_ids.update(future.result())
+
+    summaries = [
+        {"project_id": project_id, **{name: counts[project_id][name] for name in COUNTERS}}
+        for project_id in project_ids | set(counts)
+    ]
+    summary_db = GenericRepository(ProjectSummaryDynamoModel)
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(summary_db.batch_create, chunks(summaries, BATCH_WRITE_LIMIT * 4)))
+
+    orphaned = len(set(counts) - project_ids)
+    print(f"{len(summaries)} summaries written ({orphaned} for tasks of deleted projects) "
+          f"in {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Reindex every project and task into the search index
+
+Both tables are read with a parallel segmented scan. Each page is indexed
+against the stored document records, so only missing or outdated postings
+are written. Then the document records are checked against the tables, and
+documents whose project or task no longer exists are removed.
+
+Usage:
+    python scripts/rebuild_search_index.py [--segments 8] [--page-size 100]
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Service", "handlers", "layers", "common", "python"))
+
+from db.generic_repository import GenericRepository  # noqa: E402
+from db.project_model import PROJECT_ENTITY, ProjectDynamoModel  # noqa: E402
+from db.search_index_model import DOC_SORT_KEY, SearchIndexDynamoModel  # noqa: E402
+from db.search_repository import SearchRepository  # noqa: E402
+from db.task_model import TASK_ENTITY, TaskDynamoModel  # noqa: E402
+
+SOURCES = {PROJECT_ENTITY: ProjectDynamoModel, TASK_ENTITY: TaskDynamoModel}
+DOCUMENT_ATTRIBUTES = ["id", "project_id", "title", "description"]
+
+
+def index_segment(entity_type: str, segment: int, total_segments: int, page_size: int) -> int:
+    """
+    Index one scan segment of a table, page by page
+    Args:
+        entity_type (str): project or task
+        segment (int): Segment number
+        total_segments (int): Number of segments
+        page_size (int): Items read per Scan call
+    Returns:
+        int: Number of documents indexed
+    """
+    model_class = SOURCES[entity_type]
+    search_db = SearchRepository()
+    connection = model_class._get_connection()
+    attributes = [name for name in DOCUMENT_ATTRIBUTES if name in model_class.get_attributes()]
+    indexed = 0
+    last_evaluated_key = None
+    while True:
+        page = connection.scan(
+            segment=segment,
+            total_segments=total_segments,
+            limit=page_size,
+            exclusive_start_key=last_evaluated_key,
+            attributes_to_get=attributes,
+        )
+        documents = [model_class.from_raw_data(raw).attribute_values for raw in page.get("Items", [])]
+        if documents:
+            search_db.index_documents(entity_type, documents)
+            indexed += len(documents)
+        last_evaluated_key = page.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return indexed
+
+
+def remove_orphans(segment: int, total_segments: int, page_size: int) -> int:
+    """
+    Remove the documents of one scan segment of the index whose item no longer exists
+    Args:
+        segment (int): Segment number
+        total_segments (int): Number of segments
+        page_size (int): Items read per Scan call
+    Returns:
+        int: Number of documents removed
+    """
+    search_db = SearchRepository()
+    records = SearchIndexDynamoModel.scan(
+        SearchIndexDynamoModel.sk == DOC_SORT_KEY,
+        segment=segment,
+        total_segments=total_segments,
+        page_size=page_size,
+        attributes_to_get=["shard", "sk", "entity_type", "id"],
+    )
+    document_ids = {entity_type: set() for entity_type in SOURCES}
+    for record in records:
+        document_ids[record.entity_type].add(record.id)
+    removed = 0
+    for entity_type, item_ids in document_ids.items():
+        repository = GenericRepository(SOURCES[entity_type])
+        existing = {item.id for item in repository.batch_get(item_ids, attributes_to_get=["id"])}
+        orphans = item_ids - existing
+        if orphans:
+            search_db.remove_documents(entity_type, orphans)
+            removed += len(orphans)
+    return removed
+
+
+def main() -> int:
+    """
+    Run the reindex
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=8, help="parallel scan segments per table")
+    parser.add_argument("--page-size", type=int, default=100, help="items read per Scan call")
+    args = parser.parse_args()
+
+    with ThreadPoolExecutor(max_workers=args.segments) as executor:
+        for entity_type in SOURCES:
+            futures = [
+                executor.submit(index_segment, entity_type, segment, args.segments, args.page_size)
+                for segment in range(args.segments)
+            ]
+            print(f"{entity_type}: {sum(future.result() for future in futures)} documents indexed")
+        futures = [
+            executor.submit(remove_orphans, segment, args.segments, args.page_size)
+            for segment in range(args.segments)
+        ]
+        print(f"{sum(future.result() for future in futures)} orphaned documents removed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Delete the items left behind by projects and tasks deleted before deletes cascaded
+
+The tasks and project summaries tables are read with a parallel segmented
+scan of only their project ID, and every project that no longer exists gets
+the same cleanup as a deleted project: its tasks, their comments and
+attachments, and its summary are deleted with batched deletes. Then the
+comments and attachments tables are scanned the same way, and those of tasks
+that no longer exist are deleted.
+
+The cleanup runs as project deletion jobs on the jobs queue when JOB_QUEUE
+is set (the queue name, e.g. jobs-int-427547500501), else right away in this
+process. ATTACHMENTS_BUCKET must be set for attachment objects to be deleted.
+Search documents of deleted items are removed by rebuild_search_index.py.
+
+Usage:
+    python scripts/sweep_orphans.py [--segments 8] [--page-size 1000] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Service", "handlers", "layers", "common", "python"))
+# the cleanup is the one of the project Lambda
+sys.path.insert(0, os.path.join(ROOT, "Service", "handlers", "lambdas", "project"))
+
+from attachment_manager import delete_task_attachments  # noqa: E402
+from comment_manager import delete_task_comments  # noqa: E402
+from db.attachment_model import AttachmentDynamoModel  # noqa: E402
+from db.comment_model import CommentDynamoModel  # noqa: E402
+from db.generic_repository import GenericRepository  # noqa: E402
+from db.job_model import PROJECT_DELETE_JOB  # noqa: E402
+from db.project_model import ProjectDynamoModel  # noqa: E402
+from db.project_summary_model import ProjectSummaryDynamoModel  # noqa: E402
+from db.task_model import TaskDynamoModel  # noqa: E402
+from job_manager import submit_job  # noqa: E402
+
+# Model scanned and its attribute holding the ID of the parent item
+PROJECT_CHILDREN = [(TaskDynamoModel, "project_id"), (ProjectSummaryDynamoModel, "project_id")]
+TASK_CHILDREN = [(CommentDynamoModel, "task_id"), (AttachmentDynamoModel, "task_id")]
+
+
+def scan_parent_ids(model_class, attribute: str, segment: int, total_segments: int, page_size: int) -> set:
+    """
+    Collect the parent IDs found in one scan segment of a table
+    Args:
+        model_class (Type): PynamoDB model scanned
+        attribute (str): Attribute holding the parent ID
+        segment (int): Segment number
+        total_segments (int): Number of segments
+        page_size (int): Items read per Scan call
+    Returns:
+        set: Parent IDs
+    """
+    items = model_class.scan(
+        segment=segment,
+        total_segments=total_segments,
+        page_size=page_size,
+        attributes_to_get=[attribute],
+    )
+    return {getattr(item, attribute) for item in items}
+
+
+def find_orphans(executor, children, parent_model, segments: int, page_size: int) -> set:
+    """
+    Find the parent IDs referenced by child tables whose parent item does not exist
+    Args:
+        executor (ThreadPoolExecutor): Scan workers
+        children (list): (model, parent ID attribute) of each child table
+        parent_model (Type): PynamoDB model of the parents
+        segments (int): Parallel scan segments per table
+        page_size (int): Items read per Scan call
+    Returns:
+        set: Missing parent IDs
+    """
+    futures = [
+        executor.submit(scan_parent_ids, model_class, attribute, segment, segments, page_size)
+        for model_class, attribute in children
+        for segment in range(segments)
+    ]
+    parent_ids = set().union(*(future.result() for future in futures))
+    repository = GenericRepository(parent_model)
+    existing = {item.id for item in repository.batch_get(parent_ids, attributes_to_get=["id"], use_cache=False)}
+    return parent_ids - existing
+
+
+def main() -> int:
+    """
+    Run the sweep
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=8, help="parallel scan segments per table")
+    parser.add_argument("--page-size", type=int, default=1000, help="items read per Scan call")
+    parser.add_argument("--dry-run", action="store_true", help="only report the orphans")
+    args = parser.parse_args()
+
+    with ThreadPoolExecutor(max_workers=args.segments) as executor:
+        project_ids = find_orphans(executor, PROJECT_CHILDREN, ProjectDynamoModel, args.segments, args.page_size)
+        print(f"{len(project_ids)} deleted projects with items left")
+        if not args.dry_run:
+            for project_id in project_ids:
+                job = submit_job(PROJECT_DELETE_JOB, {"project_id": project_id})
+                print(f"project {project_id}: job {job['id']}")
+
+        # the project cleanups above may not have run yet, so their tasks may still exist
+        # here and their comments and attachments be left for the project deletion jobs
+        task_ids = sorted(find_orphans(executor, TASK_CHILDREN, TaskDynamoModel, args.segments, args.page_size))
+        print(f"{len(task_ids)} deleted tasks with comments or attachments left")
+        if not args.dry_run and task_ids:
+            print(f"{delete_task_comments(task_ids)} comments deleted")
+            print(f"{delete_task_attachments(task_ids)} attachments deleted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+Unit tests of the Lambda code, run with `python -m pytest tests/unit` from the project
+root. The common layer and the code of the project Lambda are put on the path the way
+the Lambda runtime does.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "Service", "handlers", "layers", "common", "python"))
+sys.path.insert(0, os.path.join(ROOT, "Service", "handlers", "lambdas", "project"))
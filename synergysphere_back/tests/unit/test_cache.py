@@ -0,0 +1,17 @@
+from db.cache import TTLCache
+
+
+def test_pop_counters_returns_the_counts_since_the_previous_call():
+    cache = TTLCache(max_size=1, ttl=60)
+    cache.get("a")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.set("b", 2)
+
+    assert cache.pop_counters() == {"hits": 1, "misses": 1, "evictions": 1}
+    assert cache.pop_counters() == {"hits": 0, "misses": 0, "evictions": 0}
+
+    cache.get("b")
+
+    assert cache.pop_counters() == {"hits": 1, "misses": 0, "evictions": 0}
+    assert cache.stats()["hits"] == 2
@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+from decimal import Decimal
+
+from utils.json_encoder import dumps
+
+COMMON_LAYER = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "Service", "handlers", "layers", "common", "python",
+)
+
+
+def test_dumps_is_compact_json():
+    body = {"message": "ok", "data": [{"id": "t1", "points": Decimal("1.5")}]}
+
+    encoded = dumps(body)
+
+    assert encoded.startswith(b"{\"message\":\"ok\",\"data\":[{")
+    assert json.loads(encoded) == {"message": "ok", "data": [{"id": "t1", "points": "1.5"}]}
+
+
+def test_response_handler_keeps_pydantic_and_orjson_off_the_cold_start():
+    # a fresh interpreter, the modules of the other tests are already imported here
+    code = (
+        "import sys; import response.response_handler; "
+        "print(','.join(sorted({'pydantic', 'orjson'} & set(sys.modules))))"
+    )
+    env = {**os.environ, "PYTHONPATH": COMMON_LAYER, "AWS_DEFAULT_REGION": "ap-south-1"}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from utils.rank import (
+    DIGITS,
+    evenly_spaced_ranks,
+    item_rank,
+    rank_between,
+    rank_order,
+    time_rank,
+)
+
+
+def assert_valid(rank):
+    assert rank and set(rank) <= set(DIGITS)
+    assert not rank.endswith(DIGITS[0])
+
+
+@pytest.mark.parametrize(
+    "lower, upper",
+    [
+        (None, None),
+        (None, "1"),
+        ("1", None),
+        ("1", "2"),
+        ("1", "1V"),
+        ("A", "A1"),
+        ("Az", "B"),
+        ("zzz", None),
+        (None, "01"),
+        ("001", "002"),
+    ],
+)
+def test_rank_between_sorts_between(lower, upper):
+    rank = rank_between(lower, upper)
+    assert_valid(rank)
+    assert lower is None or lower < rank
+    assert upper is None or rank < upper
+
+
+@pytest.mark.parametrize("lower, upper", [("2", "1"), ("1", "1")])
+def test_rank_between_rejects_unordered_bounds(lower, upper):
+    with pytest.raises(ValueError):
+        rank_between(lower, upper)
+
+
+def test_rank_between_keeps_order_over_many_inserts():
+    generator = random.Random(42)
+    ranks = [rank_between()]
+    for _ in range(2000):
+        position = generator.randint(0, len(ranks))
+        lower = ranks[position - 1] if position else None
+        upper = ranks[position] if position < len(ranks) else None
+        ranks.insert(position, rank_between(lower, upper))
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == len(ranks)
+
+
+def test_time_rank_follows_time():
+    earlier = time_rank("2026-01-01T00:00:00Z")
+    later = time_rank("2026-01-01T00:00:00.000001Z")
+    assert_valid(earlier)
+    assert earlier < later
+    assert time_rank("2026-01-01T00:00:00") == earlier
+    assert time_rank("2026-01-01T00:00:00Z", offset=1) == later
+    assert later < time_rank()
+
+
+def test_item_rank_falls_back_to_created_date():
+    created_date = "2025-06-01T12:00:00Z"
+    assert item_rank({"rank": "V"}) == "V"
+    assert item_rank({"rank": None, "created_date": created_date}) == time_rank(created_date)
+
+
+def test_rank_order_breaks_ties_by_date_and_id():
+    items = [
+        {"id": "b", "rank": "V", "created_date": "2026-01-01"},
+        {"id": "a", "rank": "V", "created_date": "2026-01-01"},
+        {"id": "c", "rank": "V", "created_date": "2025-01-01"},
+        {"id": "d", "rank": "1"},
+    ]
+    assert [item["id"] for item in sorted(items, key=rank_order)] == ["d", "c", "a", "b"]
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 61, 62, 1000])
+def test_evenly_spaced_ranks(count):
+    upper = time_rank()
+    ranks = evenly_spaced_ranks(count, upper)
+    assert len(ranks) == count
+    assert ranks == sorted(set(ranks))
+    assert all(rank < upper for rank in ranks)
+    for rank in ranks:
+        assert_valid(rank)
+    # room is left between neighbours
+    for lower, higher in zip(ranks, ranks[1:]):
+        assert lower < rank_between(lower, higher) < higher
+
+
+def test_evenly_spaced_ranks_are_short():
+    ranks = evenly_spaced_ranks(1000)
+    assert max(len(rank) for rank in ranks) <= 3
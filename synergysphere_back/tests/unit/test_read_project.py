@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+from aiobotocore.session import get_session
+from botocore.stub import ANY, Stubber
+
+import db.async_generic_repository as async_generic_repository
+import project_manager
+from db.cache import get_model_cache
+from db.project_model import ProjectDynamoModel
+from db.project_summary_model import ProjectSummaryDynamoModel
+from db.task_model import TaskDynamoModel
+
+PROJECT_ID = "p1"
+
+PROJECT_ITEM = {
+    "id": {"S": PROJECT_ID},
+    "title": {"S": "Launch"},
+    "description": {"S": "Ship it"},
+    "created_by": {"S": "alice"},
+    "created_date": {"S": "2024-01-01T00:00:00"},
+    "updated_by": {"S": "NA"},
+    "updated_date": {"S": "NA"},
+}
+SUMMARY_ITEM = {
+    "project_id": {"S": PROJECT_ID},
+    "todo": {"N": "1"},
+    "in_progress": {"N": "1"},
+    "review": {"N": "0"},
+    "done": {"N": "0"},
+    "other": {"N": "0"},
+    "total": {"N": "2"},
+}
+
+PROJECT_REQUEST = {
+    "TableName": ProjectDynamoModel.Meta.table_name,
+    "Key": {"id": {"S": PROJECT_ID}},
+    "ConsistentRead": False,
+}
+TASKS_REQUEST = {
+    "TableName": TaskDynamoModel.Meta.table_name,
+    "IndexName": "project_id-index",
+    "KeyConditionExpression": ANY,
+    "ProjectionExpression": ANY,
+    "ExpressionAttributeNames": ANY,
+    "ExpressionAttributeValues": {":0": {"S": PROJECT_ID}},
+}
+SUMMARY_REQUEST = {
+    "TableName": ProjectSummaryDynamoModel.Meta.table_name,
+    "Key": {"project_id": {"S": PROJECT_ID}},
+    "ProjectionExpression": ANY,
+    "ExpressionAttributeNames": ANY,
+    "ConsistentRead": False,
+}
+
+
+def read_with_stubbed_clients(stubs):
+    """
+    Run read_project with one stubbed aiobotocore client per model, so that the
+    concurrent reads may reach them in any order
+    Args:
+        stubs (dict): Operation, response and expected request of each model
+    Returns:
+        tuple: Result of read_project
+    """
+
+    async def run():
+        clients = {}
+        stubbers = []
+        for model_class, (operation, response, request) in stubs.items():
+            client = await get_session().create_client(
+                "dynamodb",
+                region_name=model_class.Meta.region,
+                aws_access_key_id="testing",
+                aws_secret_access_key="testing",
+            ).__aenter__()
+            stubber = Stubber(client)
+            stubber.add_response(operation, response, request)
+            stubber.activate()
+            clients[model_class] = client
+            stubbers.append(stubber)
+
+        async def get_client(model_class):
+            return clients[model_class]
+
+        original = async_generic_repository.get_client
+        async_generic_repository.get_client = get_client
+        try:
+            result = await project_manager.read_project(PROJECT_ID)
+        finally:
+            async_generic_repository.get_client = original
+            for client in clients.values():
+                await client.__aexit__(None, None, None)
+        for stubber in stubbers:
+            stubber.assert_no_pending_responses()
+        return result
+
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def empty_model_caches():
+    # items of the warm container cache would be served without a request
+    for model_class in (ProjectDynamoModel, TaskDynamoModel, ProjectSummaryDynamoModel):
+        cache = get_model_cache(model_class)
+        if cache:
+            cache.clear()
+
+
+def test_read_project_reads_project_tasks_and_summary():
+    data, task_ids, summary = read_with_stubbed_clients({
+        ProjectDynamoModel: ("get_item", {"Item": PROJECT_ITEM}, PROJECT_REQUEST),
+        TaskDynamoModel: ("query", {"Items": [{"id": {"S": "t1"}}, {"id": {"S": "t2"}}]}, TASKS_REQUEST),
+        ProjectSummaryDynamoModel: ("get_item", {"Item": SUMMARY_ITEM}, SUMMARY_REQUEST),
+    })
+
+    assert data["id"] == PROJECT_ID
+    assert data["title"] == "Launch"
+    assert task_ids == ["t1", "t2"]
+    assert project_manager.task_counts(summary) == {
+        "todo": 1, "in_progress": 1, "review": 0, "done": 0, "other": 0, "total": 2
+    }
+
+
+def test_read_project_of_missing_project():
+    data, task_ids, summary = read_with_stubbed_clients({
+        ProjectDynamoModel: ("get_item", {}, PROJECT_REQUEST),
+        TaskDynamoModel: ("query", {"Items": []}, TASKS_REQUEST),
+        ProjectSummaryDynamoModel: ("get_item", {}, SUMMARY_REQUEST),
+    })
+
+    assert data is None
+    assert task_ids == []
+    assert summary is None